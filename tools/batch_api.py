@@ -0,0 +1,210 @@
+"""
+batch_api.py — Provider batch-API client for large TamilNadai evaluation runs.
+
+Instead of one synchronous call per sentence, the whole run is submitted as a
+single asynchronous batch job, polled until it finishes, and the results are
+mapped back to record IDs (used as each request's custom_id).
+
+Supported providers:
+  - OpenAI Batch API: upload a JSONL file, create a batch, download output file
+  - Anthropic Message Batches: create a batch, poll, stream the results JSONL
+
+Requests go over the shared pooled client (workbench_v2/core/provider_clients.py,
+no SDK), so the base URL can point at the local stand-in in
+tools/mock_llm_server.py for offline testing.
+
+Used by run_evaluation.py --batch; not meant to be run directly.
+"""
+
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "workbench_v2"))
+from core.provider_clients import DEFAULT_BASE_URLS, ProviderHTTPError, get_pool
+
+TERMINAL_OPENAI_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchError(RuntimeError):
+    """The provider rejected or failed a batch job."""
+
+
+def _http(method: str, url: str, headers: dict, body: bytes | None = None) -> bytes:
+    status, resp_headers, data, _ = get_pool().request(method, url, headers, body)
+    if status >= 400:
+        raise ProviderHTTPError(status, data, resp_headers)
+    return data
+
+
+def _parse_jsonl(raw: bytes) -> list[dict]:
+    return [json.loads(line) for line in raw.decode("utf-8").splitlines() if line.strip()]
+
+
+class OpenAIBatch:
+    """OpenAI Batch API: /v1/files + /v1/batches over /v1/chat/completions."""
+
+    def __init__(self, api_key: str, base_url: str | None = None):
+        self.base_url = (base_url or DEFAULT_BASE_URLS["openai"]).rstrip("/")
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+
+    def build_lines(self, requests: list[tuple[str, str]], model: str,
+                    system_prompt: str, params: dict) -> list[dict]:
+        return [
+            {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    **params,
+                },
+            }
+            for custom_id, user_prompt in requests
+        ]
+
+    def submit(self, lines: list[dict]) -> str:
+        # Upload the batch input as a multipart/form-data file
+        boundary = uuid.uuid4().hex
+        content = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+        body = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="purpose"\r\n\r\nbatch\r\n'
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="batch.jsonl"\r\n'
+            "Content-Type: application/jsonl\r\n\r\n"
+            f"{content}\r\n"
+            f"--{boundary}--\r\n"
+        ).encode("utf-8")
+        headers = {**self.headers, "Content-Type": f"multipart/form-data; boundary={boundary}"}
+        file_obj = json.loads(_http("POST", f"{self.base_url}/v1/files", headers, body))
+
+        payload = json.dumps({
+            "input_file_id": file_obj["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h",
+        }).encode("utf-8")
+        headers = {**self.headers, "Content-Type": "application/json"}
+        batch = json.loads(_http("POST", f"{self.base_url}/v1/batches", headers, payload))
+        return batch["id"]
+
+    def poll(self, batch_id: str) -> tuple[bool, dict]:
+        batch = json.loads(_http("GET", f"{self.base_url}/v1/batches/{batch_id}", self.headers))
+        if batch["status"] in ("failed", "expired", "cancelled"):
+            raise BatchError(f"OpenAI batch {batch_id} ended with status {batch['status']}")
+        return batch["status"] in TERMINAL_OPENAI_STATUSES, batch
+
+    def results(self, batch: dict) -> dict[str, str]:
+        outputs = {}
+        if not batch.get("output_file_id"):
+            return outputs
+        raw = _http("GET", f"{self.base_url}/v1/files/{batch['output_file_id']}/content", self.headers)
+        for line in _parse_jsonl(raw):
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                continue
+            text = response["body"]["choices"][0]["message"]["content"]
+            outputs[line["custom_id"]] = text.strip()
+        return outputs
+
+
+class AnthropicBatch:
+    """Anthropic Message Batches: /v1/messages/batches."""
+
+    def __init__(self, api_key: str, base_url: str | None = None):
+        self.base_url = (base_url or DEFAULT_BASE_URLS["anthropic"]).rstrip("/")
+        self.headers = {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+
+    def build_lines(self, requests: list[tuple[str, str]], model: str,
+                    system_prompt: str, params: dict) -> list[dict]:
+        return [
+            {
+                "custom_id": custom_id,
+                "params": {
+                    "model": model,
+                    "system": system_prompt,
+                    "messages": [{"role": "user", "content": user_prompt}],
+                    **params,
+                },
+            }
+            for custom_id, user_prompt in requests
+        ]
+
+    def submit(self, lines: list[dict]) -> str:
+        payload = json.dumps({"requests": lines}, ensure_ascii=False).encode("utf-8")
+        headers = {**self.headers, "Content-Type": "application/json"}
+        batch = json.loads(_http("POST", f"{self.base_url}/v1/messages/batches", headers, payload))
+        return batch["id"]
+
+    def poll(self, batch_id: str) -> tuple[bool, dict]:
+        batch = json.loads(_http("GET", f"{self.base_url}/v1/messages/batches/{batch_id}", self.headers))
+        return batch["processing_status"] == "ended", batch
+
+    def results(self, batch: dict) -> dict[str, str]:
+        outputs = {}
+        url = batch.get("results_url") or f"{self.base_url}/v1/messages/batches/{batch['id']}/results"
+        for line in _parse_jsonl(_http("GET", url, self.headers)):
+            result = line.get("result") or {}
+            if result.get("type") != "succeeded":
+                continue
+            outputs[line["custom_id"]] = result["message"]["content"][0]["text"].strip()
+        return outputs
+
+
+BATCH_CLIENTS = {
+    "openai": OpenAIBatch,
+    "anthropic": AnthropicBatch,
+}
+
+
+def run_batch(
+    provider: str,
+    model: str,
+    api_key: str,
+    requests: list[tuple[str, str]],
+    system_prompt: str,
+    params: dict,
+    base_url: str | None = None,
+    poll_interval: float = 30.0,
+    max_wait: float = 24 * 3600,
+) -> dict[str, str]:
+    """Submit one batch job, wait for it, and return {custom_id: output}.
+
+    Args:
+        provider: "openai" or "anthropic".
+        requests: (custom_id, user prompt) pairs; custom_id is the record ID.
+        params: Decoding parameters merged into every request body.
+        base_url: Override the provider endpoint (e.g. the local mock server).
+        poll_interval: Seconds between status checks.
+        max_wait: Give up after this many seconds.
+
+    Requests that fail inside the batch are simply absent from the result.
+    """
+    if provider not in BATCH_CLIENTS:
+        raise ValueError(
+            f"Batch mode is not supported for provider {provider!r}. "
+            f"Supported: {', '.join(BATCH_CLIENTS)}"
+        )
+    client = BATCH_CLIENTS[provider](api_key, base_url)
+
+    lines = client.build_lines(requests, model, system_prompt, params)
+    batch_id = client.submit(lines)
+    print(f"  Submitted batch {batch_id} ({len(lines)} requests)")
+
+    deadline = time.time() + max_wait
+    while True:
+        done, batch = client.poll(batch_id)
+        if done:
+            break
+        if time.time() > deadline:
+            raise BatchError(f"Batch {batch_id} did not finish within {max_wait:.0f}s")
+        print(f"  Batch {batch_id} still processing...")
+        time.sleep(poll_interval)
+
+    return client.results(batch)
@@ -0,0 +1,285 @@
+"""
+benchmark_runner.py — Offline throughput benchmark for the evaluation runners.
+
+Starts tools/mock_llm_server.py in-process, points every provider base URL at
+it, and times:
+  - cli:     tools/run_evaluation.py run_evaluation() (asyncio engine)
+  - service: workbench_v2 core.eval_service.run_evaluation() (the web app's
+             evaluation path, on a throwaway test database)
+
+For each target it reports examples/sec and p50/p95/p99 per-call latency (from
+the pooled HTTP client's timings), plus the 429s and errors the mock injected.
+No API keys, network access or money needed.
+
+Usage:
+    python tools/benchmark_runner.py
+    python tools/benchmark_runner.py --target cli --model claude-haiku-4-5-20251001 --limit 500 --pack 8
+    python tools/benchmark_runner.py --latency lognormal:600:0.6 --rate-limit-rate 0.05 --json bench.json
+    python tools/benchmark_runner.py --baseline bench.json   # exit 1 if throughput regressed
+    python tools/benchmark_runner.py --target cli --compare-pack 8 --rpm 0 --tpm 0   # exit 1 unless packing wins
+
+Mock server options (--latency, --error-rate, --rate-limit-rate, --mock-rpm,
+--responses) are described in mock_llm_server.py.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+WORKBENCH_DIR = PROJECT_DIR / "workbench_v2"
+sys.path.insert(0, str(PROJECT_DIR / "tools"))
+sys.path.insert(0, str(WORKBENCH_DIR))
+
+from mock_llm_server import make_server
+
+PROVIDER_URL_VARS = ("OPENAI_BASE_URL", "ANTHROPIC_BASE_URL", "GEMINI_BASE_URL")
+API_KEY_VARS = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_API_KEY", "GEMINI_API_KEY")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _report(target: str, examples: int, elapsed: float, before: dict, after: dict) -> dict:
+    """Summarise one timed run from the pool timings and mock counters."""
+    from core.provider_clients import get_pool
+
+    latencies = [c["total_ms"] for c in get_pool().timings.snapshot()]
+    return {
+        "target": target,
+        "examples": examples,
+        "seconds": round(elapsed, 2),
+        "examples_per_sec": round(examples / elapsed, 2) if elapsed > 0 else 0.0,
+        "calls": len(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "rate_limited": after.get("rate_limited", 0) - before.get("rate_limited", 0),
+        "server_errors": after.get("errors", 0) - before.get("errors", 0),
+    }
+
+
+def bench_cli(args, server) -> dict:
+    """Time tools/run_evaluation.py's run_evaluation() against the mock."""
+    import run_evaluation
+    from core.provider_clients import get_pool
+
+    get_pool().timings.reset()
+    before = server.state.stats()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        run_evaluation.RESULTS_DIR = Path(tmpdir)
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            results, _ = run_evaluation.run_evaluation(
+                args.model,
+                split=args.split,
+                api_key="mock",
+                limit=args.limit,
+                concurrency=args.concurrency,
+                use_cache=False,
+                pack_size=args.pack,
+                rpm=args.rpm,
+                tpm=args.tpm,
+            )
+        elapsed = time.perf_counter() - start
+    report = _report(f"cli:{args.model}", results["total_evaluated"], elapsed, before, server.state.stats())
+    report["errors"] = results["metadata"]["errors"]
+    return report
+
+
+def _load_benchmark_sentences(limit: int | None, split: str | None) -> list:
+    """Fill the test database with Rule/Sentence rows built from the dataset."""
+    from django.contrib.auth.models import User
+    from core.models import Rule, Sentence, Source
+
+    from run_evaluation import load_dataset
+
+    source = Source.objects.create(source_id="bench", name="Benchmark")
+    rules = {}
+    sentences = []
+    for record in load_dataset(split):
+        rule_id = record.get("rule_id", "unknown")[:20]
+        if rule_id not in rules:
+            rules[rule_id] = Rule.objects.create(
+                rule_id=rule_id, category=record.get("category", "unknown"), source=source,
+            )
+        if record.get("is_error_example", True):
+            sentences.append(Sentence(
+                sentence_id=f"{record['id']}w", rule=rules[rule_id],
+                sentence=record["error_sentence"], sentence_type="wrong",
+            ))
+        sentences.append(Sentence(
+            sentence_id=f"{record['id']}c", rule=rules[rule_id],
+            sentence=record["correct_sentence"], sentence_type="correct",
+        ))
+    if limit:
+        sentences = sentences[:limit]
+    Sentence.objects.bulk_create(sentences)
+    User.objects.create_user("benchmark", password="benchmark")
+    return list(Sentence.objects.select_related("rule").order_by("sentence_id"))
+
+
+def bench_service(args, server) -> dict:
+    """Time core.eval_service.run_evaluation() on a throwaway test database."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+    django.setup()
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from core import eval_service
+    from core.models import EvalRun
+    from core.provider_clients import get_pool
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        sentences = _load_benchmark_sentences(args.limit, args.split)
+        eval_run = EvalRun.objects.create(
+            model_name=args.service_model, run_by=User.objects.get(username="benchmark"),
+        )
+        get_pool().timings.reset()
+        before = server.state.stats()
+        start = time.perf_counter()
+        eval_service.run_evaluation(eval_run, sentences)
+        elapsed = time.perf_counter() - start
+        eval_run.refresh_from_db()
+        report = _report(f"service:{args.service_model}", len(sentences), elapsed, before, server.state.stats())
+        report["status"] = eval_run.status
+        report["errors"] = eval_run.results.filter(outcome="error").count()
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    return report
+
+
+def print_reports(reports: list[dict]):
+    print(f"\n  {'Target':<40} {'Examples':>8} {'Seconds':>8} {'Ex/sec':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'429s':>5} {'Errors':>6}")
+    print(f"  {'-'*40} {'-'*8} {'-'*8} {'-'*8} {'-'*8} {'-'*8} {'-'*8} {'-'*5} {'-'*6}")
+    for r in reports:
+        print(
+            f"  {r['target']:<40} {r['examples']:>8} {r['seconds']:>8.2f} {r['examples_per_sec']:>8.2f} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['rate_limited']:>5} {r['errors']:>6}"
+        )
+
+
+def check_baseline(reports: list[dict], baseline_path: Path, tolerance: float) -> bool:
+    """Compare examples/sec with a saved --json report. Returns False on a regression."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["target"]: r for r in json.load(f)["reports"]}
+    ok = True
+    for r in reports:
+        base = baseline.get(r["target"])
+        if not base or not base["examples_per_sec"]:
+            continue
+        change = r["examples_per_sec"] / base["examples_per_sec"] - 1
+        flag = "REGRESSION" if change < -tolerance else "ok"
+        print(f"  {r['target']:<40} {base['examples_per_sec']:>8.2f} -> {r['examples_per_sec']:>8.2f} ex/sec ({change:+.1%}) {flag}")
+        ok = ok and change >= -tolerance
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the evaluation runners against a local mock LLM server.")
+    parser.add_argument("--target", choices=["cli", "service", "both"], default="both")
+    parser.add_argument("--model", type=str, default="gpt-4o-mini", help="Model for the cli target. Default: gpt-4o-mini")
+    parser.add_argument(
+        "--service-model", type=str, default="gpt-4o",
+        help="EvalRun model_name for the service target. Default: gpt-4o",
+    )
+    parser.add_argument("--split", type=str, default="all", help="Dataset split (test/validation/all). Default: all")
+    parser.add_argument("--limit", type=int, default=200, help="Examples per target. Default: 200")
+    parser.add_argument("--concurrency", type=int, default=None, help="cli: max requests in flight.")
+    parser.add_argument("--pack", type=int, default=1, help="cli: sentences per request. Default: 1")
+    parser.add_argument(
+        "--rpm", type=float, default=1_000_000,
+        help="cli: starting requests/min for the rate limiter (0 = the provider default). Default: effectively unlimited",
+    )
+    parser.add_argument(
+        "--tpm", type=float, default=1_000_000_000,
+        help="cli: starting tokens/min (0 = the provider default). Default: effectively unlimited",
+    )
+    parser.add_argument(
+        "--compare-pack", type=int, default=None, metavar="N",
+        help="cli: run unpacked and with --pack N; exit 1 unless packing is faster.",
+    )
+    parser.add_argument("--responses", choices=["echo", "gold"], default="gold")
+    parser.add_argument("--latency", type=str, default="lognormal:300:0.5", help="Mock per-call latency spec (ms).")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--mock-rpm", type=int, default=None, help="Mock server quota: 429 above this many calls/min.")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, default=None, help="Save the reports to this file.")
+    parser.add_argument("--baseline", type=str, default=None, help="Earlier --json report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed examples/sec drop vs baseline. Default: 0.1")
+    parser.add_argument("--verbose", action="store_true", help="Show the runners' own output.")
+    args = parser.parse_args()
+    args.split = None if args.split == "all" else args.split
+
+    server = make_server(
+        "127.0.0.1", 0, args.responses,
+        latency=args.latency, error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+        rpm=args.mock_rpm, retry_after=args.retry_after, seed=args.seed,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # Must be set before core.provider_clients / Django settings are imported
+    for var in PROVIDER_URL_VARS:
+        os.environ[var] = base_url
+    for var in API_KEY_VARS:
+        os.environ[var] = "mock"
+    os.environ["LLM_CACHE_PATH"] = ""
+
+    print(f"Mock server: {base_url} (latency {args.latency}, {args.responses} responses)")
+    reports = []
+    if args.target in ("cli", "both"):
+        print(f"Benchmarking run_evaluation.py with {args.model}...")
+        if args.compare_pack:
+            unpacked = bench_cli(argparse.Namespace(**{**vars(args), "pack": 1}), server)
+            packed = bench_cli(argparse.Namespace(**{**vars(args), "pack": args.compare_pack}), server)
+            packed["target"] += f" pack {args.compare_pack}"
+            reports += [unpacked, packed]
+        else:
+            reports.append(bench_cli(args, server))
+    if args.target in ("service", "both"):
+        print(f"Benchmarking core.eval_service with {args.service_model}...")
+        reports.append(bench_service(args, server))
+    server.shutdown()
+
+    print_reports(reports)
+
+    settings = {k: v for k, v in vars(args).items() if k not in ("json", "baseline", "verbose")}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "reports": reports}, f, ensure_ascii=False, indent=2)
+        print(f"\nSaved to {args.json}")
+
+    if args.baseline:
+        print(f"\nCompared with {args.baseline}:")
+        if not check_baseline(reports, Path(args.baseline), args.tolerance):
+            sys.exit(1)
+
+    if args.compare_pack:
+        speedup = packed["examples_per_sec"] / unpacked["examples_per_sec"]
+        print(f"\n--pack {args.compare_pack}: {speedup:.2f}x the unpacked throughput")
+        if speedup <= 1:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,7 @@ Usage:
 
     Or use as a library:
         from evaluate import evaluate_predictions
+        from evaluate import StreamingScorer  # incremental, one record at a time
 """
 
 import json
@@ -44,40 +45,58 @@ def normalize(text: str) -> str:
 
 
 def load_jsonl(path: Path) -> list[dict]:
-    """Load a JSONL file."""
-    with open(path, "r", encoding="utf-8") as f:
-        return [json.loads(line) for line in f if line.strip()]
-
+    """Load a JSONL file.
 
-def evaluate_predictions(gold: list[dict], predictions: dict[str, str]) -> dict:
+    A last line that is not valid JSON (cut off when a run crashed while
+    writing it) is skipped with a warning; a bad line anywhere else raises.
     """
-    Evaluate model predictions against gold standard.
-
-    Args:
-        gold: List of gold standard records from tamilnadai_v1.jsonl
-        predictions: Dict mapping record ID -> model's corrected sentence.
-                     Empty string or matching input = model says "no error".
-
-    Returns:
-        Dict with detection and correction metrics.
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+    records = []
+    for i, line in enumerate(lines):
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            if i < len(lines) - 1:
+                raise
+            print(f"WARNING: {path}: skipping incomplete last line")
+    return records
+
+
+class StreamingScorer:
+    """Incremental scorer: feed one (record, prediction) at a time.
+
+    Keeps the same running counters evaluate_predictions() reports, so live
+    metrics can be shown while a run is still in progress. results() returns
+    the same dict as evaluate_predictions().
+
+    Usage:
+        scorer = StreamingScorer()
+        for record in gold:
+            scorer.add(record, predictions.get(record["id"], ""))
+        print(scorer.summary())
     """
-    # Counters
-    tp = 0  # True positive: model correctly flags an error
-    fp = 0  # False positive: model flags a correct sentence as error
-    fn = 0  # False negative: model misses an actual error
-    tn = 0  # True negative: model correctly says "no error" on correct sentence
 
-    exact_match = 0  # Correction matches gold exactly
-    correction_attempted = 0  # Model flagged AND gold is error
+    def __init__(self):
+        # Counters
+        self.tp = 0  # True positive: model correctly flags an error
+        self.fp = 0  # False positive: model flags a correct sentence as error
+        self.fn = 0  # False negative: model misses an actual error
+        self.tn = 0  # True negative: model correctly says "no error" on correct sentence
 
-    category_tp = Counter()
-    category_fn = Counter()
-    category_exact = Counter()
+        self.exact_match = 0  # Correction matches gold exactly
+        self.correction_attempted = 0  # Model flagged AND gold is error
 
-    for record in gold:
-        rid = record["id"]
+        self.category_tp = Counter()
+        self.category_fn = Counter()
+        self.category_exact = Counter()
+        self.scored = 0
+
+    def add(self, record: dict, model_output: str):
+        """Score one record. Empty output means the model says "no error"."""
         is_error = record.get("is_error_example", True)
         category = record.get("category", "unknown")
+        self.scored += 1
 
         # Determine the input sentence the model saw
         if is_error:
@@ -87,71 +106,107 @@ def evaluate_predictions(gold: list[dict], predictions: dict[str, str]) -> dict:
             input_sentence = record["correct_sentence"]
             gold_correction = ""  # No correction needed
 
-        # Get model prediction
-        model_output = predictions.get(rid, "")
-
         # Determine if model flagged this as an error
+        model_output = model_output or ""
         model_says_error = bool(model_output) and normalize(model_output) != normalize(input_sentence)
 
         if is_error:
             if model_says_error:
-                tp += 1
-                category_tp[category] += 1
-                correction_attempted += 1
+                self.tp += 1
+                self.category_tp[category] += 1
+                self.correction_attempted += 1
                 if normalize(model_output) == normalize(gold_correction):
-                    exact_match += 1
-                    category_exact[category] += 1
+                    self.exact_match += 1
+                    self.category_exact[category] += 1
             else:
-                fn += 1
-                category_fn[category] += 1
+                self.fn += 1
+                self.category_fn[category] += 1
         else:
             if model_says_error:
-                fp += 1
+                self.fp += 1
             else:
-                tn += 1
-
-    # Calculate metrics
-    precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
-    recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
-    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
-    correction_accuracy = exact_match / correction_attempted if correction_attempted > 0 else 0.0
-    false_positive_rate = fp / (fp + tn) if (fp + tn) > 0 else 0.0
-
-    # Per-category detection recall
-    all_cats = set(list(category_tp.keys()) + list(category_fn.keys()))
-    per_category = {}
-    for cat in sorted(all_cats):
-        cat_total = category_tp[cat] + category_fn[cat]
-        cat_recall = category_tp[cat] / cat_total if cat_total > 0 else 0.0
-        cat_exact = category_exact[cat] / category_tp[cat] if category_tp[cat] > 0 else 0.0
-        per_category[cat] = {
-            "total": cat_total,
-            "detected": category_tp[cat],
-            "recall": round(cat_recall, 3),
-            "exact_match": category_exact[cat],
-            "correction_accuracy": round(cat_exact, 3),
+                self.tn += 1
+
+    @property
+    def precision(self) -> float:
+        return self.tp / (self.tp + self.fp) if (self.tp + self.fp) > 0 else 0.0
+
+    @property
+    def recall(self) -> float:
+        return self.tp / (self.tp + self.fn) if (self.tp + self.fn) > 0 else 0.0
+
+    @property
+    def f1(self) -> float:
+        p, r = self.precision, self.recall
+        return 2 * p * r / (p + r) if (p + r) > 0 else 0.0
+
+    @property
+    def correction_accuracy(self) -> float:
+        return self.exact_match / self.correction_attempted if self.correction_attempted > 0 else 0.0
+
+    @property
+    def false_positive_rate(self) -> float:
+        return self.fp / (self.fp + self.tn) if (self.fp + self.tn) > 0 else 0.0
+
+    def summary(self) -> str:
+        """One-line live metrics for progress output."""
+        return f"P {self.precision:.1%}  R {self.recall:.1%}  FPR {self.false_positive_rate:.1%}"
+
+    def results(self, total_predictions: int | None = None) -> dict:
+        """Metrics dict in the evaluate_predictions() format."""
+        # Per-category detection recall
+        all_cats = set(list(self.category_tp.keys()) + list(self.category_fn.keys()))
+        per_category = {}
+        for cat in sorted(all_cats):
+            cat_total = self.category_tp[cat] + self.category_fn[cat]
+            cat_recall = self.category_tp[cat] / cat_total if cat_total > 0 else 0.0
+            cat_exact = self.category_exact[cat] / self.category_tp[cat] if self.category_tp[cat] > 0 else 0.0
+            per_category[cat] = {
+                "total": cat_total,
+                "detected": self.category_tp[cat],
+                "recall": round(cat_recall, 3),
+                "exact_match": self.category_exact[cat],
+                "correction_accuracy": round(cat_exact, 3),
+            }
+
+        return {
+            "detection": {
+                "true_positives": self.tp,
+                "false_positives": self.fp,
+                "false_negatives": self.fn,
+                "true_negatives": self.tn,
+                "precision": round(self.precision, 4),
+                "recall": round(self.recall, 4),
+                "f1": round(self.f1, 4),
+            },
+            "correction": {
+                "attempted": self.correction_attempted,
+                "exact_match": self.exact_match,
+                "accuracy": round(self.correction_accuracy, 4),
+            },
+            "false_positive_rate": round(self.false_positive_rate, 4),
+            "total_evaluated": self.scored,
+            "total_predictions": self.scored if total_predictions is None else total_predictions,
+            "per_category": per_category,
         }
 
-    return {
-        "detection": {
-            "true_positives": tp,
-            "false_positives": fp,
-            "false_negatives": fn,
-            "true_negatives": tn,
-            "precision": round(precision, 4),
-            "recall": round(recall, 4),
-            "f1": round(f1, 4),
-        },
-        "correction": {
-            "attempted": correction_attempted,
-            "exact_match": exact_match,
-            "accuracy": round(correction_accuracy, 4),
-        },
-        "false_positive_rate": round(false_positive_rate, 4),
-        "total_evaluated": len(gold),
-        "total_predictions": len(predictions),
-        "per_category": per_category,
-    }
+
+def evaluate_predictions(gold: list[dict], predictions: dict[str, str]) -> dict:
+    """
+    Evaluate model predictions against gold standard.
+
+    Args:
+        gold: List of gold standard records from tamilnadai_v1.jsonl
+        predictions: Dict mapping record ID -> model's corrected sentence.
+                     Empty string or matching input = model says "no error".
+
+    Returns:
+        Dict with detection and correction metrics.
+    """
+    scorer = StreamingScorer()
+    for record in gold:
+        scorer.add(record, predictions.get(record["id"], ""))
+    return scorer.results(total_predictions=len(predictions))
 
 
 def print_results(results: dict):
@@ -26,6 +26,7 @@ import django
 django.setup()
 
 from core.models import Source, Rule, Sentence
+from core.sentence_ids import advance_past_existing
 
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "source" / "data"
@@ -164,6 +165,9 @@ def load_sentences():
             )
             created_count += 1
 
+    # The CSV brings its own SEN- IDs; new sentences must be numbered after them
+    advance_past_existing()
+
     print(f"  Sentences: {created_count} created, {skipped_count} skipped, {orphaned} orphaned")
     return created_count
 
@@ -0,0 +1,449 @@
+"""
+mock_llm_server.py — Local stand-in for provider APIs, for offline testing.
+
+Implements enough of the OpenAI, Anthropic and Gemini APIs (synchronous calls
+and batch jobs) for run_evaluation.py and the workbench evaluation service to
+run end to end without network access or cost, with realistic latency and
+injected failures for throughput benchmarks (see benchmark_runner.py).
+
+Endpoints:
+  OpenAI:    POST /v1/chat/completions, POST /v1/files, POST /v1/batches,
+             GET /v1/batches/{id}, GET /v1/files/{id}/content
+  Anthropic: POST /v1/messages, POST /v1/messages/batches,
+             GET /v1/messages/batches/{id}, GET /v1/messages/batches/{id}/results
+  Gemini:    POST /v1beta/models/{model}:generateContent
+  Mock:      GET /_mock/stats  (request, 429 and error counters)
+
+Responses (deterministic):
+  --responses echo  return the input sentence unchanged (model says "no error")
+  --responses gold  return the gold correction from the dataset
+  Packed prompts (numbered sentences, run_evaluation.py --pack) get numbered answers.
+
+Synchronous calls can be slowed down and made to fail:
+  --latency SPEC         per-call delay in ms: "0", "fixed:200", "uniform:100:400",
+                         "normal:300:50" or "lognormal:300:0.5" (median, sigma)
+  --error-rate P         fraction of calls answered with HTTP 500
+  --rate-limit-rate P    fraction of calls answered with HTTP 429 + Retry-After
+  --rpm N                answer 429 once more than N calls arrive in 60 seconds
+  --seed N               seed for latency and failure sampling
+
+Usage:
+    python tools/mock_llm_server.py --port 8765 --responses gold
+    python tools/run_evaluation.py --model gpt-4o-mini --batch --api-key test \\
+        --batch-base-url http://127.0.0.1:8765 --batch-poll-interval 0.5 --no-cache
+
+    python tools/mock_llm_server.py --latency lognormal:400:0.5 --rate-limit-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8765 python tools/run_evaluation.py --model gpt-4o-mini --api-key test --no-cache
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DATASET_PATH = PROJECT_DIR / "dataset" / "tamilnadai_v1.jsonl"
+
+
+def load_gold_answers(path: Path = DATASET_PATH) -> dict[str, str]:
+    """Map every input sentence in the dataset to its gold output."""
+    answers = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            answers[rec["correct_sentence"]] = rec["correct_sentence"]
+            if rec.get("is_error_example", True):
+                answers[rec["error_sentence"]] = rec["correct_sentence"]
+    return answers
+
+
+def extract_sentence(prompt: str) -> str:
+    """Pull the Tamil sentence out of a user prompt (it is always the last line)."""
+    last = prompt.strip().splitlines()[-1].strip()
+    return re.sub(r"^Sentence:\s*", "", last)
+
+
+_NUMBERED = re.compile(r"^(\d+)\.\s+(.+?)\s*$", re.MULTILINE)
+
+
+def parse_latency(spec: str):
+    """Turn a latency spec (milliseconds) into a sampler rng -> seconds.
+
+    "0" or "fixed:MS", "uniform:LOW:HIGH", "normal:MEAN:STDDEV",
+    "lognormal:MEDIAN:SIGMA".
+    """
+    kind, _, rest = spec.partition(":")
+    if not rest:
+        rest, kind = kind, "fixed"
+    try:
+        args = [float(x) for x in rest.split(":")]
+        if kind == "fixed" and len(args) == 1:
+            return lambda rng: args[0] / 1000
+        if kind == "uniform" and len(args) == 2:
+            return lambda rng: rng.uniform(*args) / 1000
+        if kind == "normal" and len(args) == 2:
+            return lambda rng: max(0.0, rng.gauss(*args)) / 1000
+        if kind == "lognormal" and len(args) == 2:
+            median, sigma = args
+            return lambda rng: median * rng.lognormvariate(0, sigma) / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"Bad latency spec {spec!r}; e.g. fixed:200, uniform:100:400, lognormal:300:0.5")
+
+
+class MockState:
+    """In-memory files, batches and counters shared by all request handler threads."""
+
+    def __init__(self, responses: str, batch_polls: int, latency: str = "0",
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 rpm: int | None = None, retry_after: float = 1.0, seed: int | None = None):
+        self.responses = responses
+        self.batch_polls = batch_polls
+        self.gold = load_gold_answers() if responses == "gold" else {}
+        self.files: dict[str, str] = {}
+        self.batches: dict[str, dict] = {}
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rpm = rpm
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.recent: deque[float] = deque()
+        self.counters = Counter()
+        self.lock = threading.Lock()
+
+    def answer(self, prompt: str) -> str:
+        numbered = _NUMBERED.findall(prompt)
+        if numbered:
+            return "\n".join(f"{n}. {self.gold.get(s, s)}" for n, s in numbered)
+        sentence = extract_sentence(prompt)
+        return self.gold.get(sentence, sentence)
+
+    def sample(self, endpoint: str) -> tuple[float, int | None]:
+        """Decide one synchronous call's fate: (delay seconds, error status or None)."""
+        with self.lock:
+            now = time.monotonic()
+            self.counters["requests"] += 1
+            self.counters[endpoint] += 1
+            while self.recent and self.recent[0] < now - 60:
+                self.recent.popleft()
+            delay = self.latency(self.rng)
+            roll = self.rng.random()
+            if self.rpm is not None and len(self.recent) >= self.rpm:
+                status = 429
+            elif roll < self.rate_limit_rate:
+                status = 429
+            elif roll < self.rate_limit_rate + self.error_rate:
+                status = 500
+            else:
+                status = None
+                self.recent.append(now)
+            if status == 429:
+                self.counters["rate_limited"] += 1
+            elif status == 500:
+                self.counters["errors"] += 1
+        return delay, status
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counters)
+
+    def new_id(self, prefix: str) -> str:
+        return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real providers
+    state: MockState = None  # set by make_server()
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- plumbing ---
+
+    def _send(self, status: int, body, content_type: str = "application/json", headers: dict | None = None):
+        if not isinstance(body, (bytes, str)):
+            body = json.dumps(body, ensure_ascii=False)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    def _not_found(self):
+        self._send(404, {"error": {"message": f"Unknown endpoint {self.command} {self.path}"}})
+
+    # --- routing ---
+
+    def do_POST(self):
+        if self.path == "/v1/chat/completions":
+            return self._sync_call("openai", self._openai_chat)
+        if self.path == "/v1/messages":
+            return self._sync_call("anthropic", self._anthropic_message)
+        if re.fullmatch(r"/v1beta/models/[\w.-]+:generateContent(\?.*)?", self.path):
+            return self._sync_call("gemini", self._gemini_generate)
+        if self.path == "/v1/files":
+            return self._openai_upload()
+        if self.path == "/v1/batches":
+            return self._openai_create_batch()
+        if self.path == "/v1/messages/batches":
+            return self._anthropic_create_batch()
+        self._not_found()
+
+    def do_GET(self):
+        if self.path == "/_mock/stats":
+            return self._send(200, self.state.stats())
+        m = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+        if m:
+            return self._openai_get_batch(m.group(1))
+        m = re.fullmatch(r"/v1/files/([\w-]+)/content", self.path)
+        if m:
+            return self._openai_file_content(m.group(1))
+        m = re.fullmatch(r"/v1/messages/batches/([\w-]+)", self.path)
+        if m:
+            return self._anthropic_get_batch(m.group(1))
+        m = re.fullmatch(r"/v1/messages/batches/([\w-]+)/results", self.path)
+        if m:
+            return self._anthropic_results(m.group(1))
+        self._not_found()
+
+    def _advance(self, batch: dict) -> bool:
+        """Count a status poll; the batch finishes after `batch_polls` polls."""
+        batch["polls"] += 1
+        return batch["polls"] > self.state.batch_polls
+
+    # --- Synchronous calls ---
+
+    def _sync_call(self, endpoint: str, respond):
+        """Read the request, wait the sampled latency, then fail or answer."""
+        req = json.loads(self._read_body())
+        delay, status = self.state.sample(endpoint)
+        time.sleep(delay)
+        if status == 429:
+            return self._send(
+                429, {"error": {"type": "rate_limit_error", "message": "Rate limit exceeded (mock)"}},
+                headers={"Retry-After": f"{self.state.retry_after:g}"},
+            )
+        if status == 500:
+            return self._send(500, {"error": {"type": "server_error", "message": "Injected failure (mock)"}})
+        self._send(200, respond(req))
+
+    def _openai_chat(self, req: dict) -> dict:
+        text = self.state.answer(req["messages"][-1]["content"])
+        return {
+            "id": self.state.new_id("chatcmpl"),
+            "object": "chat.completion",
+            "model": req.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        }
+
+    def _anthropic_message(self, req: dict) -> dict:
+        text = self.state.answer(req["messages"][-1]["content"])
+        return {
+            "id": self.state.new_id("msg"),
+            "type": "message",
+            "role": "assistant",
+            "model": req.get("model"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+        }
+
+    def _gemini_generate(self, req: dict) -> dict:
+        prompt = "".join(p.get("text", "") for p in req["contents"][-1]["parts"])
+        return {
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": self.state.answer(prompt)}]},
+                "finishReason": "STOP",
+            }],
+        }
+
+    # --- OpenAI Batch API ---
+
+    def _openai_upload(self):
+        body = self._read_body().decode("utf-8")
+        # The file part is the one with a filename; its content follows the blank line
+        part = next(p for p in body.split("--" + self.headers.get_boundary()) if "filename=" in p)
+        content = part.split("\r\n\r\n", 1)[1].rsplit("\r\n", 1)[0]
+        file_id = self.state.new_id("file")
+        with self.state.lock:
+            self.state.files[file_id] = content
+        self._send(200, {"id": file_id, "object": "file", "purpose": "batch"})
+
+    def _openai_create_batch(self):
+        req = json.loads(self._read_body())
+        with self.state.lock:
+            content = self.state.files.get(req["input_file_id"])
+        if content is None:
+            return self._send(404, {"error": {"message": "input file not found"}})
+
+        output_lines = []
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            user_prompt = item["body"]["messages"][-1]["content"]
+            output_lines.append(json.dumps({
+                "id": self.state.new_id("batch_req"),
+                "custom_id": item["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"role": "assistant", "content": self.state.answer(user_prompt)}}]},
+                },
+                "error": None,
+            }, ensure_ascii=False))
+
+        output_id = self.state.new_id("file")
+        batch = {
+            "id": self.state.new_id("batch"),
+            "object": "batch",
+            "status": "in_progress",
+            "input_file_id": req["input_file_id"],
+            "output_file_id": None,
+            "polls": 0,
+            "_output_id": output_id,
+        }
+        with self.state.lock:
+            self.state.files[output_id] = "\n".join(output_lines) + "\n"
+            self.state.batches[batch["id"]] = batch
+        self._send(200, {k: v for k, v in batch.items() if not k.startswith("_") and k != "polls"})
+
+    def _openai_get_batch(self, batch_id: str):
+        with self.state.lock:
+            batch = self.state.batches.get(batch_id)
+            if batch is None:
+                return self._send(404, {"error": {"message": "batch not found"}})
+            if self._advance(batch):
+                batch["status"] = "completed"
+                batch["output_file_id"] = batch["_output_id"]
+            view = {k: v for k, v in batch.items() if not k.startswith("_") and k != "polls"}
+        self._send(200, view)
+
+    def _openai_file_content(self, file_id: str):
+        with self.state.lock:
+            content = self.state.files.get(file_id)
+        if content is None:
+            return self._send(404, {"error": {"message": "file not found"}})
+        self._send(200, content, "application/jsonl")
+
+    # --- Anthropic Message Batches ---
+
+    def _anthropic_create_batch(self):
+        req = json.loads(self._read_body())
+        results = []
+        for item in req["requests"]:
+            user_prompt = item["params"]["messages"][-1]["content"]
+            results.append(json.dumps({
+                "custom_id": item["custom_id"],
+                "result": {
+                    "type": "succeeded",
+                    "message": {"content": [{"type": "text", "text": self.state.answer(user_prompt)}]},
+                },
+            }, ensure_ascii=False))
+
+        batch = {
+            "id": self.state.new_id("msgbatch"),
+            "type": "message_batch",
+            "processing_status": "in_progress",
+            "results_url": None,
+            "polls": 0,
+            "_results": "\n".join(results) + "\n",
+        }
+        with self.state.lock:
+            self.state.batches[batch["id"]] = batch
+        self._send(200, {k: v for k, v in batch.items() if not k.startswith("_") and k != "polls"})
+
+    def _anthropic_get_batch(self, batch_id: str):
+        with self.state.lock:
+            batch = self.state.batches.get(batch_id)
+            if batch is None:
+                return self._send(404, {"error": {"message": "batch not found"}})
+            if self._advance(batch):
+                batch["processing_status"] = "ended"
+                host, port = self.server.server_address[:2]
+                batch["results_url"] = f"http://{host}:{port}/v1/messages/batches/{batch_id}/results"
+            view = {k: v for k, v in batch.items() if not k.startswith("_") and k != "polls"}
+        self._send(200, view)
+
+    def _anthropic_results(self, batch_id: str):
+        with self.state.lock:
+            batch = self.state.batches.get(batch_id)
+        if batch is None or batch["processing_status"] != "ended":
+            return self._send(404, {"error": {"message": "results not available"}})
+        self._send(200, batch["_results"], "application/jsonl")
+
+
+class MockServer(ThreadingHTTPServer):
+    # Benchmarks open many connections at once; the default backlog of 5 drops them
+    request_queue_size = 256
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, responses: str = "echo",
+                batch_polls: int = 1, **options) -> MockServer:
+    """Build (but do not start) a mock server; port 0 picks a free port.
+
+    `options` are passed to MockState (latency, error_rate, rate_limit_rate,
+    rpm, retry_after, seed). The state is reachable as server.state.
+    """
+    state = MockState(responses, batch_polls, **options)
+    handler = type("BoundMockHandler", (MockHandler,), {"state": state})
+    server = MockServer((host, port), handler)
+    server.state = state
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the LLM provider APIs.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--responses", type=str, default="echo", choices=["echo", "gold"],
+        help="echo: return the input sentence; gold: return the dataset's correction.",
+    )
+    parser.add_argument(
+        "--batch-polls", type=int, default=1,
+        help="Status polls before a batch reports completion. Default: 1",
+    )
+    parser.add_argument(
+        "--latency", type=str, default="0",
+        help="Per-call latency in ms: fixed:MS, uniform:LOW:HIGH, normal:MEAN:SD, lognormal:MEDIAN:SIGMA. Default: 0",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls that return HTTP 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of calls that return HTTP 429.")
+    parser.add_argument("--rpm", type=int, default=None, help="Return 429 above this many calls per minute.")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s. Default: 1")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and failure sampling.")
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host, args.port, args.responses, args.batch_polls,
+        latency=args.latency, error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+        rpm=args.rpm, retry_after=args.retry_after, seed=args.seed,
+    )
+    print(f"Mock LLM server on http://{args.host}:{server.server_address[1]} ({args.responses} responses)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -7,24 +7,86 @@ the results using evaluate.py.
 Supported models:
   - OpenAI: gpt-4o, gpt-4o-mini
   - Anthropic: claude-sonnet-4-5-20250929, claude-haiku-4-5-20251001
-  - Google: gemini-2.0-flash (via google-genai)
+  - Google: gemini-2.0-flash, gemini-2.0-flash-lite
+
+All calls go over the pooled keep-alive HTTP clients in
+workbench_v2/core/provider_clients.py (HTTP/2 when httpx[http2] is installed);
+the scorecard records connect and time-to-first-byte statistics.
 
 Usage:
     python tools/run_evaluation.py --model gpt-4o-mini --split test
     python tools/run_evaluation.py --model claude-sonnet-4-5-20250929 --split test
     python tools/run_evaluation.py --model gemini-2.0-flash --split test
 
+    python tools/run_evaluation.py --model gpt-4o-mini --split test --concurrency 16
+    python tools/run_evaluation.py --model gpt-4o-mini --split test --resume results/gpt-4o-mini_20260101_120000.jsonl
+    python tools/run_evaluation.py --model claude-haiku-4-5-20251001 --split all --batch
+    python tools/run_evaluation.py --model gpt-4o-mini --split test --pack 8
+    python tools/run_evaluation.py --model claude-sonnet-4-5-20250929 --split all --rpm 40 --tpm 30000
+    python tools/run_evaluation.py --model gpt-4o-mini claude-haiku-4-5-20251001 gemini-2.0-flash --split test
+    python tools/run_evaluation.py --model all --split test
+
+Requests run concurrently on an asyncio event loop. Each provider has its own
+in-flight limit (PROVIDER_CONCURRENCY), which --concurrency overrides.
+
+Each model also has an adaptive rate limiter (workbench_v2/core/rate_limit.py)
+tracking requests and tokens per minute. It starts at PROVIDER_RATE_LIMITS
+(OPENAI_RPM/OPENAI_TPM, ANTHROPIC_*, GOOGLE_* environment variables, or
+--rpm/--tpm, override them), adds a step per successful call, and on a 429
+halves its rate once per Retry-After window and waits it out. 429s, 5xx and connection errors are retried
+with jittered exponential backoff (--max-retries) instead of being recorded as
+empty predictions.
+
+--resume continues a crashed or rate-limited run: records that already have a
+non-empty prediction are skipped, only missing or errored ones are queried,
+and the merged file is rewritten in dataset order and scored. A last line left
+half-written by the crash is dropped and its record queried again. Predictions
+outside the current --split/--limit are kept. A file whose scorecard (or file
+name) names another model, or whose scorecard names another split, is refused.
+
+Responses are cached in .cache/llm_responses.sqlite3 (shared format with the
+workbench, see workbench_v2/core/llm_cache.py), so re-running unchanged data
+costs nothing. Pass --no-cache to always hit the API.
+
+--batch submits the whole run as one provider batch job (OpenAI Batch API or
+Anthropic Message Batches) instead of synchronous calls: cheaper and free of
+per-request rate limits, at the cost of latency. Point --batch-base-url at
+tools/mock_llm_server.py to exercise the flow offline.
+
+--pack N sends N numbered sentences per request (PACKED_SYSTEM_PROMPT) and
+parses the numbered corrections back, so the system prompt and round trip are
+paid once per N sentences. Entries that cannot be parsed fall back to a normal
+single-sentence call. The output allowance (max_tokens, which also counts
+against the tokens-per-minute limit) is sized from the packed sentences rather
+than N times the single-call maximum. The scorecard records the packing factor.
+
+Several models (--model a b c, or --model all for every model in
+MODEL_PROVIDERS) are evaluated concurrently over one loaded dataset, each with
+its own in-flight limit and rate limiter, so the run takes about as long as
+the slowest model.
+
+The progress line shows live precision, recall and false positive rate as
+results arrive (evaluate.StreamingScorer). --fail-fast-below F1 stops a run
+whose F1 is still under the threshold after FAIL_FAST_MIN_EXAMPLES examples,
+before it spends more quota; what was collected can be continued with --resume.
+
 Output:
-    - predictions saved to results/{model}_{timestamp}.jsonl
+    - predictions saved to results/{model}_{timestamp}.jsonl (in dataset order)
     - scorecard printed to stdout and saved to results/{model}_{timestamp}_score.json
+    - with several models: comparison table printed and saved to
+      results/comparison_{timestamp}.json
 """
 
 import json
+import re
 import sys
 import os
 import time
 import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 sys.stdout.reconfigure(encoding="utf-8")
@@ -32,10 +94,23 @@ sys.stdout.reconfigure(encoding="utf-8")
 PROJECT_DIR = Path(__file__).resolve().parent.parent
 DATASET_PATH = PROJECT_DIR / "dataset" / "tamilnadai_v1.jsonl"
 RESULTS_DIR = PROJECT_DIR / "results"
+CACHE_PATH = PROJECT_DIR / ".cache" / "llm_responses.sqlite3"
 
-# Import the evaluation function
+# Import the evaluation function and the shared response cache
 sys.path.insert(0, str(PROJECT_DIR / "tools"))
-from evaluate import evaluate_predictions, print_results
+sys.path.insert(0, str(PROJECT_DIR / "workbench_v2"))
+from evaluate import StreamingScorer, evaluate_predictions, print_results, load_jsonl
+from core.llm_cache import LLMCache, make_key
+from core.provider_clients import anthropic_messages, gemini_generate, get_pool, openai_chat
+from core.rate_limit import AdaptiveRateLimiter, call_with_retries, estimate_tokens
+from batch_api import BATCH_CLIENTS, run_batch
+
+# Set by run_evaluation(); None disables caching
+RESPONSE_CACHE: LLMCache | None = None
+
+# Set by run_evaluation(): one limiter per model, and the retry budget per call
+RATE_LIMITERS: dict[str, AdaptiveRateLimiter] = {}
+MAX_RETRIES = 6
 
 
 # --- System prompt for all models ---
@@ -56,6 +131,26 @@ USER_PROMPT_TEMPLATE = """Check this Tamil sentence for word joining/separation
 
 {sentence}"""
 
+# --- Prompts for --pack (several numbered sentences per request) ---
+PACKED_SYSTEM_PROMPT = """You are a Tamil grammar expert specializing in word joining and separation rules
+(சொற்களை எழுதும் முறை) as defined by the Tamil Virtual University style guide.
+
+Your task: Given numbered Tamil sentences, check each one for a grammar error related to:
+- Word joining vs separation (சேர்த்து / பிரித்து எழுதல்)
+- Sandhi rules (சந்தி — consonant doubling when words join)
+- Suffix attachment (விகுதி இணைப்பு)
+
+Rules:
+- Treat every sentence independently.
+- For each sentence, output exactly one line: its number, a period, a space, then the sentence.
+- If the sentence has a grammar error in word joining/separation, give the corrected sentence.
+- If the sentence is grammatically correct, give the original sentence unchanged.
+- Keep the numbering and order of the input. Return nothing else — no explanation, no metadata."""
+
+PACKED_USER_PROMPT_TEMPLATE = """Check these {count} Tamil sentences for word joining/separation errors. Return each one, numbered, corrected (or the original if correct):
+
+{sentences}"""
+
 
 def load_dataset(split: str | None = None) -> list[dict]:
     """Load the gold standard dataset."""
@@ -79,49 +174,229 @@ def get_input_sentence(record: dict) -> str:
         return record["correct_sentence"]
 
 
+def load_predictions(path: Path) -> dict[str, str]:
+    """Load an existing predictions JSONL as {id: model_output}.
+
+    Later lines win, so a record re-queried during a resume replaces its
+    earlier (errored) entry.
+    """
+    return {r["id"]: r.get("model_output", "") for r in load_jsonl(path)}
+
+
+def write_predictions(path: Path, gold: list[dict], predictions: dict[str, str]):
+    """Rewrite a predictions file in dataset order, dropping empty outputs.
+
+    Predictions for IDs outside `gold` (another split or --limit of the same
+    file) are kept, after the gold ones.
+    """
+    gold_ids = [r["id"] for r in gold]
+    seen = set(gold_ids)
+    tmp_path = path.with_suffix(".jsonl.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for rid in gold_ids + [rid for rid in predictions if rid not in seen]:
+            output = predictions.get(rid, "")
+            if output:
+                f.write(json.dumps({"id": rid, "model_output": output}, ensure_ascii=False) + "\n")
+    tmp_path.replace(path)
+
+
+def trim_partial_line(path: Path):
+    """Cut off a last line left half-written by a crashed run.
+
+    An unterminated last line that still parses only gets its newline back.
+    """
+    with open(path, "rb+") as f:
+        data = f.read()
+        if not data or data.endswith(b"\n"):
+            return
+        cut = data.rfind(b"\n") + 1
+        try:
+            json.loads(data[cut:])
+        except ValueError:
+            f.truncate(cut)
+        else:
+            f.write(b"\n")
+
+
+def check_resume_target(pred_path: Path, model: str, split: str | None):
+    """Refuse to resume a predictions file written for another model or split.
+
+    The scorecard next to the file records both; a run that crashed before
+    writing one is checked by the model part of its file name.
+    """
+    score_path = pred_path.with_name(f"{pred_path.stem}_score.json")
+    if not score_path.exists():
+        if not pred_path.name.startswith(f"{_model_short(model)}_"):
+            raise ResumeMismatch(f"{pred_path.name} does not look like a {model} predictions file")
+        return
+    with open(score_path, encoding="utf-8") as f:
+        metadata = json.load(f).get("metadata", {})
+    for key, expected in (("model", model), ("split", split or "all")):
+        if metadata.get(key, expected) != expected:
+            raise ResumeMismatch(
+                f"{pred_path.name} holds {key} {metadata[key]!r} predictions; "
+                f"resume it with that {key}, not {expected!r}"
+            )
+
+
 # --- Provider implementations ---
 
+# Decoding parameters for OpenAI and Anthropic (sync and batch requests)
+DECODING_PARAMS = {"temperature": 0.0, "max_tokens": 500}
+
+
+def _full_prompt(system_prompt: str, user_prompt: str) -> str:
+    """The complete prompt text a request carries (used as the cache key)."""
+    return f"{system_prompt}\n\n{user_prompt}"
+
+
+def _cached(model: str, system_prompt: str, user_prompt: str, params: dict, call) -> str:
+    """Serve a query from RESPONSE_CACHE when possible, otherwise run `call`."""
+    if RESPONSE_CACHE is None:
+        return call()
+    return RESPONSE_CACHE.cached(model, _full_prompt(system_prompt, user_prompt), params, call)
+
+
+def _limited(model: str, system_prompt: str, user_prompt: str, params: dict, call):
+    """Wrap a network call in the model's rate limiter and retry policy.
+
+    Applied inside _cached, so cache hits never wait for the limiter.
+    """
+    tokens = estimate_tokens(_full_prompt(system_prompt, user_prompt), params.get("max_tokens", 0))
+    return lambda: call_with_retries(call, RATE_LIMITERS.get(model), tokens, max_retries=MAX_RETRIES)
+
+
+def complete_openai(system_prompt: str, user_prompt: str, model: str, api_key: str, params: dict) -> str:
+    """Send one chat completion to the OpenAI API."""
+    def call():
+        text, _ = openai_chat(
+            api_key, model,
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            **params,
+        )
+        return text.strip()
+
+    return _cached(model, system_prompt, user_prompt, params,
+                   _limited(model, system_prompt, user_prompt, params, call))
+
+
+def complete_anthropic(system_prompt: str, user_prompt: str, model: str, api_key: str, params: dict) -> str:
+    """Send one message to the Anthropic API."""
+    def call():
+        text, _ = anthropic_messages(
+            api_key, model,
+            [{"role": "user", "content": user_prompt}],
+            system=system_prompt,
+            **params,
+        )
+        return text.strip()
+
+    return _cached(model, system_prompt, user_prompt, params,
+                   _limited(model, system_prompt, user_prompt, params, call))
+
+
+def complete_google(system_prompt: str, user_prompt: str, model: str, api_key: str, params: dict) -> str:
+    """Send one generateContent call to the Gemini API.
+
+    Gemini runs with its default decoding settings, so `params` is only part
+    of the cache key.
+    """
+    def call():
+        text, _ = gemini_generate(api_key, model, _full_prompt(system_prompt, user_prompt))
+        return text.strip()
+
+    return _cached(model, system_prompt, user_prompt, params,
+                   _limited(model, system_prompt, user_prompt, params, call))
+
+
 def query_openai(sentence: str, model: str, api_key: str) -> str:
     """Query OpenAI API."""
-    from openai import OpenAI
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": USER_PROMPT_TEMPLATE.format(sentence=sentence)},
-        ],
-        temperature=0.0,
-        max_tokens=500,
-    )
-    return response.choices[0].message.content.strip()
+    user_prompt = USER_PROMPT_TEMPLATE.format(sentence=sentence)
+    return complete_openai(SYSTEM_PROMPT, user_prompt, model, api_key, DECODING_PARAMS)
 
 
 def query_anthropic(sentence: str, model: str, api_key: str) -> str:
     """Query Anthropic API."""
-    import anthropic
-    client = anthropic.Anthropic(api_key=api_key)
-    response = client.messages.create(
-        model=model,
-        max_tokens=500,
-        system=SYSTEM_PROMPT,
-        messages=[
-            {"role": "user", "content": USER_PROMPT_TEMPLATE.format(sentence=sentence)},
-        ],
-        temperature=0.0,
-    )
-    return response.content[0].text.strip()
+    user_prompt = USER_PROMPT_TEMPLATE.format(sentence=sentence)
+    return complete_anthropic(SYSTEM_PROMPT, user_prompt, model, api_key, DECODING_PARAMS)
 
 
 def query_google(sentence: str, model: str, api_key: str) -> str:
     """Query Google Generative AI API."""
-    from google import genai
-    client = genai.Client(api_key=api_key)
-    response = client.models.generate_content(
-        model=model,
-        contents=f"{SYSTEM_PROMPT}\n\n{USER_PROMPT_TEMPLATE.format(sentence=sentence)}",
-    )
-    return response.text.strip()
+    user_prompt = USER_PROMPT_TEMPLATE.format(sentence=sentence)
+    return complete_google(SYSTEM_PROMPT, user_prompt, model, api_key, {})
+
+
+# --- Packed (multi-sentence) prompts ---
+
+def build_packed_prompt(sentences: list[str]) -> str:
+    """Number the sentences 1..N for a single packed request."""
+    numbered = "\n".join(f"{i}. {sentence}" for i, sentence in enumerate(sentences, 1))
+    return PACKED_USER_PROMPT_TEMPLATE.format(count=len(sentences), sentences=numbered)
+
+
+_NUMBERED_LINE = re.compile(r"^\s*[*(\[]*\s*(\d+)\s*[*)\].:]+\**\s*(.*?)\s*$")
+
+
+def parse_numbered_output(text: str, count: int) -> dict[int, str]:
+    """Parse "N. sentence" lines back into {position (0-based): sentence}.
+
+    Tolerates "1.", "1)", "(1)", "1:" and markdown bold around the number.
+    Numbers outside 1..count, empty entries and numbers that appear more than
+    once with different text are dropped, so the caller can retry just those.
+    """
+    parsed: dict[int, str] = {}
+    conflicting = set()
+    for line in text.splitlines():
+        m = _NUMBERED_LINE.match(line)
+        if not m:
+            continue
+        number = int(m.group(1))
+        sentence = m.group(2).strip()
+        if not 1 <= number <= count or not sentence:
+            continue
+        pos = number - 1
+        if pos in parsed and parsed[pos] != sentence:
+            conflicting.add(pos)
+        parsed[pos] = sentence
+    for pos in conflicting:
+        del parsed[pos]
+    return parsed
+
+
+# Output allowance for a packed request: each answer is one sentence about as
+# long as its input, so twice the input estimate plus room for "N. " and the
+# newline. Providers charge max_tokens against TPM up front, so a nominal
+# 500 per sentence would make packing slower than single calls.
+PACKED_OUTPUT_FACTOR = 2
+PACKED_OUTPUT_MARGIN = 16
+
+
+def packed_max_tokens(sentences: list[str]) -> int:
+    """max_tokens for one packed request, capped at the single-call allowance per sentence."""
+    estimate = sum(PACKED_OUTPUT_FACTOR * estimate_tokens(s) + PACKED_OUTPUT_MARGIN for s in sentences)
+    return min(estimate, DECODING_PARAMS["max_tokens"] * len(sentences))
+
+
+def query_packed(sentences: list[str], provider: str, model: str, api_key: str) -> dict[int, str]:
+    """Check several sentences in one request.
+
+    A truncated answer only loses its last entries, which the caller
+    re-queries singly.
+
+    Returns:
+        {position: output} for every entry that could be parsed.
+    """
+    user_prompt = build_packed_prompt(sentences)
+    if provider == "google":
+        params = {}
+    else:
+        params = {**DECODING_PARAMS, "max_tokens": packed_max_tokens(sentences)}
+    text = COMPLETE_FUNCTIONS[provider](PACKED_SYSTEM_PROMPT, user_prompt, model, api_key, params)
+    return parse_numbered_output(text, len(sentences))
 
 
 # --- Model routing ---
@@ -141,34 +416,233 @@ QUERY_FUNCTIONS = {
     "google": query_google,
 }
 
+COMPLETE_FUNCTIONS = {
+    "openai": complete_openai,
+    "anthropic": complete_anthropic,
+    "google": complete_google,
+}
 
-def run_evaluation(
+# Max requests in flight per provider (override with --concurrency)
+PROVIDER_CONCURRENCY = {
+    "openai": 16,
+    "anthropic": 8,
+    "google": 16,
+}
+
+# Starting quotas for the adaptive limiter (roughly the entry-tier limits);
+# the limiter raises them while calls succeed and backs off on 429s. Set
+# OPENAI_RPM / OPENAI_TPM (ANTHROPIC_*, GOOGLE_*) to your account's limits.
+DEFAULT_RATE_LIMITS = {
+    "openai": {"rpm": 500, "tpm": 200_000},
+    "anthropic": {"rpm": 50, "tpm": 40_000},
+    "google": {"rpm": 60, "tpm": 1_000_000},
+}
+PROVIDER_RATE_LIMITS = {
+    provider: {
+        kind: float(os.environ.get(f"{provider.upper()}_{kind.upper()}") or default)
+        for kind, default in limits.items()
+    }
+    for provider, limits in DEFAULT_RATE_LIMITS.items()
+}
+
+
+# --- Concurrent query engine ---
+
+# --fail-fast-below is only checked once this many records have been scored
+FAIL_FAST_MIN_EXAMPLES = 50
+
+
+class RunAborted(RuntimeError):
+    """A run was stopped early by --fail-fast-below."""
+
+
+class ResumeMismatch(ValueError):
+    """--resume was given a predictions file from another model or split."""
+
+
+async def query_records(
+    records: list[dict],
+    query_fn,
     model: str,
-    split: str | None = None,
-    api_key: str | None = None,
-    limit: int | None = None,
-    delay: float = 0.5,
-) -> tuple[dict, Path]:
-    """Run end-to-end evaluation.
+    api_key: str,
+    concurrency: int,
+    out_file,
+    pack_fn=None,
+    pack_size: int = 1,
+    tag: str = "",
+    scorer: StreamingScorer | None = None,
+    fail_fast_below: float | None = None,
+) -> tuple[dict[str, str], int, int]:
+    """Query the model for every record with up to `concurrency` calls in flight.
 
-    Args:
-        model: Model identifier (e.g. "gpt-4o-mini").
-        split: Dataset split to evaluate ("test", "validation", or None for all).
-        api_key: API key. Falls back to env variable.
-        limit: Max number of examples to evaluate (for testing).
-        delay: Seconds between API calls (rate limiting).
+    Provider calls are blocking, so each one runs in a worker thread of
+    this call's own pool; several models can be queried on one event loop.
+    Completed predictions are written to `out_file` in dataset order: a
+    result is held back until every record before it has finished.
+
+    With `pack_fn` and pack_size > 1, records are sent `pack_size` at a time
+    through pack_fn(sentences) -> {position: output}; any position missing
+    from its result falls back to a single-sentence query_fn call.
+
+    `tag` prefixes progress and error lines (the model name in multi-model runs).
+
+    Each finished record is fed to `scorer`, whose live precision, recall and
+    FPR are shown in the progress line. If `fail_fast_below` is set and F1 is
+    under it after FAIL_FAST_MIN_EXAMPLES records, no new calls are started:
+    in-flight calls finish, their results are written, and RunAborted is raised.
 
     Returns:
-        Tuple of (results dict, predictions file path).
+        Tuple of (predictions dict, error count, fallback count).
     """
-    # Resolve provider and API key
-    if model not in MODEL_PROVIDERS:
-        raise ValueError(
-            f"Unknown model: {model}. "
-            f"Supported: {', '.join(MODEL_PROVIDERS.keys())}"
+    semaphore = asyncio.Semaphore(concurrency)
+    outputs: list[str | None] = [None] * len(records)
+    finished = [False] * len(records)
+    next_to_write = 0
+    completed = 0
+    errors = 0
+    fallbacks = 0
+    aborted = None
+    start_time = time.time()
+
+    def flush_in_order():
+        nonlocal next_to_write
+        while next_to_write < len(records) and finished[next_to_write]:
+            output = outputs[next_to_write]
+            if output is not None:
+                rid = records[next_to_write]["id"]
+                out_file.write(json.dumps({"id": rid, "model_output": output}, ensure_ascii=False) + "\n")
+            next_to_write += 1
+        out_file.flush()
+
+    def mark_done(indices: list[int]):
+        nonlocal completed, aborted
+        for i in indices:
+            finished[i] = True
+            if scorer is not None and not aborted:
+                scorer.add(records[i], outputs[i] or "")
+        before = completed
+        completed += len(indices)
+        flush_in_order()
+
+        # Progress
+        if completed // 10 > before // 10 and not aborted:
+            elapsed = time.time() - start_time
+            rate = completed / elapsed if elapsed > 0 else 0
+            eta = (len(records) - completed) / rate if rate > 0 else 0
+            live = f" | {scorer.summary()}" if scorer is not None else ""
+            print(f"  {tag}[{completed}/{len(records)}] {rate:.1f} examples/sec, ETA: {eta:.0f}s{live}")
+
+        if (fail_fast_below is not None and scorer is not None and not aborted
+                and scorer.scored >= FAIL_FAST_MIN_EXAMPLES and scorer.f1 < fail_fast_below):
+            aborted = f"F1 {scorer.f1:.1%} is below {fail_fast_below:.1%} after {scorer.scored} examples"
+            print(f"  {tag}ABORTING: {aborted}")
+
+    async def call(fn, *args, label: str, count_error: bool = True):
+        nonlocal errors
+        async with semaphore:
+            if aborted:
+                return None
+            try:
+                return await loop.run_in_executor(executor, partial(fn, *args))
+            except Exception as e:
+                print(f"  {tag}ERROR on {label}: {e}")
+                if count_error:
+                    errors += 1
+                return None
+
+    async def single(i: int):
+        record = records[i]
+        outputs[i] = await call(query_fn, get_input_sentence(record), model, api_key, label=record["id"])
+        mark_done([i])
+
+    async def packed(indices: list[int]):
+        nonlocal fallbacks
+        sentences = [get_input_sentence(records[i]) for i in indices]
+        label = f"{records[indices[0]]['id']}..{records[indices[-1]]['id']}"
+        # A failed pack is not a record error yet: its sentences are retried singly
+        parsed = await call(pack_fn, sentences, label=label, count_error=False) or {}
+        for pos, i in enumerate(indices):
+            if pos in parsed:
+                outputs[i] = parsed[pos]
+        mark_done([i for pos, i in enumerate(indices) if pos in parsed])
+
+        retry = [i for pos, i in enumerate(indices) if pos not in parsed]
+        if aborted:
+            mark_done(retry)
+            return
+        fallbacks += len(retry)
+        await asyncio.gather(*(single(i) for i in retry))
+
+    # Size the thread pool to the in-flight limit so calls never queue for a thread
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        if pack_fn and pack_size > 1:
+            chunks = [list(range(i, min(i + pack_size, len(records)))) for i in range(0, len(records), pack_size)]
+            await asyncio.gather(*(packed(chunk) for chunk in chunks))
+        else:
+            await asyncio.gather(*(single(i) for i in range(len(records))))
+
+    if aborted:
+        raise RunAborted(aborted)
+
+    predictions = {
+        record["id"]: output if output is not None else ""
+        for record, output in zip(records, outputs)
+    }
+    return predictions, errors, fallbacks
+
+
+def batch_query_records(
+    records: list[dict],
+    provider: str,
+    model: str,
+    api_key: str,
+    base_url: str | None = None,
+    poll_interval: float = 30.0,
+) -> tuple[dict[str, str], int]:
+    """Query every record through a single provider batch job.
+
+    Cached responses are reused and left out of the batch; fresh results
+    are written back to the cache.
+
+    Returns:
+        Tuple of (predictions dict, error count).
+    """
+    predictions = {}
+    to_submit = []
+    keys = {}
+    for record in records:
+        rid = record["id"]
+        user_prompt = USER_PROMPT_TEMPLATE.format(sentence=get_input_sentence(record))
+        if RESPONSE_CACHE is not None:
+            keys[rid] = make_key(model, _full_prompt(SYSTEM_PROMPT, user_prompt), DECODING_PARAMS)
+            cached = RESPONSE_CACHE.get(keys[rid])
+            if cached is not None:
+                predictions[rid] = cached
+                continue
+        to_submit.append((rid, user_prompt))
+
+    print(f"  {len(predictions)} cached, {len(to_submit)} to submit")
+    errors = 0
+    if to_submit:
+        outputs = run_batch(
+            provider, model, api_key, to_submit, SYSTEM_PROMPT, DECODING_PARAMS,
+            base_url=base_url, poll_interval=poll_interval,
         )
+        for rid, _ in to_submit:
+            output = outputs.get(rid, "")
+            if not output:
+                print(f"  ERROR on {rid}: no result in batch output")
+                errors += 1
+            elif RESPONSE_CACHE is not None:
+                RESPONSE_CACHE.set(keys[rid], model, output)
+            predictions[rid] = output
 
-    provider, env_key = MODEL_PROVIDERS[model]
+    return predictions, errors
+
+
+def resolve_api_key(env_key: str, api_key: str | None = None) -> str:
+    """Use the given key, else the env variable, else the project's .env file."""
     if not api_key:
         api_key = os.environ.get(env_key, "")
     if not api_key:
@@ -181,60 +655,138 @@ def run_evaluation(
                     break
     if not api_key:
         raise ValueError(f"No API key found. Set {env_key} env variable or pass --api-key.")
+    return api_key
 
-    query_fn = QUERY_FUNCTIONS[provider]
 
-    # Load dataset
-    gold = load_dataset(split)
-    if limit:
-        gold = gold[:limit]
+def check_model(model: str, batch: bool = False, pack_size: int = 1) -> str:
+    """Validate a model and its run options. Returns the model's provider."""
+    if model not in MODEL_PROVIDERS:
+        raise ValueError(
+            f"Unknown model: {model}. "
+            f"Supported: {', '.join(MODEL_PROVIDERS.keys())}"
+        )
+
+    provider = MODEL_PROVIDERS[model][0]
+    if batch and provider not in BATCH_CLIENTS:
+        raise ValueError(
+            f"--batch is not available for {provider} models. "
+            f"Supported providers: {', '.join(BATCH_CLIENTS)}"
+        )
+    if batch and pack_size > 1:
+        raise ValueError("--pack cannot be combined with --batch.")
+    if pack_size < 1:
+        raise ValueError("--pack must be at least 1.")
+    return provider
 
-    print(f"Model: {model} ({provider})")
-    print(f"Split: {split or 'all'}")
-    print(f"Examples: {len(gold)}")
-    print()
+
+def _model_short(model: str) -> str:
+    """`model` as used in predictions file names."""
+    return model.replace("/", "-").replace(".", "-")
+
+
+def _setup_run(models: list[str], use_cache: bool, rpm: float | None, tpm: float | None,
+               max_retries: int):
+    """Open the response cache and create one rate limiter per model."""
+    global RESPONSE_CACHE, MAX_RETRIES
+    RESPONSE_CACHE = LLMCache(CACHE_PATH) if use_cache else None
+    MAX_RETRIES = max_retries
+    for model in models:
+        limits = PROVIDER_RATE_LIMITS[MODEL_PROVIDERS[model][0]]
+        RATE_LIMITERS[model] = AdaptiveRateLimiter(rpm=rpm or limits["rpm"], tpm=tpm or limits["tpm"])
+
+
+async def evaluate_model(
+    model: str,
+    gold: list[dict],
+    split: str | None,
+    api_key: str,
+    timestamp: str,
+    concurrency: int | None = None,
+    resume: Path | None = None,
+    batch: bool = False,
+    batch_base_url: str | None = None,
+    batch_poll_interval: float = 30.0,
+    pack_size: int = 1,
+    fail_fast_below: float | None = None,
+    tag: str = "",
+) -> tuple[dict, Path]:
+    """Query one model for every gold record and score the predictions.
+
+    Expects _setup_run() to have been called for `model`. Several calls can
+    run concurrently on one event loop (see run_comparison()).
+
+    Returns:
+        Tuple of (results dict, predictions file path).
+    """
+    provider = MODEL_PROVIDERS[model][0]
+    query_fn = QUERY_FUNCTIONS[provider]
+    if not concurrency:
+        concurrency = PROVIDER_CONCURRENCY[provider]
+    limiter = RATE_LIMITERS[model]
 
     # Prepare output
-    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    model_short = model.replace("/", "-").replace(".", "-")
-    pred_path = RESULTS_DIR / f"{model_short}_{timestamp}.jsonl"
-    score_path = RESULTS_DIR / f"{model_short}_{timestamp}_score.json"
+    if resume:
+        pred_path = Path(resume)
+        if not pred_path.exists():
+            raise FileNotFoundError(f"Predictions file to resume not found: {pred_path}")
+        check_resume_target(pred_path, model, split)
+        # New predictions are appended, so they must not join a half-written line
+        trim_partial_line(pred_path)
+        existing = {rid: out for rid, out in load_predictions(pred_path).items() if out}
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        pred_path = RESULTS_DIR / f"{_model_short(model)}_{timestamp}.jsonl"
+        existing = {}
+
+    pending = [r for r in gold if r["id"] not in existing]
+    if resume:
+        print(f"{tag}Resuming {pred_path.name}: {len(gold) - len(pending)} done, {len(pending)} to query")
 
     # Run queries
-    predictions = {}
-    errors = 0
     start_time = time.time()
 
-    with open(pred_path, "w", encoding="utf-8") as f:
-        for i, record in enumerate(gold):
-            rid = record["id"]
-            sentence = get_input_sentence(record)
-
-            try:
-                output = query_fn(sentence, model, api_key)
-                predictions[rid] = output
-                f.write(json.dumps({"id": rid, "model_output": output}, ensure_ascii=False) + "\n")
-                f.flush()
+    if batch:
+        new_predictions, errors = await asyncio.to_thread(
+            batch_query_records,
+            pending, provider, model, api_key,
+            base_url=batch_base_url, poll_interval=batch_poll_interval,
+        )
+        fallbacks = 0
+    else:
+        def pack_fn(sentences):
+            return query_packed(sentences, provider, model, api_key)
 
-                # Progress
-                if (i + 1) % 10 == 0:
-                    elapsed = time.time() - start_time
-                    rate = (i + 1) / elapsed
-                    eta = (len(gold) - i - 1) / rate if rate > 0 else 0
-                    print(f"  [{i+1}/{len(gold)}] {rate:.1f} examples/sec, ETA: {eta:.0f}s")
+        # Live metrics cover the whole split, including resumed predictions
+        scorer = StreamingScorer()
+        for record in gold:
+            if record["id"] in existing:
+                scorer.add(record, existing[record["id"]])
 
-            except Exception as e:
-                print(f"  ERROR on {rid}: {e}")
-                predictions[rid] = ""
-                errors += 1
+        try:
+            with open(pred_path, "a" if resume else "w", encoding="utf-8") as f:
+                new_predictions, errors, fallbacks = await query_records(
+                    pending, query_fn, model, api_key, concurrency, f,
+                    pack_fn=pack_fn, pack_size=pack_size, tag=tag,
+                    scorer=scorer, fail_fast_below=fail_fast_below,
+                )
+        except RunAborted as e:
+            raise RunAborted(f"{e}; partial predictions kept in {pred_path} (continue with --resume)") from None
 
-            if delay > 0 and i < len(gold) - 1:
-                time.sleep(delay)
+    predictions = {**existing, **new_predictions}
+    if resume or batch:
+        write_predictions(pred_path, gold, predictions)
 
     elapsed = time.time() - start_time
-    print(f"\nDone in {elapsed:.1f}s ({errors} errors)")
-    print(f"Predictions saved to: {pred_path}")
+    print(f"\n{tag}Done in {elapsed:.1f}s ({errors} errors)")
+    print(f"{tag}Predictions saved to: {pred_path}")
+    if pack_size > 1:
+        print(f"{tag}Packing fallbacks: {fallbacks} sentences re-queried singly")
+    rate_stats = limiter.stats()
+    if not batch:
+        print(
+            f"{tag}Rate limit: {rate_stats['throttled']} throttled (429), {rate_stats['retries']} retries, "
+            f"ended at {rate_stats['rpm']} requests/min"
+        )
 
     # Evaluate
     results = evaluate_predictions(gold, predictions)
@@ -244,14 +796,119 @@ def run_evaluation(
         "split": split or "all",
         "total_examples": len(gold),
         "errors": errors,
+        "mode": "batch" if batch else "concurrent",
+        "concurrency": None if batch else concurrency,
+        "pack_size": pack_size,
+        "pack_fallbacks": fallbacks,
+        "rate_limit": None if batch else rate_stats,
         "elapsed_seconds": round(elapsed, 1),
         "timestamp": timestamp,
     }
+    if resume:
+        results["metadata"]["resumed_from"] = pred_path.name
+        results["metadata"]["reused_predictions"] = len(gold) - len(pending)
 
-    # Save scorecard
+    return results, pred_path
+
+
+def save_scorecard(results: dict, pred_path: Path, tag: str = "") -> Path:
+    """Save results next to their predictions file as {stem}_score.json."""
+    score_path = pred_path.with_name(f"{pred_path.stem}_score.json")
     with open(score_path, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
-    print(f"Scorecard saved to: {score_path}")
+    print(f"{tag}Scorecard saved to: {score_path}")
+    return score_path
+
+
+def _shared_stats() -> dict:
+    """Process-wide HTTP and cache statistics (printed once per run)."""
+    stats = {"http": get_pool().timing_summary()}
+    http_stats = stats["http"]
+    if http_stats["calls"]:
+        print(
+            f"HTTP: {http_stats['calls']} calls, {http_stats['new_connections']} new connections "
+            f"(mean connect {http_stats['mean_connect_ms']}ms), "
+            f"TTFB p50 {http_stats['p50_ttfb_ms']}ms / p95 {http_stats['p95_ttfb_ms']}ms"
+        )
+    if RESPONSE_CACHE is not None:
+        stats["cache"] = RESPONSE_CACHE.stats()
+        print(f"Cache: {stats['cache']['hits']} hits, {stats['cache']['misses']} misses")
+    return stats
+
+
+def run_evaluation(
+    model: str,
+    split: str | None = None,
+    api_key: str | None = None,
+    limit: int | None = None,
+    concurrency: int | None = None,
+    resume: Path | None = None,
+    use_cache: bool = True,
+    batch: bool = False,
+    batch_base_url: str | None = None,
+    batch_poll_interval: float = 30.0,
+    pack_size: int = 1,
+    rpm: float | None = None,
+    tpm: float | None = None,
+    max_retries: int = 6,
+    fail_fast_below: float | None = None,
+) -> tuple[dict, Path]:
+    """Run end-to-end evaluation.
+
+    Args:
+        model: Model identifier (e.g. "gpt-4o-mini").
+        split: Dataset split to evaluate ("test", "validation", or None for all).
+        api_key: API key. Falls back to env variable.
+        limit: Max number of examples to evaluate (for testing).
+        concurrency: Max requests in flight. Defaults to PROVIDER_CONCURRENCY[provider].
+        resume: Existing predictions file to continue. Only records without a
+            non-empty prediction are queried; results are merged into it.
+        use_cache: Serve repeated (model, prompt, params) queries from CACHE_PATH.
+        batch: Submit one provider batch job instead of synchronous calls.
+        batch_base_url: Override the batch API endpoint (e.g. the mock server).
+        batch_poll_interval: Seconds between batch status checks.
+        pack_size: Sentences per request (1 = no packing).
+        rpm: Starting requests per minute. Defaults to PROVIDER_RATE_LIMITS[provider].
+        tpm: Starting tokens per minute. Defaults to PROVIDER_RATE_LIMITS[provider].
+        max_retries: Retries per call for 429s, 5xx and connection errors.
+        fail_fast_below: Abort (RunAborted) if live F1 drops below this
+            after FAIL_FAST_MIN_EXAMPLES records. Not checked in batch mode.
+
+    Returns:
+        Tuple of (results dict, predictions file path).
+    """
+    provider = check_model(model, batch, pack_size)
+    api_key = resolve_api_key(MODEL_PROVIDERS[model][1], api_key)
+    _setup_run([model], use_cache, rpm, tpm, max_retries)
+
+    # Load dataset
+    gold = load_dataset(split)
+    if limit:
+        gold = gold[:limit]
+
+    print(f"Model: {model} ({provider})")
+    print(f"Split: {split or 'all'}")
+    print(f"Examples: {len(gold)}")
+    if batch:
+        print("Mode: batch")
+    else:
+        print(
+            f"Concurrency: {concurrency or PROVIDER_CONCURRENCY[provider]}, "
+            f"starting at {RATE_LIMITERS[model].rpm:.0f} requests/min"
+        )
+    if pack_size > 1:
+        print(f"Packing: {pack_size} sentences per request")
+    print()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results, pred_path = asyncio.run(evaluate_model(
+        model, gold, split, api_key, timestamp,
+        concurrency=concurrency, resume=resume, batch=batch,
+        batch_base_url=batch_base_url, batch_poll_interval=batch_poll_interval,
+        pack_size=pack_size, fail_fast_below=fail_fast_below,
+    ))
+    results["metadata"].update(_shared_stats())
+    save_scorecard(results, pred_path)
 
     # Print results
     print_results(results)
@@ -259,13 +916,140 @@ def run_evaluation(
     return results, pred_path
 
 
+def run_comparison(
+    models: list[str],
+    split: str | None = None,
+    api_key: str | None = None,
+    limit: int | None = None,
+    concurrency: int | None = None,
+    use_cache: bool = True,
+    batch: bool = False,
+    batch_base_url: str | None = None,
+    batch_poll_interval: float = 30.0,
+    pack_size: int = 1,
+    rpm: float | None = None,
+    tpm: float | None = None,
+    max_retries: int = 6,
+    fail_fast_below: float | None = None,
+) -> tuple[dict, Path]:
+    """Evaluate several models concurrently over one loaded dataset.
+
+    Every model runs on the same event loop with its own in-flight limit and
+    rate limiter, so the run takes about as long as the slowest model. Each
+    model gets its own predictions file and scorecard; a combined comparison
+    scorecard is saved to results/comparison_{timestamp}.json. A model that
+    fails (no API key, --fail-fast-below, ...) is reported without stopping
+    the others.
+
+    Args:
+        models: Model identifiers; duplicates are ignored.
+        api_key: Used for every model if given, otherwise each provider's env variable.
+        (other arguments as for run_evaluation(); --resume is single-model only)
+
+    Returns:
+        Tuple of (comparison dict, comparison file path).
+    """
+    models = list(dict.fromkeys(models))
+    for model in models:
+        check_model(model, batch, pack_size)
+    _setup_run(models, use_cache, rpm, tpm, max_retries)
+
+    gold = load_dataset(split)
+    if limit:
+        gold = gold[:limit]
+
+    print(f"Models: {', '.join(models)}")
+    print(f"Split: {split or 'all'}")
+    print(f"Examples: {len(gold)}")
+    print()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    width = max(len(m) for m in models)
+
+    async def run_one(model: str):
+        tag = f"[{model:<{width}}] "
+        key = resolve_api_key(MODEL_PROVIDERS[model][1], api_key)
+        results, pred_path = await evaluate_model(
+            model, gold, split, key, timestamp,
+            concurrency=concurrency, batch=batch, batch_base_url=batch_base_url,
+            batch_poll_interval=batch_poll_interval, pack_size=pack_size,
+            fail_fast_below=fail_fast_below, tag=tag,
+        )
+        save_scorecard(results, pred_path, tag)
+        return results, pred_path
+
+    async def run_all():
+        return await asyncio.gather(*(run_one(m) for m in models), return_exceptions=True)
+
+    start_time = time.time()
+    outcomes = asyncio.run(run_all())
+    elapsed = time.time() - start_time
+    print()
+
+    comparison = {"models": {}, "failed": {}}
+    for model, outcome in zip(models, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"[{model}] FAILED: {outcome}")
+            comparison["failed"][model] = str(outcome)
+            continue
+        results, pred_path = outcome
+        comparison["models"][model] = {
+            "predictions": pred_path.name,
+            "detection": results["detection"],
+            "correction": results["correction"],
+            "false_positive_rate": results["false_positive_rate"],
+            "per_category": results["per_category"],
+            "errors": results["metadata"]["errors"],
+            "elapsed_seconds": results["metadata"]["elapsed_seconds"],
+        }
+    comparison["metadata"] = {
+        "split": split or "all",
+        "total_examples": len(gold),
+        "elapsed_seconds": round(elapsed, 1),
+        "timestamp": timestamp,
+        **_shared_stats(),
+    }
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    comparison_path = RESULTS_DIR / f"comparison_{timestamp}.json"
+    with open(comparison_path, "w", encoding="utf-8") as f:
+        json.dump(comparison, f, ensure_ascii=False, indent=2)
+    print(f"Comparison saved to: {comparison_path}")
+
+    print_comparison(comparison)
+    return comparison, comparison_path
+
+
+def print_comparison(comparison: dict):
+    """Pretty-print a side-by-side comparison of several models."""
+    print(f"\n{'='*88}")
+    print("TAMILNADAI MODEL COMPARISON")
+    print(f"{'='*88}")
+    print(f"\n  {'Model':<30} {'Prec':>7} {'Recall':>7} {'F1':>7} {'CorAcc':>7} {'FPR':>7} {'Errors':>6} {'Time':>7}")
+    print(f"  {'-'*30} {'-'*7} {'-'*7} {'-'*7} {'-'*7} {'-'*7} {'-'*6} {'-'*7}")
+    ranked = sorted(comparison["models"].items(), key=lambda kv: kv[1]["detection"]["f1"], reverse=True)
+    for model, row in ranked:
+        det = row["detection"]
+        print(
+            f"  {model:<30} {det['precision']:>7.1%} {det['recall']:>7.1%} {det['f1']:>7.1%} "
+            f"{row['correction']['accuracy']:>7.1%} {row['false_positive_rate']:>7.1%} "
+            f"{row['errors']:>6} {row['elapsed_seconds']:>6.1f}s"
+        )
+    for model, error in comparison["failed"].items():
+        print(f"  {model:<30} FAILED: {error}")
+    print(f"\n  Wall time: {comparison['metadata']['elapsed_seconds']:.1f}s")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run LLM evaluation against TamilNadai benchmark."
     )
     parser.add_argument(
-        "--model", type=str, required=True,
-        help=f"Model to evaluate. Options: {', '.join(MODEL_PROVIDERS.keys())}",
+        "--model", type=str, nargs="+", required=True,
+        help=(
+            "Model(s) to evaluate; several models (or \"all\") run concurrently and "
+            f"produce a comparison scorecard. Options: {', '.join(MODEL_PROVIDERS.keys())}"
+        ),
     )
     parser.add_argument(
         "--split", type=str, default="test",
@@ -280,20 +1064,89 @@ def main():
         help="Max number of examples (for testing).",
     )
     parser.add_argument(
-        "--delay", type=float, default=0.5,
-        help="Seconds between API calls. Default: 0.5",
+        "--concurrency", type=int, default=None,
+        help="Max requests in flight (default: per-provider, see PROVIDER_CONCURRENCY).",
+    )
+    parser.add_argument(
+        "--rpm", type=float, default=None,
+        help="Starting requests per minute (default: per-provider, see PROVIDER_RATE_LIMITS).",
+    )
+    parser.add_argument(
+        "--tpm", type=float, default=None,
+        help="Starting tokens per minute (default: per-provider, see PROVIDER_RATE_LIMITS).",
+    )
+    parser.add_argument(
+        "--max-retries", type=int, default=6,
+        help="Retries per call on 429, 5xx and connection errors. Default: 6",
+    )
+    parser.add_argument(
+        "--fail-fast-below", type=float, default=None, metavar="F1",
+        help=(
+            f"Abort if live F1 is below this (0-1) after {FAIL_FAST_MIN_EXAMPLES} examples; "
+            "partial predictions are kept for --resume."
+        ),
+    )
+    parser.add_argument(
+        "--resume", type=str, default=None, metavar="PRED_FILE",
+        help="Continue an earlier run: skip records already in PRED_FILE, query the rest.",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Bypass the local response cache and always query the API.",
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Submit one provider batch job instead of synchronous calls (OpenAI/Anthropic).",
+    )
+    parser.add_argument(
+        "--batch-base-url", type=str, default=None,
+        help="Batch API base URL override, e.g. http://127.0.0.1:8765 for tools/mock_llm_server.py.",
+    )
+    parser.add_argument(
+        "--batch-poll-interval", type=float, default=30.0,
+        help="Seconds between batch status checks. Default: 30",
+    )
+    parser.add_argument(
+        "--pack", type=int, default=1, metavar="N",
+        help="Send N numbered sentences per request, parsing the numbered answers back. Default: 1 (off)",
     )
     args = parser.parse_args()
 
     split = None if args.split == "all" else args.split
+    models = [m for arg in args.model for m in arg.split(",") if m]
+    if models == ["all"]:
+        models = list(MODEL_PROVIDERS)
 
-    run_evaluation(
-        model=args.model,
+    options = dict(
         split=split,
         api_key=args.api_key,
         limit=args.limit,
-        delay=args.delay,
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        batch=args.batch,
+        batch_base_url=args.batch_base_url,
+        batch_poll_interval=args.batch_poll_interval,
+        pack_size=args.pack,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        max_retries=args.max_retries,
+        fail_fast_below=args.fail_fast_below,
     )
+    if len(models) == 1:
+        try:
+            run_evaluation(
+                model=models[0],
+                resume=Path(args.resume) if args.resume else None,
+                **options,
+            )
+        except RunAborted as e:
+            sys.exit(f"\nAborted: {e}")
+        except ResumeMismatch as e:
+            sys.exit(f"Cannot resume: {e}")
+    else:
+        if args.resume:
+            parser.error("--resume works with a single --model only.")
+        run_comparison(models, **options)
 
 
 if __name__ == "__main__":
@@ -99,6 +99,28 @@ GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 
+# LLM response cache (SQLite, shared with tools/run_evaluation.py). Set to "" to disable.
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", str(BASE_DIR / "llm_cache.sqlite3"))
+LLM_CACHE_MAX_MB = int(os.environ.get("LLM_CACHE_MAX_MB", "64"))
+
+# Evaluation job queue (core/jobs.py). "inline" drains the queue in a background
+# thread of the web process; "external" leaves it to `manage.py run_eval_worker`.
+EVAL_WORKER_MODE = os.environ.get("EVAL_WORKER_MODE", "inline")
+EVAL_JOB_LEASE_SECONDS = int(os.environ.get("EVAL_JOB_LEASE_SECONDS", "120"))
+# Model calls in flight per evaluation run, and results saved per database write
+EVAL_CONCURRENCY = int(os.environ.get("EVAL_CONCURRENCY", "8"))
+EVAL_CHUNK_SIZE = int(os.environ.get("EVAL_CHUNK_SIZE", "50"))
+# How long /evaluate/<id>/progress/?since=N may hold a request open waiting for
+# new results. Keep at 0 with gunicorn's sync workers, which it would tie up.
+EVAL_PROGRESS_WAIT_SECONDS = int(os.environ.get("EVAL_PROGRESS_WAIT_SECONDS", "0"))
+
+# Compressed dataset export snapshots (core/snapshots.py), rebuilt when the
+# dataset changes. Set to "" to always stream exports from the database.
+EXPORT_SNAPSHOT_DIR = os.environ.get("EXPORT_SNAPSHOT_DIR", str(BASE_DIR / "export_snapshots"))
+
+# Dashboard counts are cached per dataset version; this bounds their age anyway
+DASHBOARD_CACHE_SECONDS = int(os.environ.get("DASHBOARD_CACHE_SECONDS", "300"))
+
 # Cloud Run SSL — only redirect to HTTPS when running on Cloud Run (DATABASE_URL present)
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 SECURE_SSL_REDIRECT = bool(os.environ.get("DATABASE_URL"))
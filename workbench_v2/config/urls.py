@@ -20,6 +20,7 @@ urlpatterns = [
     path("sentences/<str:sentence_id>/delete/", views.delete_sentence, name="delete_sentence"),
     path("review-queue/", views.review_queue, name="review_queue"),
     path("review-log/", views.review_log, name="review_log"),
+    path("search/", views.search_view, name="search"),
     # Membership module
     path("profile/", views.profile_view, name="profile"),
     path("profile/change-password/", views.change_password, name="change_password"),
@@ -33,7 +34,10 @@ urlpatterns = [
     # Evaluation
     path("evaluate/", views.evaluate_view, name="evaluate"),
     path("evaluate/run/", views.run_evaluation_view, name="run_evaluation"),
+    path("evaluate/compare/", views.compare_runs, name="compare_runs"),
+    path("evaluate/compare.json", views.compare_runs_json, name="compare_runs_json"),
     path("evaluate/<int:run_id>/", views.eval_detail, name="eval_detail"),
+    path("evaluate/<int:run_id>/progress/", views.eval_progress, name="eval_progress"),
     path("evaluate/<int:run_id>/download.<str:fmt>", views.export_eval_run, name="export_eval_run"),
     # Exports (any logged-in member)
     path("exports/", views.exports_page, name="exports"),
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Source, Rule, Sentence, ReviewLog, Discussion, MemberProfile, Invitation, EvalRun, EvalResult
+from .models import Source, Rule, Sentence, ReviewLog, Discussion, MemberProfile, Invitation, EvalRun, EvalResult, EvalRunCategoryStats, EvalJob
+from .sentence_ids import advance_past_existing
 
 
 @admin.register(Source)
@@ -20,6 +21,12 @@ class SentenceAdmin(admin.ModelAdmin):
     list_filter = ["sentence_type", "source", "status"]
     search_fields = ["sentence_id", "sentence"]
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change:
+            # The ID was typed in rather than allocated; keep the allocator ahead of it
+            advance_past_existing()
+
 
 @admin.register(ReviewLog)
 class ReviewLogAdmin(admin.ModelAdmin):
@@ -57,3 +64,15 @@ class EvalRunAdmin(admin.ModelAdmin):
 class EvalResultAdmin(admin.ModelAdmin):
     list_display = ["id", "eval_run", "sentence", "outcome"]
     list_filter = ["outcome"]
+
+
+@admin.register(EvalRunCategoryStats)
+class EvalRunCategoryStatsAdmin(admin.ModelAdmin):
+    list_display = ["id", "eval_run", "category", "rule", "total", "wrong_total", "detected", "true_positives"]
+    list_filter = ["category"]
+
+
+@admin.register(EvalJob)
+class EvalJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "eval_run", "status", "attempts", "worker_id", "heartbeat_at", "lease_expires_at"]
+    list_filter = ["status"]
@@ -1,15 +1,24 @@
 """LLM evaluation service — send Tamil sentences to models, score responses."""
 
-import json
 import logging
-import urllib.request
-import urllib.error
+import threading
+import unicodedata
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FilteredRelation, Q, QuerySet
 from django.utils import timezone
 
+from .llm_cache import LLMCache
+from .provider_clients import anthropic_messages, gemini_generate, openai_chat
+
 logger = logging.getLogger(__name__)
 
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
 EVAL_PROMPT = (
     "You are a Tamil language expert. The following Tamil sentence may contain "
     "a writing convention error (such as incorrect word joining, missing sandhi "
@@ -20,93 +29,94 @@ EVAL_PROMPT = (
 )
 
 
-def _call_gemini(sentence: str) -> str | None:
-    """Call Gemini 2.0 Flash via the google-generativeai SDK."""
-    try:
-        import google.generativeai as genai
-    except ImportError:
-        logger.error("google-generativeai not installed")
+def get_response_cache() -> LLMCache | None:
+    """Return the process-wide LLM response cache, or None if disabled."""
+    global _response_cache
+    if not settings.LLM_CACHE_PATH:
         return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = LLMCache(
+                settings.LLM_CACHE_PATH,
+                max_bytes=settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+            )
+    return _response_cache
+
+
+def _cached_call(model_id: str, prompt: str, params: dict, call) -> str | None:
+    """Serve (model, prompt, params) from the response cache, else run `call`."""
+    cache = get_response_cache()
+    if cache is None:
+        return call()
+    return cache.cached(model_id, prompt, params, call)
 
+
+def _call_gemini(sentence: str) -> str | None:
+    """Call Gemini 2.0 Flash via the generateContent REST API (pooled HTTP, no SDK)."""
     api_key = settings.GEMINI_API_KEY
     if not api_key:
         return None
 
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-2.0-flash")
     prompt = EVAL_PROMPT.format(sentence=sentence)
 
-    try:
-        response = model.generate_content(prompt)
-        return response.text.strip().strip('"').strip("'").strip()
-    except Exception as e:
-        logger.error(f"Gemini eval error: {e}")
-        return None
+    def call():
+        try:
+            text, timing = gemini_generate(api_key, "gemini-2.0-flash", prompt)
+            logger.debug(f"Gemini eval: connect {timing['connect_ms']}ms, ttfb {timing['ttfb_ms']}ms")
+            return text.strip().strip('"').strip("'").strip()
+        except Exception as e:
+            logger.error(f"Gemini eval error: {e}")
+            return None
+
+    return _cached_call("gemini-2.0-flash", prompt, {}, call)
 
 
 def _call_claude(sentence: str) -> str | None:
-    """Call Claude via the Anthropic Messages API (HTTP, no SDK)."""
+    """Call Claude via the Anthropic Messages API (pooled HTTP, no SDK)."""
     api_key = settings.ANTHROPIC_API_KEY
     if not api_key:
         return None
 
     prompt = EVAL_PROMPT.format(sentence=sentence)
-    payload = json.dumps({
-        "model": "claude-sonnet-4-5-20250929",
-        "max_tokens": 256,
-        "messages": [{"role": "user", "content": prompt}],
-    }).encode("utf-8")
-
-    req = urllib.request.Request(
-        "https://api.anthropic.com/v1/messages",
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "x-api-key": api_key,
-            "anthropic-version": "2023-06-01",
-        },
-    )
 
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read())
-            text = data.get("content", [{}])[0].get("text", "")
+    def call():
+        try:
+            text, timing = anthropic_messages(
+                api_key, "claude-sonnet-4-5-20250929",
+                [{"role": "user", "content": prompt}],
+                max_tokens=256,
+            )
+            logger.debug(f"Claude eval: connect {timing['connect_ms']}ms, ttfb {timing['ttfb_ms']}ms")
             return text.strip().strip('"').strip("'").strip()
-    except Exception as e:
-        logger.error(f"Claude eval error: {e}")
-        return None
+        except Exception as e:
+            logger.error(f"Claude eval error: {e}")
+            return None
+
+    return _cached_call("claude-sonnet-4-5-20250929", prompt, {"max_tokens": 256}, call)
 
 
 def _call_openai(sentence: str) -> str | None:
-    """Call GPT-4o via the OpenAI Chat Completions API (HTTP, no SDK)."""
+    """Call GPT-4o via the OpenAI Chat Completions API (pooled HTTP, no SDK)."""
     api_key = settings.OPENAI_API_KEY
     if not api_key:
         return None
 
     prompt = EVAL_PROMPT.format(sentence=sentence)
-    payload = json.dumps({
-        "model": "gpt-4o",
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 256,
-    }).encode("utf-8")
-
-    req = urllib.request.Request(
-        "https://api.openai.com/v1/chat/completions",
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-    )
 
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read())
-            text = data["choices"][0]["message"]["content"]
+    def call():
+        try:
+            text, timing = openai_chat(
+                api_key, "gpt-4o",
+                [{"role": "user", "content": prompt}],
+                max_tokens=256,
+            )
+            logger.debug(f"OpenAI eval: connect {timing['connect_ms']}ms, ttfb {timing['ttfb_ms']}ms")
             return text.strip().strip('"').strip("'").strip()
-    except Exception as e:
-        logger.error(f"OpenAI eval error: {e}")
-        return None
+        except Exception as e:
+            logger.error(f"OpenAI eval error: {e}")
+            return None
+
+    return _cached_call("gpt-4o", prompt, {"max_tokens": 256}, call)
 
 
 MODEL_CALLERS = {
@@ -127,19 +137,54 @@ def get_available_models() -> list[dict]:
 
 def _normalize(text: str) -> str:
     """Normalize Tamil text for comparison — strip whitespace and punctuation."""
-    import unicodedata
     text = unicodedata.normalize("NFC", text.strip())
     # Remove trailing punctuation (period, question mark, etc.)
     text = text.rstrip(".")
     return text
 
 
-def score_result(sentence_obj, model_response: str) -> str:
+def eval_sentences(category_filter: str = "", status_filter: str = "all"):
+    """Sentences an evaluation run covers, given its filters."""
+    from .models import Sentence
+
+    qs = Sentence.objects.select_related("rule")
+    if category_filter:
+        qs = qs.filter(rule__category=category_filter)
+    if status_filter == "accepted":
+        qs = qs.filter(status="accepted")
+    return qs
+
+
+def build_gold_index(rule_ids=None) -> dict[int, frozenset[str]]:
+    """Map rule pk -> normalised correct sentences, in one query.
+
+    Args:
+        rule_ids: Rule pks (or a values("rule_id") subquery) to index;
+            None indexes every rule.
+
+    Returns:
+        Dict to pass as score_result(..., gold_index=...). Rules without
+        correct sentences are absent.
+    """
+    from .models import Sentence
+
+    qs = Sentence.objects.filter(sentence_type="correct")
+    if rule_ids is not None:
+        qs = qs.filter(rule_id__in=rule_ids)
+    index = {}
+    for rule_id, text in qs.values_list("rule_id", "sentence").iterator():
+        index.setdefault(rule_id, set()).add(_normalize(text))
+    return {rule_id: frozenset(texts) for rule_id, texts in index.items()}
+
+
+def score_result(sentence_obj, model_response: str, gold_index: dict | None = None) -> str:
     """Score a single model response against the gold standard.
 
     Args:
         sentence_obj: Sentence instance (has .sentence, .sentence_type, .rule)
         model_response: The LLM's returned text
+        gold_index: From build_gold_index(). Without it, the rule's correct
+            sentences are queried for every wrong sentence scored.
 
     Returns:
         One of: true_positive, partial, false_negative, true_negative, false_positive, error
@@ -157,14 +202,10 @@ def score_result(sentence_obj, model_response: str) -> str:
             return "false_negative"
 
         # Model made a change — check if it matches any correct sentence for this rule
-        correct_sentences = list(
-            sentence_obj.rule.sentences
-            .filter(sentence_type="correct")
-            .values_list("sentence", flat=True)
-        )
-        for correct in correct_sentences:
-            if _normalize(correct) == response:
-                return "true_positive"
+        if gold_index is None:
+            gold_index = build_gold_index([sentence_obj.rule_id])
+        if response in gold_index.get(sentence_obj.rule_id, ()):
+            return "true_positive"
 
         # Model changed it but not to the expected correction
         return "partial"
@@ -177,15 +218,225 @@ def score_result(sentence_obj, model_response: str) -> str:
             return "false_positive"
 
 
-def run_evaluation(eval_run, sentences):
+def run_progress(eval_run) -> dict:
+    """Progress of a run for the evaluate page: counts, live detection rate, speed and ETA."""
+    progress = {
+        "id": eval_run.pk,
+        "status": eval_run.status,
+        "processed": eval_run.processed_sentences,
+        "total": eval_run.total_sentences,
+        "percent": eval_run.progress_percent,
+        "detection_rate": eval_run.detection_rate,
+        "per_second": None,
+        "eta_seconds": None,
+    }
+    if eval_run.status != "running":
+        return progress
+
+    wrong = eval_run.results.filter(sentence__sentence_type="wrong").aggregate(
+        total=Count("id"), missed=Count("id", filter=Q(outcome="false_negative")),
+    )
+    if wrong["total"]:
+        progress["detection_rate"] = round((wrong["total"] - wrong["missed"]) / wrong["total"] * 100, 1)
+
+    elapsed = (timezone.now() - eval_run.started_at).total_seconds() if eval_run.started_at else 0
+    if elapsed > 0 and eval_run.processed_sentences:
+        per_second = eval_run.processed_sentences / elapsed
+        progress["per_second"] = round(per_second, 2)
+        remaining = max(0, eval_run.total_sentences - eval_run.processed_sentences)
+        progress["eta_seconds"] = round(remaining / per_second)
+    return progress
+
+
+def compared_results(run_a, run_b):
+    """Sentences scored in both runs, with each run's outcome and response.
+
+    A single query joining the two runs' EvalResult rows on sentence (served
+    by the (eval_run, sentence) index). Returns a values() queryset ordered by
+    sentence_id.
+    """
+    from .models import Sentence
+
+    return (
+        Sentence.objects
+        .annotate(
+            result_a=FilteredRelation("eval_results", condition=Q(eval_results__eval_run=run_a)),
+            result_b=FilteredRelation("eval_results", condition=Q(eval_results__eval_run=run_b)),
+        )
+        .filter(result_a__isnull=False, result_b__isnull=False)
+        .values("sentence_id", "sentence", "sentence_type", "rule_id")
+        .annotate(
+            outcome_a=F("result_a__outcome"),
+            outcome_b=F("result_b__outcome"),
+            response_a=F("result_a__model_response"),
+            response_b=F("result_b__model_response"),
+        )
+        .order_by("sentence_id")
+    )
+
+
+def compared_disagreements(run_a, run_b, outcome_a: str = "", outcome_b: str = ""):
+    """compared_results() where the two outcomes differ, optionally one transition."""
+    qs = compared_results(run_a, run_b).exclude(result_a__outcome=F("result_b__outcome"))
+    if outcome_a:
+        qs = qs.filter(result_a__outcome=outcome_a)
+    if outcome_b:
+        qs = qs.filter(result_b__outcome=outcome_b)
+    return qs
+
+
+def transition_matrix(run_a, run_b) -> dict[tuple[str, str], int]:
+    """Count sentences per (outcome in run_a, outcome in run_b), grouped in SQL."""
+    rows = (
+        compared_results(run_a, run_b)
+        .values("outcome_a", "outcome_b")
+        .annotate(n=Count("sentence_id"))
+        .order_by()
+    )
+    return {(row["outcome_a"], row["outcome_b"]): row["n"] for row in rows}
+
+
+def _save_chunk(eval_run, results: list, reused: int = 0) -> None:
+    """Save one chunk of results and advance the run's progress counters."""
+    from .models import EvalResult, EvalRun
+
+    with transaction.atomic():
+        # A sentence another worker already saved for this run is skipped by
+        # the (eval_run, sentence) unique constraint
+        EvalResult.objects.bulk_create(results, ignore_conflicts=True)
+        processed = EvalResult.objects.filter(eval_run=eval_run).count()
+        EvalRun.objects.filter(pk=eval_run.pk).update(
+            processed_sentences=processed,
+            reused_sentences=F("reused_sentences") + reused,
+        )
+    eval_run.processed_sentences = processed
+    eval_run.reused_sentences += reused
+
+
+def reusable_responses(eval_run) -> dict[str, str]:
+    """Responses an incremental run can copy from its base run.
+
+    Covers sentences not edited since the base run started and not errored
+    in it; map of sentence_id -> model response.
+    """
+    base = eval_run.base_run
+    if base is None or base.started_at is None:
+        return {}
+    return dict(
+        base.results
+        .filter(sentence__updated_at__lt=base.started_at)
+        .exclude(outcome="error")
+        .values_list("sentence_id", "model_response")
+        .order_by()
+    )
+
+
+def _compute_metrics(eval_run) -> None:
+    """Set detection, correction and false positive rates from the saved results."""
+    counts = {
+        (row["sentence__sentence_type"], row["outcome"]): row["n"]
+        for row in eval_run.results.values("sentence__sentence_type", "outcome").annotate(n=Count("id"))
+    }
+    wrong_total = sum(n for (kind, _), n in counts.items() if kind == "wrong")
+    correct_total = sum(n for (kind, _), n in counts.items() if kind == "correct")
+
+    # Detection rate: % of wrong sentences where model made any change
+    if wrong_total:
+        detected = wrong_total - counts.get(("wrong", "false_negative"), 0)
+        eval_run.detection_rate = round(detected / wrong_total * 100, 1)
+    else:
+        eval_run.detection_rate = 0
+
+    # Correction accuracy: % of wrong sentences fixed to exact correct form
+    if wrong_total:
+        correct_fixes = counts.get(("wrong", "true_positive"), 0)
+        eval_run.correction_accuracy = round(correct_fixes / wrong_total * 100, 1)
+    else:
+        eval_run.correction_accuracy = 0
+
+    # False positive rate: % of correct sentences wrongly changed
+    if correct_total:
+        false_pos = counts.get(("correct", "false_positive"), 0)
+        eval_run.false_positive_rate = round(false_pos / correct_total * 100, 1)
+    else:
+        eval_run.false_positive_rate = 0
+
+
+def compute_category_stats(eval_run) -> list:
+    """Store per-rule and per-category outcome counts for a finished run.
+
+    One conditional-Count query groups the results by rule; category rows
+    (rule=None) are summed from those. Replaces any stats already stored.
+    """
+    from .models import EvalRunCategoryStats
+
+    wrong = Q(sentence__sentence_type="wrong")
+    correct = Q(sentence__sentence_type="correct")
+    rows = (
+        eval_run.results
+        .values("sentence__rule_id", "sentence__rule__category")
+        .annotate(
+            total=Count("id"),
+            wrong_total=Count("id", filter=wrong),
+            detected=Count("id", filter=wrong & ~Q(outcome="false_negative")),
+            true_positives=Count("id", filter=wrong & Q(outcome="true_positive")),
+            correct_total=Count("id", filter=correct),
+            false_positives=Count("id", filter=correct & Q(outcome="false_positive")),
+        )
+        .order_by()
+    )
+    counters = ("total", "wrong_total", "detected", "true_positives", "correct_total", "false_positives")
+    stats = []
+    categories = {}
+    for row in rows:
+        counts = {name: row[name] for name in counters}
+        category = row["sentence__rule__category"]
+        stats.append(EvalRunCategoryStats(
+            eval_run=eval_run, category=category, rule_id=row["sentence__rule_id"], **counts,
+        ))
+        totals = categories.setdefault(category, dict.fromkeys(counters, 0))
+        for name in counters:
+            totals[name] += counts[name]
+    stats.extend(
+        EvalRunCategoryStats(eval_run=eval_run, category=category, rule=None, **totals)
+        for category, totals in categories.items()
+    )
+
+    with transaction.atomic():
+        eval_run.category_stats.all().delete()
+        EvalRunCategoryStats.objects.bulk_create(stats)
+    return stats
+
+
+class EvaluationCancelled(Exception):
+    """Raised inside run_evaluation when its `cancelled` callable returns True."""
+
+
+def run_evaluation(eval_run, sentences, concurrency: int | None = None, chunk_size: int | None = None,
+                   cancelled=None):
     """Execute an evaluation run against a list of sentences.
 
     Designed to run in a background thread. Updates eval_run.status
     to 'running', 'completed', or 'failed' as it progresses.
 
+    Model calls run on a pool of `concurrency` threads; results are saved
+    every `chunk_size` sentences and counted in eval_run.processed_sentences,
+    so progress is visible during the run and a crash keeps finished work.
+    Sentences that already have a result in this run are skipped, which is
+    how a retried job resumes.
+
+    Incremental runs (eval_run.base_run set) only call the model for
+    sentences added or edited since the base run; the others reuse the base
+    run's response, re-scored against the current gold corrections.
+
     Args:
         eval_run: EvalRun instance (already saved with model_name etc.)
-        sentences: QuerySet of Sentence objects to test
+        sentences: QuerySet (iterated in chunks) or list of Sentence objects
+        concurrency: Model calls in flight (default settings.EVAL_CONCURRENCY)
+        chunk_size: Results per database write (default settings.EVAL_CHUNK_SIZE)
+        cancelled: Optional callable checked before each chunk is saved; when
+            it returns True the run stops without saving or changing status
+            (used by job workers that have lost their lease)
     """
     from .models import EvalResult
 
@@ -196,61 +447,82 @@ def run_evaluation(eval_run, sentences):
         eval_run.save()
         return
 
+    concurrency = max(1, concurrency or settings.EVAL_CONCURRENCY)
+    chunk_size = max(1, chunk_size or settings.EVAL_CHUNK_SIZE)
+
     try:
+        done_ids = set(eval_run.results.values_list("sentence_id", flat=True))
         eval_run.status = "running"
-        eval_run.started_at = timezone.now()
-        eval_run.total_sentences = len(sentences)
+        eval_run.started_at = eval_run.started_at or timezone.now()
+        if isinstance(sentences, QuerySet):
+            eval_run.total_sentences = sentences.count()
+            gold_index = build_gold_index(sentences.values("rule_id"))
+            sentences = sentences.iterator(chunk_size=chunk_size)
+        else:
+            eval_run.total_sentences = len(sentences)
+            gold_index = build_gold_index({s.rule_id for s in sentences})
+        eval_run.processed_sentences = len(done_ids)
         eval_run.save()
+        reusable = reusable_responses(eval_run)
+
+        chunk = []
+        chunk_reused = 0
+
+        def save(results, reused):
+            if cancelled is not None and cancelled():
+                raise EvaluationCancelled
+            _save_chunk(eval_run, results, reused)
 
-        results = []
-        for sentence_obj in sentences:
-            response = caller(sentence_obj.sentence)
-            outcome = score_result(sentence_obj, response)
-            results.append(EvalResult(
+        def collect():
+            nonlocal chunk, chunk_reused
+            sentence_obj, future, reused = in_flight.popleft()
+            response = future.result()
+            chunk.append(EvalResult(
                 eval_run=eval_run,
                 sentence=sentence_obj,
                 model_response=response or "",
-                outcome=outcome,
+                outcome=score_result(sentence_obj, response, gold_index),
             ))
-
-        EvalResult.objects.bulk_create(results)
+            chunk_reused += reused
+            if len(chunk) >= chunk_size:
+                save(chunk, chunk_reused)
+                chunk, chunk_reused = [], 0
+
+        # At most 2x concurrency calls are queued ahead of the chunk being
+        # built, so memory stays bounded however many sentences there are
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"eval-{eval_run.pk}") as executor:
+            for sentence_obj in sentences:
+                if sentence_obj.pk in done_ids:
+                    continue
+                if sentence_obj.pk in reusable:
+                    future = Future()
+                    future.set_result(reusable[sentence_obj.pk])
+                    in_flight.append((sentence_obj, future, 1))
+                else:
+                    in_flight.append((sentence_obj, executor.submit(caller, sentence_obj.sentence), 0))
+                while len(in_flight) >= concurrency * 2 or (in_flight and in_flight[0][1].done()):
+                    collect()
+            while in_flight:
+                collect()
+        if chunk:
+            save(chunk, chunk_reused)
 
         # Calculate aggregate metrics
-        total = len(results)
-        if total == 0:
+        if not eval_run.results.exists():
             eval_run.status = "completed"
             eval_run.completed_at = timezone.now()
             eval_run.save()
             return
 
-        wrong_results = [r for r in results if r.sentence.sentence_type == "wrong"]
-        correct_results = [r for r in results if r.sentence.sentence_type == "correct"]
-
-        # Detection rate: % of wrong sentences where model made any change
-        if wrong_results:
-            detected = sum(1 for r in wrong_results if r.outcome != "false_negative")
-            eval_run.detection_rate = round(detected / len(wrong_results) * 100, 1)
-        else:
-            eval_run.detection_rate = 0
-
-        # Correction accuracy: % of wrong sentences fixed to exact correct form
-        if wrong_results:
-            correct_fixes = sum(1 for r in wrong_results if r.outcome == "true_positive")
-            eval_run.correction_accuracy = round(correct_fixes / len(wrong_results) * 100, 1)
-        else:
-            eval_run.correction_accuracy = 0
-
-        # False positive rate: % of correct sentences wrongly changed
-        if correct_results:
-            false_pos = sum(1 for r in correct_results if r.outcome == "false_positive")
-            eval_run.false_positive_rate = round(false_pos / len(correct_results) * 100, 1)
-        else:
-            eval_run.false_positive_rate = 0
-
+        _compute_metrics(eval_run)
+        compute_category_stats(eval_run)
         eval_run.status = "completed"
         eval_run.completed_at = timezone.now()
         eval_run.save()
 
+    except EvaluationCancelled:
+        logger.warning(f"Evaluation run {eval_run.id} cancelled; leaving it to its new owner")
     except Exception as e:
         logger.error(f"Evaluation run {eval_run.id} failed: {e}")
         eval_run.status = "failed"
@@ -0,0 +1,241 @@
+"""Streaming CSV/JSON writers for the dataset and eval-run downloads.
+
+Each writer is a generator of text chunks fed by .iterator() querysets, so an
+export never holds the whole table in memory and the first bytes go out as
+soon as the first rows are read. streaming_download() wraps a generator in a
+StreamingHttpResponse, gzip-compressed when the client accepts it.
+"""
+
+import csv
+import json
+import zlib
+
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+ITERATOR_CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+CATEGORY_SHORT = {
+    "இலக்கண அமைப்பில் சொற்கள்": "Grammar Structure",
+    "தனிச் சொற்களை எழுதும் முறை": "Individual Words",
+    "சந்தி": "Sandhi",
+}
+
+DATASET_CSV_HEADER = [
+    "rule_id", "rule_category", "rule_category_english", "rule_title",
+    "rule_description", "sentence_id", "sentence", "sentence_type",
+    "sentence_source", "sentence_status", "created_by", "created_at",
+]
+
+EVAL_CSV_HEADER = [
+    "sentence_id", "rule_id", "rule_category", "sentence_type",
+    "original_sentence", "model_response", "outcome",
+]
+
+SENTENCE_FIELDS = (
+    "rule_id", "sentence_id", "sentence", "sentence_type", "source", "status",
+    "created_by__username", "created_at",
+)
+
+RESULT_FIELDS = (
+    "sentence_id", "sentence__rule_id", "sentence__rule__category",
+    "sentence__sentence_type", "sentence__sentence", "model_response", "outcome",
+)
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(pieces):
+    """Join small strings into chunks of about FLUSH_BYTES."""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _indent(text: str, spaces: int) -> str:
+    pad = " " * spaces
+    return text.replace("\n", "\n" + pad)
+
+
+def _json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, indent=2)
+
+
+def _rule_header(rule) -> dict:
+    return {
+        "rule_id": rule.rule_id,
+        "category": rule.category,
+        "category_english": CATEGORY_SHORT.get(rule.category, rule.category),
+        "title": rule.title,
+        "description": rule.description,
+        "example_1": rule.example_1,
+        "example_2": rule.example_2,
+        "source": rule.source.name if rule.source else "",
+        "source_page": rule.source_page,
+    }
+
+
+def _sentence_json(s: dict) -> dict:
+    return {
+        "sentence_id": s["sentence_id"],
+        "sentence": s["sentence"],
+        "type": s["sentence_type"],
+        "source": s["source"],
+        "status": s["status"],
+        "created_by": s["created_by__username"] or "",
+        "created_at": s["created_at"].isoformat() if s["created_at"] else "",
+    }
+
+
+def _rows_by_rule(rules, sentences):
+    """Pair each rule with its sentences by walking two cursors in step.
+
+    `rules` and `sentences` must be ordered the same way by rule.
+    """
+    sentence_iter = sentences.values(*SENTENCE_FIELDS).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    pending = next(sentence_iter, None)
+    for rule in rules.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        own = []
+        while pending is not None and pending["rule_id"] == rule.rule_id:
+            own.append(pending)
+            pending = next(sentence_iter, None)
+        yield rule, own
+
+
+def dataset_csv(rules, sentences):
+    """CSV rows for every sentence of `rules`, one row per sentence."""
+    writer = csv.writer(_Echo())
+
+    def pieces():
+        yield "\ufeff"  # UTF-8 BOM for Excel Tamil text support
+        yield writer.writerow(DATASET_CSV_HEADER)
+        for rule, rows in _rows_by_rule(rules, sentences):
+            category_english = CATEGORY_SHORT.get(rule.category, rule.category)
+            for s in rows:
+                yield writer.writerow([
+                    rule.rule_id,
+                    rule.category,
+                    category_english,
+                    rule.title,
+                    rule.description,
+                    s["sentence_id"],
+                    s["sentence"],
+                    s["sentence_type"],
+                    s["source"],
+                    s["status"],
+                    s["created_by__username"] or "",
+                    s["created_at"].isoformat() if s["created_at"] else "",
+                ])
+
+    return _batched(pieces())
+
+
+def dataset_json(metadata: dict, rules, sentences):
+    """Hierarchical {"metadata", "rules": [{..., "sentences": [...]}]} JSON."""
+
+    def pieces():
+        yield '{\n  "metadata": ' + _indent(_json(metadata), 2) + ',\n  "rules": ['
+        for i, (rule, rows) in enumerate(_rows_by_rule(rules, sentences)):
+            header = _json({**_rule_header(rule), "sentences": []})
+            # Reopen the empty "sentences": [] list and stream its items
+            yield ("," if i else "") + "\n    " + _indent(header[:-len("[]\n}")], 4) + "["
+            for j, s in enumerate(rows):
+                yield ("," if j else "") + "\n        " + _indent(_json(_sentence_json(s)), 8)
+            yield ("\n      ]" if rows else "]") + "\n    }"
+        yield "\n  ]\n}"
+
+    return _batched(pieces())
+
+
+def eval_run_csv(eval_run, results):
+    """Commented metadata lines followed by one CSV row per result."""
+    writer = csv.writer(_Echo())
+
+    def pieces():
+        yield "\ufeff"  # UTF-8 BOM
+        yield "# Tamil Nadai Evaluation Results\n"
+        yield f"# Model: {eval_run.get_model_name_display()}\n"
+        yield f"# Date: {eval_run.created_at.strftime('%d %b %Y %H:%M')}\n"
+        yield f"# Sentences: {eval_run.total_sentences}\n"
+        if eval_run.detection_rate is not None:
+            yield f"# Detection Rate: {eval_run.detection_rate}%\n"
+        if eval_run.correction_accuracy is not None:
+            yield f"# Correction Accuracy: {eval_run.correction_accuracy}%\n"
+        if eval_run.false_positive_rate is not None:
+            yield f"# False Positive Rate: {eval_run.false_positive_rate}%\n"
+        if eval_run.category_filter:
+            yield f"# Category: {eval_run.category_filter}\n"
+        yield f"# Status Filter: {eval_run.get_status_filter_display()}\n"
+        yield writer.writerow(EVAL_CSV_HEADER)
+        for row in results.values_list(*RESULT_FIELDS).iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            yield writer.writerow(row)
+
+    return _batched(pieces())
+
+
+def eval_run_json(metadata: dict, results):
+    """{"metadata", "results": [...]} JSON for one run."""
+
+    def pieces():
+        yield '{\n  "metadata": ' + _indent(_json(metadata), 2) + ',\n  "results": ['
+        empty = True
+        for row in results.values_list(*RESULT_FIELDS).iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            yield ("\n    " if empty else ",\n    ") + _indent(_json(dict(zip(EVAL_CSV_HEADER, row))), 4)
+            empty = False
+        yield "]\n}" if empty else "\n  ]\n}"
+
+    return _batched(pieces())
+
+
+def _gzipped(chunks):
+    """Gzip a stream of text chunks, flushing after each one."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(request) -> bool:
+    """Whether the request's Accept-Encoding allows gzip (q=0 refuses it)."""
+    qualities = {}
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def streaming_download(request, chunks, content_type: str, filename: str) -> StreamingHttpResponse:
+    """Stream `chunks` as an attachment, gzip-encoded if the client accepts it."""
+    if accepts_gzip(request):
+        response = StreamingHttpResponse(_gzipped(chunks), content_type=content_type)
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
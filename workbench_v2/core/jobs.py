@@ -0,0 +1,225 @@
+"""Durable evaluation job queue backed by the EvalJob table.
+
+Web requests enqueue jobs; workers claim them with a time-limited lease,
+renew the lease with heartbeats while the evaluation runs, and mark them done
+or failed. If a worker dies (Cloud Run scale-down, gunicorn recycling a
+worker), its lease expires and the next worker to look picks the job up again.
+
+Workers are either dedicated processes (`python manage.py run_eval_worker`) or,
+with EVAL_WORKER_MODE = "inline" (the default), a background thread in the web
+process that drains the queue after a run is submitted.
+
+Claiming uses SELECT ... FOR UPDATE SKIP LOCKED where the database supports it
+(Postgres). SQLite has no row locks, so the claim itself is a conditional
+UPDATE on (status, attempts): of two workers racing for a job, only one
+update matches.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import EvalJob, EvalRun
+
+logger = logging.getLogger(__name__)
+
+_inline_lock = threading.Lock()
+_inline_thread = None
+
+
+def default_worker_id() -> str:
+    """Identify this worker in EvalJob.worker_id: host, pid and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def lease_duration() -> timedelta:
+    return timedelta(seconds=settings.EVAL_JOB_LEASE_SECONDS)
+
+
+def enqueue(eval_run: EvalRun) -> EvalJob:
+    """Queue an evaluation run for a worker."""
+    return EvalJob.objects.create(eval_run=eval_run)
+
+
+def claimable_jobs():
+    """Queued jobs, plus running jobs whose worker stopped heartbeating."""
+    return EvalJob.objects.filter(
+        Q(status="queued") | Q(status="running", lease_expires_at__lt=timezone.now()),
+        attempts__lt=F("max_attempts"),
+    ).order_by("created_at")
+
+
+def claim_job(worker_id: str) -> EvalJob | None:
+    """Lease the oldest claimable job to `worker_id`, or return None."""
+    now = timezone.now()
+    with transaction.atomic():
+        candidates = claimable_jobs()
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        for job in candidates[:5]:
+            claimed = EvalJob.objects.filter(
+                pk=job.pk, status=job.status, attempts=job.attempts,
+            ).update(
+                status="running",
+                worker_id=worker_id,
+                attempts=F("attempts") + 1,
+                lease_expires_at=now + lease_duration(),
+                heartbeat_at=now,
+                updated_at=now,
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+    return None
+
+
+def heartbeat(job: EvalJob, worker_id: str) -> bool:
+    """Extend the lease. Returns False if the job is no longer ours."""
+    now = timezone.now()
+    return EvalJob.objects.filter(pk=job.pk, worker_id=worker_id, status="running").update(
+        lease_expires_at=now + lease_duration(), heartbeat_at=now, updated_at=now,
+    ) == 1
+
+
+def fail_exhausted_jobs() -> int:
+    """Give up on jobs whose lease expired after their last allowed attempt."""
+    now = timezone.now()
+    stale = EvalJob.objects.filter(
+        status="running", lease_expires_at__lt=now, attempts__gte=F("max_attempts"),
+    )
+    run_ids = list(stale.values_list("eval_run_id", flat=True))
+    if not run_ids:
+        return 0
+    count = stale.update(
+        status="failed", last_error="Worker stopped responding on the last attempt.", updated_at=now,
+    )
+    EvalRun.objects.filter(id__in=run_ids).exclude(status="completed").update(
+        status="failed", completed_at=now,
+    )
+    return count
+
+
+class _Heartbeat(threading.Thread):
+    """Renews a job's lease every quarter lease period until stopped."""
+
+    def __init__(self, job: EvalJob, worker_id: str):
+        super().__init__(daemon=True, name=f"eval-heartbeat-{job.pk}")
+        self.job = job
+        self.worker_id = worker_id
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        interval = settings.EVAL_JOB_LEASE_SECONDS / 4
+        try:
+            while not self._stop_event.wait(interval):
+                if not heartbeat(self.job, self.worker_id):
+                    self.lost = True
+                    logger.warning(f"Lost the lease on job {self.job.pk}; another worker has taken it over")
+                    return
+        except Exception:
+            # Without heartbeats the lease will lapse, so act as if it already has
+            self.lost = True
+            logger.exception(f"Heartbeat for job {self.job.pk} failed; abandoning it")
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run_job(job: EvalJob, worker_id: str):
+    """Run a claimed job's evaluation, heartbeating throughout."""
+    from .eval_service import eval_sentences, run_evaluation
+
+    eval_run = job.eval_run
+    # On a retry, run_evaluation skips the sentences the previous worker saved
+    sentences = eval_sentences(eval_run.category_filter, eval_run.status_filter).order_by("pk")
+    beat = _Heartbeat(job, worker_id)
+    beat.start()
+    error = ""
+    try:
+        run_evaluation(eval_run, sentences, cancelled=lambda: beat.lost)
+    except Exception as e:
+        logger.exception(f"Job {job.pk} crashed")
+        error = str(e)
+    finally:
+        beat.stop()
+
+    if beat.lost:
+        return
+    eval_run.refresh_from_db()
+    if eval_run.status != "completed":
+        error = error or f"Evaluation ended with status {eval_run.status!r}"
+    EvalJob.objects.filter(pk=job.pk, worker_id=worker_id).update(
+        status="failed" if error else "done",
+        last_error=error,
+        lease_expires_at=None,
+        updated_at=timezone.now(),
+    )
+
+
+def work(worker_id: str | None = None, once: bool = False, poll_interval: float = 2.0,
+         max_jobs: int | None = None, stop: threading.Event | None = None) -> int:
+    """Claim and run jobs until stopped.
+
+    Args:
+        once: Return as soon as the queue is empty instead of polling.
+        poll_interval: Seconds to wait between polls of an empty queue.
+        max_jobs: Return after this many jobs.
+        stop: Event that ends the loop after the current job.
+
+    Returns:
+        Number of jobs run.
+    """
+    worker_id = worker_id or default_worker_id()
+    stop = stop or threading.Event()
+    processed = 0
+    while not stop.is_set():
+        fail_exhausted_jobs()
+        job = claim_job(worker_id)
+        if job is None:
+            if once:
+                break
+            stop.wait(poll_interval)
+            continue
+        logger.info(f"Worker {worker_id} running job {job.pk} (eval {job.eval_run_id}, attempt {job.attempts})")
+        run_job(job, worker_id)
+        processed += 1
+        if max_jobs and processed >= max_jobs:
+            break
+    return processed
+
+
+def _drain_inline():
+    try:
+        work(once=True)
+    except Exception:
+        logger.exception("Inline evaluation worker crashed")
+    finally:
+        connection.close()
+
+
+def start_inline_worker():
+    """Drain the queue in a background thread of this process.
+
+    Only when EVAL_WORKER_MODE is "inline"; at most one such thread runs per
+    process. With dedicated `run_eval_worker` processes, set it to "external".
+    """
+    global _inline_thread
+    if settings.EVAL_WORKER_MODE != "inline":
+        return
+    with _inline_lock:
+        if _inline_thread is not None and _inline_thread.is_alive():
+            return
+        _inline_thread = threading.Thread(target=_drain_inline, daemon=True, name="eval-inline-worker")
+        _inline_thread.start()
@@ -0,0 +1,142 @@
+"""Persistent LLM response cache shared by the workbench and tools/run_evaluation.py.
+
+Responses are stored in a small SQLite file, keyed by a SHA-256 hash of the
+model ID, the full prompt text and the decoding parameters. When the file
+grows past `max_bytes` the least recently used entries are evicted.
+
+This module has no Django dependency so the CLI runner can import it too.
+
+Usage:
+    cache = LLMCache("llm_cache.sqlite3")
+    text = cache.cached("gpt-4o", prompt, {"max_tokens": 256}, lambda: call_api(prompt))
+    print(cache.stats())
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def make_key(model: str, prompt: str, params: dict | None = None) -> str:
+    """Content-address a request: same model, prompt and params -> same key."""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "params": params or {}},
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache with size-based LRU eviction.
+
+    Safe to share between threads of one process; several processes may
+    also point at the same file (SQLite serialises the writes).
+    """
+
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for `key`, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, model: str, response: str):
+        """Store a response, evicting least recently used entries if over budget."""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def cached(self, model: str, prompt: str, params: dict | None, call) -> str | None:
+        """Return the cached response, or run `call()` and cache its result.
+
+        Empty or None results (failed calls) are never cached.
+        """
+        key = make_key(model, prompt, params)
+        response = self.get(key)
+        if response is not None:
+            return response
+        response = call()
+        if response:
+            self.set(key, model, response)
+        return response
+
+    def _evict(self):
+        """Drop least recently used rows until the cache fits in max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_used"
+        ):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus on-disk totals."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
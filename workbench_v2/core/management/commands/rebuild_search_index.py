@@ -0,0 +1,13 @@
+"""Management command to rebuild the search index (see core/search.py)."""
+
+from django.core.management.base import BaseCommand
+
+from core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the SearchEntry rows for every rule, sentence and discussion"
+
+    def handle(self, *args, **options):
+        written = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} entries"))
@@ -0,0 +1,44 @@
+"""Management command to run queued LLM evaluations (see core/jobs.py)."""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import default_worker_id, work
+
+
+class Command(BaseCommand):
+    help = "Claim and run queued evaluation jobs until stopped"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+        parser.add_argument(
+            "--poll-interval", type=float, default=2.0,
+            help="Seconds between checks of an empty queue (default: 2)",
+        )
+        parser.add_argument("--max-jobs", type=int, default=None, help="Exit after this many jobs")
+        parser.add_argument("--worker-id", type=str, default="", help="Name shown in EvalJob.worker_id")
+
+    def handle(self, *args, **options):
+        worker_id = options["worker_id"] or default_worker_id()
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            # Finish the current job; if we are killed first, its lease expires
+            # and another worker picks it up
+            self.stdout.write(self.style.WARNING("Stopping after the current job..."))
+            stop.set()
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        self.stdout.write(f"Evaluation worker {worker_id} started")
+        processed = work(
+            worker_id=worker_id,
+            once=options["once"],
+            poll_interval=options["poll_interval"],
+            max_jobs=options["max_jobs"],
+            stop=stop,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker_id} exiting after {processed} job(s)"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_evaljob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evalrun',
+            name='processed_sentences',
+            field=models.IntegerField(default=0),
+        ),
+    ]
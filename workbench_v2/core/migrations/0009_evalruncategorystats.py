@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_evalrun_processed_sentences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvalRunCategoryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=100)),
+                ('total', models.IntegerField(default=0)),
+                ('wrong_total', models.IntegerField(default=0)),
+                ('detected', models.IntegerField(default=0)),
+                ('true_positives', models.IntegerField(default=0)),
+                ('correct_total', models.IntegerField(default=0)),
+                ('false_positives', models.IntegerField(default=0)),
+                ('eval_run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_stats', to='core.evalrun')),
+                ('rule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='eval_stats', to='core.rule')),
+            ],
+            options={
+                'verbose_name_plural': 'eval run category stats',
+                'ordering': ['category', 'rule_id'],
+            },
+        ),
+    ]
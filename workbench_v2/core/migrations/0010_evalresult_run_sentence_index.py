@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_evalruncategorystats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evalresult',
+            index=models.Index(fields=['eval_run', 'sentence'], name='core_evalre_eval_ru_31f466_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_evalresult_run_sentence_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evalrun',
+            name='base_run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='incremental_runs', to='core.evalrun'),
+        ),
+        migrations.AddField(
+            model_name='evalrun',
+            name='reused_sentences',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:31
+
+import re
+
+from django.db import migrations, models
+
+
+def fill_sort_keys(apps, schema_editor):
+    # Same as core.models.natural_sort_key, frozen here for the migration
+    Rule = apps.get_model("core", "Rule")
+    rules = list(Rule.objects.only("rule_id"))
+    for rule in rules:
+        rule.sort_key = ".".join(part.zfill(6) for part in re.findall(r"\d+", rule.rule_id))
+    Rule.objects.bulk_update(rules, ["sort_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_datasetversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rule',
+            name='sort_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_sort_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='rule',
+            index=models.Index(fields=['sort_key', 'rule_id'], name='core_rule_sort_ke_bcb4d7_idx'),
+        ),
+    ]
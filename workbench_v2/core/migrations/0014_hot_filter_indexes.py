@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_rule_sort_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evalresult',
+            index=models.Index(fields=['eval_run', 'outcome'], name='core_evalre_eval_ru_023403_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewlog',
+            index=models.Index(fields=['sentence', 'reviewer'], name='core_review_sentenc_0e9160_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sentence',
+            index=models.Index(fields=['status', 'sentence_id'], name='core_senten_status_ec3c29_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sentence',
+            index=models.Index(fields=['rule', 'sentence_type'], name='core_senten_rule_id_539dfc_idx'),
+        ),
+    ]
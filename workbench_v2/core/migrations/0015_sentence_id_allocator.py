@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:37
+
+import re
+
+from django.db import migrations, models
+
+
+def create_allocator(apps, schema_editor):
+    # Start after the highest existing SEN-<digits> ID (see core/sentence_ids.py)
+    Sentence = apps.get_model("core", "Sentence")
+    numbers = (
+        re.match(r"^SEN-(\d+)$", sid)
+        for sid in Sentence.objects.values_list("sentence_id", flat=True).iterator()
+    )
+    start = max((int(m.group(1)) for m in numbers if m), default=0) + 1
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"CREATE SEQUENCE IF NOT EXISTS core_sentence_id_seq START WITH {start}")
+    else:
+        apps.get_model("core", "SentenceIdCounter").objects.update_or_create(
+            pk=1, defaults={"next_value": start},
+        )
+
+
+def drop_allocator(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP SEQUENCE IF EXISTS core_sentence_id_seq")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentenceIdCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('next_value', models.PositiveIntegerField(default=1)),
+            ],
+        ),
+        migrations.RunPython(create_allocator, drop_allocator),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:40
+
+import django.db.models.deletion
+from django.db import OperationalError, migrations, models
+
+# FTS5 external-content table over core_searchentry.normalized, kept in step
+# by triggers so bulk writes are indexed too
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE core_searchentry_fts USING fts5("
+    "normalized, content='core_searchentry', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER core_searchentry_fts_ai AFTER INSERT ON core_searchentry BEGIN "
+    "INSERT INTO core_searchentry_fts(rowid, normalized) VALUES (new.id, new.normalized); END",
+    "CREATE TRIGGER core_searchentry_fts_ad AFTER DELETE ON core_searchentry BEGIN "
+    "INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, normalized) "
+    "VALUES ('delete', old.id, old.normalized); END",
+    "CREATE TRIGGER core_searchentry_fts_au AFTER UPDATE ON core_searchentry BEGIN "
+    "INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, normalized) "
+    "VALUES ('delete', old.id, old.normalized); "
+    "INSERT INTO core_searchentry_fts(rowid, normalized) VALUES (new.id, new.normalized); END",
+]
+
+POSTGRES_TRGM = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS core_searchentry_normalized_trgm "
+    "ON core_searchentry USING gin (normalized gin_trgm_ops)",
+]
+
+
+def create_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for sql in POSTGRES_TRGM:
+            schema_editor.execute(sql)
+    elif vendor == "sqlite":
+        try:
+            for sql in SQLITE_FTS:
+                schema_editor.execute(sql)
+        except OperationalError:
+            # SQLite built without FTS5 or older than 3.34 (no trigram
+            # tokenizer): core/search.py falls back to LIKE
+            pass
+
+
+def drop_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS core_searchentry_normalized_trgm")
+    elif vendor == "sqlite":
+        for trigger in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS core_searchentry_fts_{trigger}")
+        schema_editor.execute("DROP TABLE IF EXISTS core_searchentry_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_sentence_id_allocator'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('rule', 'Rule'), ('sentence', 'Sentence'), ('discussion', 'Discussion')], max_length=10)),
+                ('object_id', models.CharField(max_length=20)),
+                ('title', models.CharField(blank=True, default='', max_length=200)),
+                ('text', models.TextField()),
+                ('normalized', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='core.rule')),
+            ],
+            options={
+                'ordering': ['kind', 'object_id'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_entry')],
+            },
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:52
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def drop_duplicate_results(apps, schema_editor):
+    # Keep the first result saved for each (eval_run, sentence)
+    EvalResult = apps.get_model("core", "EvalResult")
+    duplicates = (
+        EvalResult.objects.values("eval_run", "sentence")
+        .annotate(n=Count("id"), keep=Min("id")).filter(n__gt=1)
+    )
+    for row in duplicates.iterator():
+        EvalResult.objects.filter(eval_run=row["eval_run"], sentence=row["sentence"]).exclude(
+            id=row["keep"],
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_search_entry'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_results, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='evalresult',
+            name='core_evalre_eval_ru_31f466_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='evalresult',
+            constraint=models.UniqueConstraint(fields=('eval_run', 'sentence'), name='unique_eval_result'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+import unicodedata
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+# Same as core.search.normalize, frozen here for the migration
+def normalize(text):
+    text = unicodedata.normalize("NFC", text or "").casefold()
+    words, current = [], []
+    for ch in text:
+        if unicodedata.category(ch)[0] in "LNM" or (ch == "." and current and current[-1].isdigit()):
+            current.append(ch)
+        else:
+            if current:
+                words.append("".join(current).rstrip("."))
+            current = []
+    if current:
+        words.append("".join(current).rstrip("."))
+    return " ".join(w for w in words if w)
+
+
+def rule_fields(rule):
+    text = "\n".join(filter(None, [rule.title, rule.subtitle, rule.description, rule.example_1, rule.example_2]))
+    return {"rule_id": rule.rule_id, "title": rule.title, "text": text,
+            "normalized": normalize(f"{rule.rule_id} {text}")}
+
+
+def sentence_fields(sentence):
+    return {"rule_id": sentence.rule_id, "title": sentence.sentence_id, "text": sentence.sentence,
+            "normalized": normalize(f"{sentence.sentence_id} {sentence.sentence}")}
+
+
+def discussion_fields(discussion):
+    return {"rule_id": discussion.rule_id, "title": discussion.user.username, "text": discussion.message,
+            "normalized": normalize(discussion.message)}
+
+
+def backfill(apps, schema_editor):
+    SearchEntry = apps.get_model("core", "SearchEntry")
+    sources = [
+        ("rule", apps.get_model("core", "Rule").objects.all(), rule_fields),
+        ("sentence", apps.get_model("core", "Sentence").objects.all(), sentence_fields),
+        ("discussion", apps.get_model("core", "Discussion").objects.select_related("user"), discussion_fields),
+    ]
+    SearchEntry.objects.all().delete()
+    for kind, queryset, fields in sources:
+        batch = []
+        for obj in queryset.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+            batch.append(SearchEntry(kind=kind, object_id=str(obj.pk), **fields(obj)))
+            if len(batch) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_evalresult_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 """Data models for TamilNadai Workbench v2."""
 
+import re
 import uuid
 from datetime import timedelta
 
@@ -26,10 +27,24 @@ class Source(models.Model):
         return f"{self.name} ({self.year})" if self.year else self.name
 
 
+RULE_KEY_WIDTH = 6
+
+
+def natural_sort_key(rule_id: str) -> str:
+    """Sortable string for a rule ID, so 1.2.1 comes before 1.10.1.
+
+    Each number in the ID is zero-padded to RULE_KEY_WIDTH digits
+    ("1.10.1" -> "000001.000010.000001"); anything else is ignored.
+    """
+    return ".".join(part.zfill(RULE_KEY_WIDTH) for part in re.findall(r"\d+", rule_id))
+
+
 class Rule(models.Model):
     """A Tamil grammar rule from the source material."""
 
     rule_id = models.CharField(max_length=20, primary_key=True)
+    # Natural-order key derived from rule_id in save(); order by (sort_key, rule_id)
+    sort_key = models.CharField(max_length=200, blank=True, default="", editable=False)
     category = models.CharField(max_length=100)
     title = models.CharField(max_length=200, blank=True, default="")
     subtitle = models.CharField(max_length=200, blank=True, default="")
@@ -48,10 +63,15 @@ class Rule(models.Model):
 
     class Meta:
         ordering = ["rule_id"]
+        indexes = [models.Index(fields=["sort_key", "rule_id"])]
 
     def __str__(self):
         return f"{self.rule_id} — {self.title}"
 
+    def save(self, *args, **kwargs):
+        self.sort_key = natural_sort_key(self.rule_id)
+        super().save(*args, **kwargs)
+
     @property
     def correct_sentences(self):
         return self.sentences.filter(sentence_type="correct")
@@ -115,6 +135,10 @@ class Sentence(models.Model):
 
     class Meta:
         ordering = ["sentence_id"]
+        indexes = [
+            models.Index(fields=["status", "sentence_id"]),  # review queue
+            models.Index(fields=["rule", "sentence_type"]),  # per-rule correct/wrong counts
+        ]
 
     def __str__(self):
         return f"{self.sentence_id}: {self.sentence[:50]}"
@@ -156,6 +180,7 @@ class ReviewLog(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["sentence", "reviewer"])]  # "already reviewed" checks
 
     def __str__(self):
         return f"{self.reviewer} {self.action}ed {self.sentence_id} (R{self.review_number})"
@@ -270,6 +295,12 @@ class EvalRun(models.Model):
         max_length=20, choices=STATUS_FILTER_CHOICES, default="all"
     )
     total_sentences = models.IntegerField(default=0)
+    processed_sentences = models.IntegerField(default=0)
+    # Incremental runs copy responses for unchanged sentences from base_run
+    base_run = models.ForeignKey(
+        "self", on_delete=models.SET_NULL, null=True, blank=True, related_name="incremental_runs"
+    )
+    reused_sentences = models.IntegerField(default=0)
     detection_rate = models.FloatField(null=True, blank=True)
     correction_accuracy = models.FloatField(null=True, blank=True)
     false_positive_rate = models.FloatField(null=True, blank=True)
@@ -283,6 +314,10 @@ class EvalRun(models.Model):
     def __str__(self):
         return f"Eval {self.id}: {self.get_model_name_display()} ({self.created_at:%Y-%m-%d %H:%M})"
 
+    @property
+    def is_pending(self):
+        return self.status == "pending"
+
     @property
     def is_complete(self):
         return self.status == "completed"
@@ -295,6 +330,16 @@ class EvalRun(models.Model):
     def is_failed(self):
         return self.status == "failed"
 
+    @property
+    def is_incremental(self):
+        return self.base_run_id is not None
+
+    @property
+    def progress_percent(self):
+        if not self.total_sentences:
+            return 0
+        return min(100, round(self.processed_sentences / self.total_sentences * 100))
+
     @property
     def preservation_rate(self):
         if self.false_positive_rate is not None:
@@ -326,6 +371,12 @@ class EvalResult(models.Model):
 
     class Meta:
         ordering = ["sentence__sentence_id"]
+        indexes = [
+            models.Index(fields=["eval_run", "outcome"]),  # metrics and disagreement filters
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["eval_run", "sentence"], name="unique_eval_result"),
+        ]
 
     def __str__(self):
         return f"{self.sentence_id}: {self.outcome}"
@@ -340,3 +391,145 @@ class EvalResult(models.Model):
             "false_positive": "bg-terracotta-bg text-terracotta",
             "error": "bg-leaf-300 text-etch-lighter",
         }.get(self.outcome, "bg-leaf-200 text-etch-lighter")
+
+
+class EvalRunCategoryStats(models.Model):
+    """Outcome counts for one category (rule is null) or one rule of a run.
+
+    Computed once when the run completes (eval_service.compute_category_stats),
+    so the detail page does not re-aggregate every result on each view.
+    """
+
+    eval_run = models.ForeignKey(
+        EvalRun, on_delete=models.CASCADE, related_name="category_stats"
+    )
+    category = models.CharField(max_length=100)
+    rule = models.ForeignKey(
+        Rule, on_delete=models.CASCADE, null=True, blank=True, related_name="eval_stats"
+    )
+    total = models.IntegerField(default=0)
+    wrong_total = models.IntegerField(default=0)
+    detected = models.IntegerField(default=0)
+    true_positives = models.IntegerField(default=0)
+    correct_total = models.IntegerField(default=0)
+    false_positives = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["category", "rule_id"]
+        verbose_name_plural = "eval run category stats"
+
+    def __str__(self):
+        if self.rule_id:
+            return f"Eval {self.eval_run_id}: rule {self.rule_id}"
+        return f"Eval {self.eval_run_id}: {self.category}"
+
+    @property
+    def detection_rate(self):
+        if not self.wrong_total:
+            return 0
+        return round(self.detected / self.wrong_total * 100, 1)
+
+    @property
+    def correction_accuracy(self):
+        if not self.wrong_total:
+            return 0
+        return round(self.true_positives / self.wrong_total * 100, 1)
+
+    @property
+    def false_positive_rate(self):
+        if not self.correct_total:
+            return 0
+        return round(self.false_positives / self.correct_total * 100, 1)
+
+    @property
+    def preservation_rate(self):
+        return round(100 - self.false_positive_rate, 1)
+
+
+class EvalJob(models.Model):
+    """A queued evaluation run, executed by a worker (see core/jobs.py).
+
+    A worker claims a job by taking a lease and renews it with heartbeats.
+    If the worker dies, the lease expires and another worker picks the job
+    up again, up to max_attempts times.
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    eval_run = models.OneToOneField(EvalRun, on_delete=models.CASCADE, related_name="job")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    worker_id = models.CharField(max_length=100, blank=True, default="")
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "lease_expires_at"])]
+
+    def __str__(self):
+        return f"Job {self.id} for eval {self.eval_run_id}: {self.status}"
+
+
+class DatasetVersion(models.Model):
+    """Single-row counter of dataset changes, keying the export snapshots.
+
+    Bumped by the Rule/Sentence/ReviewLog signals in core/signals.py; the
+    dataset export files in core/snapshots.py are built once per version.
+    """
+
+    version = models.PositiveIntegerField(default=1)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Dataset v{self.version} ({self.changed_at:%Y-%m-%d %H:%M})"
+
+
+class SentenceIdCounter(models.Model):
+    """Single-row counter behind SEN-xxxxx IDs on databases without sequences.
+
+    Postgres uses the core_sentence_id_seq sequence instead; see
+    core/sentence_ids.py.
+    """
+
+    next_value = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f"Next sentence number {self.next_value}"
+
+
+class SearchEntry(models.Model):
+    """One searchable Rule, Sentence or Discussion, kept in sync by core/signals.py.
+
+    `normalized` is the NFC, case-folded, punctuation-free text that queries
+    match against (see core/search.py). It carries a trigram GIN index on
+    Postgres and an FTS5 trigram table on SQLite, both created by migration.
+    """
+
+    KIND_CHOICES = [("rule", "Rule"), ("sentence", "Sentence"), ("discussion", "Discussion")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.CharField(max_length=20)
+    rule = models.ForeignKey(Rule, on_delete=models.CASCADE, related_name="search_entries")
+    title = models.CharField(max_length=200, blank=True, default="")
+    text = models.TextField()
+    normalized = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["kind", "object_id"]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_search_entry"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
@@ -0,0 +1,305 @@
+"""Pooled HTTP clients for the LLM providers, shared by the workbench and the CLI.
+
+Every provider call goes through one process-wide connection pool, so TLS and
+TCP setup are paid once per host instead of once per sentence. Connections are
+kept alive and reused across threads. If `httpx` with HTTP/2 support
+(`pip install httpx[http2]`) is installed it is used instead of the stdlib
+HTTP/1.1 pool.
+
+Each call records its connect time (0 when a pooled connection was reused)
+and time to first byte; `get_pool().timing_summary()` aggregates them.
+
+This module has no Django dependency so tools/run_evaluation.py can import it.
+
+Usage:
+    text, timing = openai_chat(api_key, "gpt-4o", messages, max_tokens=256)
+    print(timing["connect_ms"], timing["ttfb_ms"])
+"""
+
+import http.client
+import json
+import logging
+import os
+import ssl
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URLS = {
+    "openai": os.environ.get("OPENAI_BASE_URL", "https://api.openai.com"),
+    "anthropic": os.environ.get("ANTHROPIC_BASE_URL", "https://api.anthropic.com"),
+    "google": os.environ.get("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com"),
+}
+
+DEFAULT_TIMEOUT = 60
+MAX_IDLE_PER_HOST = 32
+
+# Errors that mean a kept-alive connection was closed by the server while idle
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError,
+    http.client.CannotSendRequest, http.client.BadStatusLine,
+)
+
+
+class ProviderHTTPError(RuntimeError):
+    """A provider answered with an HTTP error status."""
+
+    def __init__(self, status: int, body: bytes, headers: dict):
+        self.status = status
+        self.body = body
+        self.headers = headers
+        super().__init__(f"HTTP {status}: {body[:300].decode('utf-8', 'replace')}")
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class _Timings:
+    """Thread-safe collector of per-call timings."""
+
+    def __init__(self, keep: int = 10000):
+        self.keep = keep
+        self.calls: list[dict] = []
+        self.lock = threading.Lock()
+
+    def add(self, timing: dict):
+        with self.lock:
+            self.calls.append(timing)
+            if len(self.calls) > self.keep:
+                del self.calls[: len(self.calls) - self.keep]
+
+    def snapshot(self) -> list[dict]:
+        with self.lock:
+            return list(self.calls)
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+
+    def summary(self) -> dict:
+        calls = self.snapshot()
+        if not calls:
+            return {"calls": 0}
+        ttfb = sorted(c["ttfb_ms"] for c in calls)
+        fresh = [c["connect_ms"] for c in calls if not c["reused"]]
+        return {
+            "calls": len(calls),
+            "reused": sum(1 for c in calls if c["reused"]),
+            "new_connections": len(fresh),
+            "mean_connect_ms": round(statistics.mean(fresh), 1) if fresh else 0.0,
+            "p50_ttfb_ms": ttfb[len(ttfb) // 2],
+            "p95_ttfb_ms": ttfb[min(len(ttfb) - 1, int(len(ttfb) * 0.95))],
+            "http_versions": sorted({c["http_version"] for c in calls}),
+        }
+
+
+class HTTPPool:
+    """Keep-alive HTTP/1.1 connection pool built on http.client."""
+
+    http_version = "HTTP/1.1"
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.timings = _Timings()
+        self._idle: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _acquire(self, key: tuple):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        return conn, False
+
+    def _release(self, key: tuple, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, url: str, headers: dict | None = None,
+                body: bytes | None = None) -> tuple[int, dict, bytes, dict]:
+        """Send one request over a pooled connection.
+
+        Returns:
+            Tuple of (status, headers, body, timing).
+        """
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        for attempt in range(2):
+            conn, reused = self._acquire(key)
+            start = time.perf_counter()
+            try:
+                connect_s = 0.0
+                if conn.sock is None:
+                    reused = False
+                    conn.connect()
+                    connect_s = time.perf_counter() - start
+                sent = time.perf_counter()
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                first_byte = time.perf_counter()
+                data = resp.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused and attempt == 0:
+                    continue  # server dropped an idle connection; retry on a fresh one
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+            timing = {
+                "connect_ms": _ms(connect_s),
+                "ttfb_ms": _ms(first_byte - sent),
+                "total_ms": _ms(time.perf_counter() - start),
+                "reused": reused,
+                "http_version": self.http_version,
+            }
+            self.timings.add(timing)
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, data, timing
+
+    def timing_summary(self) -> dict:
+        return self.timings.summary()
+
+
+class HTTPXPool:
+    """HTTP/2-capable pool backed by httpx (used when httpx[http2] is installed)."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        import httpx
+        self.timings = _Timings()
+        self._client = httpx.Client(
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=max_idle_per_host),
+        )
+
+    def request(self, method: str, url: str, headers: dict | None = None,
+                body: bytes | None = None) -> tuple[int, dict, bytes, dict]:
+        marks = {}
+
+        def trace(event_name, info):
+            marks.setdefault(event_name, time.perf_counter())
+
+        start = time.perf_counter()
+        resp = self._client.request(method, url, headers=headers, content=body, extensions={"trace": trace})
+        end = time.perf_counter()
+
+        connect_start = marks.get("connection.connect_tcp.started")
+        connect_end = marks.get("connection.start_tls.complete") or marks.get("connection.connect_tcp.complete")
+        sent = next((t for e, t in marks.items() if e.endswith("send_request_body.complete")), start)
+        first_byte = next((t for e, t in marks.items() if e.endswith("receive_response_headers.complete")), end)
+        timing = {
+            "connect_ms": _ms(connect_end - connect_start) if connect_start and connect_end else 0.0,
+            "ttfb_ms": _ms(first_byte - sent),
+            "total_ms": _ms(end - start),
+            "reused": connect_start is None,
+            "http_version": resp.http_version,
+        }
+        self.timings.add(timing)
+        return resp.status_code, {k.lower(): v for k, v in resp.headers.items()}, resp.content, timing
+
+    def timing_summary(self) -> dict:
+        return self.timings.summary()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            try:
+                import h2  # noqa: F401 — httpx only speaks HTTP/2 with h2 installed
+                _pool = HTTPXPool()
+            except ImportError:
+                _pool = HTTPPool()
+    return _pool
+
+
+def post_json(url: str, headers: dict, payload: dict) -> tuple[dict, dict]:
+    """POST a JSON payload and decode the JSON reply.
+
+    Returns:
+        Tuple of (response data, timing).
+
+    Raises:
+        ProviderHTTPError: for any 4xx/5xx reply (status and headers attached).
+    """
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    status, resp_headers, data, timing = get_pool().request(
+        "POST", url, {**headers, "Content-Type": "application/json"}, body,
+    )
+    logger.debug(
+        "POST %s -> %s (connect %.1fms, ttfb %.1fms, reused=%s)",
+        url.split("?")[0], status, timing["connect_ms"], timing["ttfb_ms"], timing["reused"],
+    )
+    if status >= 400:
+        raise ProviderHTTPError(status, data, resp_headers)
+    return json.loads(data), timing
+
+
+# --- Provider calls ---
+
+def openai_chat(api_key: str, model: str, messages: list[dict],
+                base_url: str | None = None, **params) -> tuple[str, dict]:
+    """Call the OpenAI Chat Completions API. Returns (text, timing)."""
+    data, timing = post_json(
+        f"{base_url or DEFAULT_BASE_URLS['openai']}/v1/chat/completions",
+        {"Authorization": f"Bearer {api_key}"},
+        {"model": model, "messages": messages, **params},
+    )
+    return data["choices"][0]["message"]["content"], timing
+
+
+def anthropic_messages(api_key: str, model: str, messages: list[dict], system: str | None = None,
+                       base_url: str | None = None, **params) -> tuple[str, dict]:
+    """Call the Anthropic Messages API. Returns (text, timing)."""
+    payload = {"model": model, "messages": messages, **params}
+    if system:
+        payload["system"] = system
+    data, timing = post_json(
+        f"{base_url or DEFAULT_BASE_URLS['anthropic']}/v1/messages",
+        {"x-api-key": api_key, "anthropic-version": "2023-06-01"},
+        payload,
+    )
+    return data.get("content", [{}])[0].get("text", ""), timing
+
+
+def gemini_generate(api_key: str, model: str, prompt: str,
+                    base_url: str | None = None, **params) -> tuple[str, dict]:
+    """Call the Gemini generateContent REST API. Returns (text, timing)."""
+    payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+    if params:
+        payload["generationConfig"] = params
+    data, timing = post_json(
+        f"{base_url or DEFAULT_BASE_URLS['google']}/v1beta/models/{model}:generateContent",
+        {"x-goog-api-key": api_key},
+        payload,
+    )
+    parts = data["candidates"][0]["content"]["parts"]
+    return "".join(p.get("text", "") for p in parts), timing
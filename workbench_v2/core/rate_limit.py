@@ -0,0 +1,215 @@
+"""Adaptive per-provider rate limiting with 429 / Retry-After handling.
+
+AdaptiveRateLimiter is a pair of token buckets (requests per minute and
+tokens per minute). It starts at a configured rate and raises it by a fixed
+step on every success, so a halved rate is back within `recovery_calls`
+calls; a 429 halves the rate (once per Retry-After window, however many
+in-flight calls are rejected) and pauses every caller for the Retry-After.
+call_with_retries() wraps one provider call with the limiter and jittered
+exponential backoff for transient failures.
+
+Thread-safe and free of Django imports, so both the workbench and
+tools/run_evaluation.py use it.
+
+Usage:
+    limiter = AdaptiveRateLimiter(rpm=50, tpm=40_000)
+    text = call_with_retries(lambda: call_api(prompt), limiter, tokens=estimate_tokens(prompt, 256))
+"""
+
+import email.utils
+import random
+import threading
+import time
+
+# Statuses worth retrying: rate limited, server errors, Anthropic "overloaded"
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+BURST_SECONDS = 2.0
+
+
+def estimate_tokens(prompt: str, max_tokens: int = 0) -> int:
+    """Rough token cost of a request: prompt size plus the output allowance.
+
+    Tamil script tokenises poorly, so UTF-8 bytes / 3 is a deliberately
+    generous estimate. Providers count max_tokens against TPM up front.
+    """
+    return len(prompt.encode("utf-8")) // 3 + max_tokens
+
+
+class _Bucket:
+    """Token bucket refilled continuously at `per_minute / 60` per second."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.per_minute / 60 * BURST_SECONDS)
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (requests larger than the
+        bucket only wait for a full bucket, then overdraw it)."""
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) * 60 / self.per_minute
+
+
+class AdaptiveRateLimiter:
+    """Requests- and tokens-per-minute limiter that adapts to provider quotas.
+
+    Args:
+        rpm: Starting requests per minute.
+        tpm: Starting tokens per minute (None = no token limit).
+        max_rpm: Ceiling for automatic increases (default 10x rpm).
+        min_rpm: Floor for decreases after 429s.
+        recovery_calls: Successes needed to climb back from one decrease to
+            the starting rate (sets the additive step).
+        decrease_factor: Multiplier applied on a 429.
+    """
+
+    def __init__(self, rpm: float, tpm: float | None = None, max_rpm: float | None = None,
+                 min_rpm: float = 1.0, recovery_calls: int = 20, decrease_factor: float = 0.5):
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm) if tpm else None
+        self.max_rpm = max_rpm or rpm * 10
+        self.max_tpm = (tpm * 10) if tpm else None
+        self.min_rpm = min_rpm
+        self.rpm_step = rpm * (1 - decrease_factor) / recovery_calls
+        self.tpm_step = tpm * (1 - decrease_factor) / recovery_calls if tpm else 0.0
+        self.decrease_factor = decrease_factor
+        self.paused_until = 0.0
+        self.decreased_at = float("-inf")
+        self.hold_until = float("-inf")
+        self.throttled = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rpm(self) -> float:
+        return self.requests.per_minute
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request costing `tokens` may be sent.
+
+        Returns the send time, to pass back to on_rate_limited().
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.requests.refill(now)
+                wait = max(self.paused_until - now, self.requests.wait_time(1))
+                if self.tokens is not None:
+                    self.tokens.refill(now)
+                    wait = max(wait, self.tokens.wait_time(tokens))
+                if wait <= 0:
+                    self.requests.level -= 1
+                    if self.tokens is not None:
+                        self.tokens.level -= tokens
+                    return now
+            time.sleep(min(wait, 1.0))
+
+    def on_success(self):
+        """Additive increase: every success adds a fixed step."""
+        with self._lock:
+            self.requests.per_minute = min(self.max_rpm, self.requests.per_minute + self.rpm_step)
+            if self.tokens is not None:
+                self.tokens.per_minute = min(self.max_tpm, self.tokens.per_minute + self.tpm_step)
+
+    def on_rate_limited(self, retry_after: float | None = None, sent_at: float | None = None):
+        """Multiplicative decrease, and pause everyone for Retry-After.
+
+        The rate is cut at most once per Retry-After window (BURST_SECONDS
+        without one), and not for requests sent before the last cut, which
+        were paced at the old rate.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            if now < self.hold_until or (sent_at is not None and sent_at < self.decreased_at):
+                return
+            self.decreased_at = now
+            self.hold_until = now + (retry_after or BURST_SECONDS)
+            self.requests.per_minute = max(self.min_rpm, self.requests.per_minute * self.decrease_factor)
+            self.requests.level = min(self.requests.level, 0.0)
+            if self.tokens is not None:
+                self.tokens.per_minute = max(1.0, self.tokens.per_minute * self.decrease_factor)
+
+    def on_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rpm": round(self.requests.per_minute, 1),
+                "tpm": round(self.tokens.per_minute) if self.tokens is not None else None,
+                "throttled": self.throttled,
+                "retries": self.retries,
+            }
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Read Retry-After (seconds or HTTP date) or retry-after-ms from an HTTP error."""
+    headers = getattr(error, "headers", None) or {}
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value)
+        return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+def is_retryable(error: Exception) -> bool:
+    status = getattr(error, "status", None)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    # Connection resets, timeouts and DNS hiccups
+    return isinstance(error, (OSError, TimeoutError))
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def call_with_retries(call, limiter: AdaptiveRateLimiter | None, tokens: int = 0,
+                      max_retries: int = 6, base_delay: float = 1.0, max_delay: float = 60.0):
+    """Run `call()` under `limiter`, retrying 429s and transient failures.
+
+    Non-retryable errors (e.g. 400/401) and the last failed attempt re-raise.
+    """
+    for attempt in range(max_retries + 1):
+        sent_at = limiter.acquire(tokens) if limiter is not None else None
+        try:
+            result = call()
+        except Exception as e:
+            if not is_retryable(e) or attempt == max_retries:
+                raise
+            retry_after = retry_after_seconds(e)
+            if limiter is not None:
+                if getattr(e, "status", None) == 429:
+                    limiter.on_rate_limited(retry_after, sent_at)
+                limiter.on_retry()
+            delay = retry_after if retry_after is not None else backoff_delay(attempt, base_delay, max_delay)
+            time.sleep(min(delay, max_delay))
+            continue
+        if limiter is not None:
+            limiter.on_success()
+        return result
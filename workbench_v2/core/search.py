@@ -0,0 +1,194 @@
+"""Search across rules, sentences and discussions.
+
+Every Rule, Sentence and Discussion has a SearchEntry row (kept current by
+core/signals.py; `python manage.py rebuild_search_index` rebuilds them all)
+whose `normalized` column holds its text in NFC, case-folded, with
+punctuation removed. Queries are normalised the same way and every term must
+appear in an entry.
+
+Terms are split into words by Unicode category, so Tamil vowel signs and the
+virama stay inside their word (a regex \\w+ would cut கூறினான் into pieces).
+With stems=True a query word ending in a pure consonant (consonant + virama,
+e.g. the doubled க் of sandhi) loses that grapheme, so அப்படிக் finds அப்படி.
+
+Postgres matches with LIKE on a pg_trgm GIN index and ranks by trigram word
+similarity. SQLite uses an FTS5 trigram table ranked by bm25. Terms shorter
+than a trigram, or a SQLite build without FTS5, fall back to a plain LIKE scan.
+"""
+
+import unicodedata
+
+from django.db import connection
+from django.db.models.functions import Length
+
+from .models import Discussion, Rule, SearchEntry, Sentence
+
+VIRAMA = "்"  # Tamil pulli
+FTS_TABLE = "core_searchentry_fts"
+SEARCH_LIMIT = 50
+REBUILD_BATCH_SIZE = 500
+
+_fts_available = None
+
+
+def _is_word_char(ch: str) -> bool:
+    # Letters, numbers and combining marks (Tamil vowel signs, virama)
+    return unicodedata.category(ch)[0] in "LNM"
+
+
+def words(text: str) -> list[str]:
+    """Case-folded NFC words of `text`, split on anything that is not part of a word."""
+    text = unicodedata.normalize("NFC", text or "").casefold()
+    result, current = [], []
+    for ch in text:
+        if _is_word_char(ch) or (ch == "." and current and current[-1].isdigit()):
+            current.append(ch)
+        else:
+            if current:
+                result.append("".join(current).rstrip("."))
+            current = []
+    if current:
+        result.append("".join(current).rstrip("."))
+    return [w for w in result if w]
+
+
+def normalize(text: str) -> str:
+    """The form of `text` stored in SearchEntry.normalized."""
+    return " ".join(words(text))
+
+
+def graphemes(word: str) -> list[str]:
+    """Split a word into base characters with their combining marks."""
+    clusters = []
+    for ch in word:
+        if clusters and unicodedata.category(ch).startswith("M"):
+            clusters[-1] += ch
+        else:
+            clusters.append(ch)
+    return clusters
+
+
+def stem(word: str) -> str:
+    """`word` without a final pure consonant, if at least two graphemes remain."""
+    clusters = graphemes(word)
+    if len(clusters) > 2 and clusters[-1].endswith(VIRAMA):
+        return "".join(clusters[:-1])
+    return word
+
+
+def query_terms(query: str, stems: bool = True) -> list[str]:
+    terms = words(query)
+    if stems:
+        terms = [stem(t) for t in terms]
+    return list(dict.fromkeys(terms))
+
+
+# --- Indexing ---
+
+def _entry_fields(kind: str, obj) -> dict:
+    if kind == "rule":
+        text = "\n".join(filter(None, [obj.title, obj.subtitle, obj.description, obj.example_1, obj.example_2]))
+        return {"rule_id": obj.rule_id, "title": obj.title, "text": text,
+                "normalized": normalize(f"{obj.rule_id} {text}")}
+    if kind == "sentence":
+        return {"rule_id": obj.rule_id, "title": obj.sentence_id, "text": obj.sentence,
+                "normalized": normalize(f"{obj.sentence_id} {obj.sentence}")}
+    return {"rule_id": obj.rule_id, "title": str(obj.user), "text": obj.message,
+            "normalized": normalize(obj.message)}
+
+
+def index_object(kind: str, obj):
+    """Create or refresh the SearchEntry for one object."""
+    SearchEntry.objects.update_or_create(
+        kind=kind, object_id=str(obj.pk), defaults=_entry_fields(kind, obj),
+    )
+
+
+def unindex_object(kind: str, obj):
+    SearchEntry.objects.filter(kind=kind, object_id=str(obj.pk)).delete()
+
+
+def rebuild_index() -> int:
+    """Replace every SearchEntry. Returns the number of entries written."""
+    sources = [
+        ("rule", Rule.objects.all()),
+        ("sentence", Sentence.objects.all()),
+        ("discussion", Discussion.objects.select_related("user")),
+    ]
+    SearchEntry.objects.all().delete()
+    written = 0
+    for kind, queryset in sources:
+        batch = []
+        for obj in queryset.order_by("pk").iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append(SearchEntry(kind=kind, object_id=str(obj.pk), **_entry_fields(kind, obj)))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+# --- Querying ---
+
+def _has_fts() -> bool:
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = FTS_TABLE in connection.introspection.table_names()
+    return _fts_available
+
+
+def _search_postgres(entries, terms, limit):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    for term in terms:
+        entries = entries.filter(normalized__contains=term)
+    score = TrigramWordSimilarity(terms[0], "normalized")
+    for term in terms[1:]:
+        score += TrigramWordSimilarity(term, "normalized")
+    return list(entries.annotate(score=score).order_by("-score", "kind", "object_id")[:limit])
+
+
+def _search_fts(entries, terms, limit):
+    match = " AND ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+    allowed_sql, allowed_params = entries.values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, -bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"AND rowid IN ({allowed_sql}) ORDER BY bm25({FTS_TABLE}) LIMIT %s",
+            [match, *allowed_params, -1 if limit is None else limit],
+        )
+        ranked = cursor.fetchall()
+    found = entries.in_bulk([pk for pk, _ in ranked])
+    for pk, score in ranked:
+        found[pk].score = score
+    return [found[pk] for pk, _ in ranked]
+
+
+def _search_like(entries, terms, limit):
+    for term in terms:
+        entries = entries.filter(normalized__contains=term)
+    # No relevance score here; shorter texts are the closer matches
+    return list(entries.order_by(Length("normalized"), "kind", "object_id")[:limit])
+
+
+def search(query: str, kinds=None, stems: bool = True, limit: int = SEARCH_LIMIT) -> list[SearchEntry]:
+    """SearchEntry rows matching every term of `query`, best first.
+
+    Entries of inactive rules are left out. `kinds` restricts the result to
+    some of "rule", "sentence" and "discussion"; `limit=None` returns every match.
+    """
+    terms = query_terms(query, stems=stems)
+    if not terms:
+        return []
+    entries = SearchEntry.objects.filter(rule__is_active=True).select_related("rule")
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+
+    if connection.vendor == "postgresql":
+        return _search_postgres(entries, terms, limit)
+    # The trigram tokenizer cannot match strings under three characters
+    if connection.vendor == "sqlite" and _has_fts() and min(len(t) for t in terms) >= 3:
+        return _search_fts(entries, terms, limit)
+    return _search_like(entries, terms, limit)
@@ -0,0 +1,85 @@
+"""Allocation of SEN-xxxxx sentence IDs.
+
+On Postgres the numbers come from the core_sentence_id_seq sequence: nextval()
+never returns the same value twice, even to concurrent transactions, and a
+block of n IDs is a single `SELECT nextval(...) FROM generate_series(1, n)`.
+Other backends (SQLite locally) use the single SentenceIdCounter row, advanced
+by n with one UPDATE inside a transaction; SQLite's write lock keeps two
+writers from receiving the same block.
+
+Numbers are never handed out twice, so a reserved ID whose sentence is never
+saved is simply a gap. Code that inserts sentences with IDs of its own (CSV
+imports, the admin) must call advance_past_existing() afterwards.
+"""
+
+import re
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import Sentence, SentenceIdCounter
+
+SEQUENCE_NAME = "core_sentence_id_seq"
+SENTENCE_ID_RE = re.compile(r"^SEN-(\d+)$")
+
+
+def format_sentence_id(number: int) -> str:
+    return f"SEN-{number:05d}"
+
+
+def highest_sentence_number() -> int:
+    """Largest number among existing SEN-<digits> IDs (0 if there are none)."""
+    numbers = (
+        SENTENCE_ID_RE.match(sid)
+        for sid in Sentence.objects.filter(sentence_id__startswith="SEN-")
+        .values_list("sentence_id", flat=True).iterator()
+    )
+    return max((int(m.group(1)) for m in numbers if m), default=0)
+
+
+def _uses_sequence() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def reserve_sentence_ids(count: int = 1) -> list[str]:
+    """Reserve `count` unused sentence IDs, in ascending order."""
+    if count < 1:
+        return []
+    if _uses_sequence():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)", [SEQUENCE_NAME, count],
+            )
+            numbers = sorted(row[0] for row in cursor.fetchall())
+        return [format_sentence_id(n) for n in numbers]
+
+    with transaction.atomic():
+        updated = SentenceIdCounter.objects.filter(pk=1).update(next_value=F("next_value") + count)
+        if not updated:
+            # First allocation on a database the migration did not seed
+            SentenceIdCounter.objects.create(pk=1, next_value=highest_sentence_number() + 1 + count)
+        end = SentenceIdCounter.objects.values_list("next_value", flat=True).get(pk=1)
+    return [format_sentence_id(n) for n in range(end - count, end)]
+
+
+def next_sentence_id() -> str:
+    return reserve_sentence_ids(1)[0]
+
+
+def advance_past_existing():
+    """Make sure future IDs come after every SEN-<digits> ID already stored."""
+    highest = highest_sentence_number()
+    if _uses_sequence():
+        with connection.cursor() as cursor:
+            # setval(seq, n) makes the next nextval() return n + 1; only move forward
+            cursor.execute(
+                f"SELECT setval(%s, %s) FROM {SEQUENCE_NAME} "
+                "WHERE %s >= CASE WHEN is_called THEN last_value + 1 ELSE last_value END",
+                [SEQUENCE_NAME, highest, highest],
+            )
+        return
+    with transaction.atomic():
+        counter, _ = SentenceIdCounter.objects.select_for_update().get_or_create(pk=1)
+        if counter.next_value <= highest:
+            counter.next_value = highest + 1
+            counter.save(update_fields=["next_value"])
@@ -0,0 +1,36 @@
+"""Signal handlers: invalidate dataset export snapshots when the data changes,
+and keep the search index (core/search.py) in step with rules, sentences and
+discussions."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import Discussion, ReviewLog, Rule, Sentence
+from .snapshots import bump_version
+
+SEARCH_KINDS = {Rule: "rule", Sentence: "sentence", Discussion: "discussion"}
+
+
+@receiver(post_save, sender=Rule)
+@receiver(post_save, sender=Sentence)
+@receiver(post_save, sender=ReviewLog)
+@receiver(post_delete, sender=Rule)
+@receiver(post_delete, sender=Sentence)
+@receiver(post_delete, sender=ReviewLog)
+def dataset_changed(sender, **kwargs):
+    bump_version()
+
+
+@receiver(post_save, sender=Rule)
+@receiver(post_save, sender=Sentence)
+@receiver(post_save, sender=Discussion)
+def index_for_search(sender, instance, **kwargs):
+    search.index_object(SEARCH_KINDS[sender], instance)
+
+
+# A deleted rule's entries go with it (SearchEntry.rule cascades)
+@receiver(post_delete, sender=Sentence)
+@receiver(post_delete, sender=Discussion)
+def unindex_for_search(sender, instance, **kwargs):
+    search.unindex_object(SEARCH_KINDS[sender], instance)
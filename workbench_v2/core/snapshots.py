@@ -0,0 +1,102 @@
+"""Versioned, gzip-compressed snapshots of the dataset exports.
+
+The dataset only changes when a Rule, Sentence or ReviewLog is saved or
+deleted; those signals bump DatasetVersion (core/signals.py). Each export
+format is generated once per version into EXPORT_SNAPSHOT_DIR as
+dataset-v<version>.<fmt>.gz and served from there, with an ETag and
+Last-Modified derived from the version so repeat downloads get a 304. The
+gzip and identity bodies get different ETags ("-gz" suffix).
+
+Files are written to a temporary name and renamed into place, so several
+gunicorn workers building the same snapshot at once is harmless.
+"""
+
+import gzip
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DatasetVersion
+
+READ_BYTES = 64 * 1024
+SNAPSHOT_NAME_RE = re.compile(r"^dataset-v(\d+)\.")
+
+
+def current_version() -> DatasetVersion:
+    version, _ = DatasetVersion.objects.get_or_create(pk=1)
+    return version
+
+
+def bump_version():
+    """Mark the dataset as changed, invalidating every snapshot."""
+    updated = DatasetVersion.objects.filter(pk=1).update(
+        version=F("version") + 1, changed_at=timezone.now(),
+    )
+    if not updated:
+        DatasetVersion.objects.get_or_create(pk=1)
+
+
+def etag(version: DatasetVersion, fmt: str, compressed: bool = False) -> str:
+    """Strong ETag of one encoding of the export (gzip and identity bodies differ)."""
+    suffix = "-gz" if compressed else ""
+    return f'"dataset-v{version.version}-{fmt}{suffix}"'
+
+
+def snapshot_dir() -> Path | None:
+    """Directory for snapshot files, or None when EXPORT_SNAPSHOT_DIR is empty."""
+    if not settings.EXPORT_SNAPSHOT_DIR:
+        return None
+    return Path(settings.EXPORT_SNAPSHOT_DIR)
+
+
+def snapshot_path(version: DatasetVersion, fmt: str) -> Path | None:
+    """Where the snapshot for this version and format lives (None if disabled)."""
+    directory = snapshot_dir()
+    if directory is None:
+        return None
+    return directory / f"dataset-v{version.version}.{fmt}.gz"
+
+
+def build_snapshot(path: Path, chunks):
+    """Write the text `chunks` gzip-compressed to `path`, atomically.
+
+    Snapshots of older versions in the same format are removed afterwards;
+    newer ones (written by a request that saw a later version) are kept.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as out:
+            for chunk in chunks:
+                out.write(chunk.encode("utf-8"))
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    fmt_suffix = "".join(path.suffixes[-2:])
+    written = _snapshot_version(path)
+    for old in path.parent.glob(f"dataset-v*{fmt_suffix}"):
+        version = _snapshot_version(old)
+        if version is not None and written is not None and version < written:
+            old.unlink(missing_ok=True)
+
+
+def _snapshot_version(path: Path) -> int | None:
+    match = SNAPSHOT_NAME_RE.match(path.name)
+    return int(match.group(1)) if match else None
+
+
+def read_decompressed(snapshot):
+    """Yield the text of an open snapshot file in chunks, for clients without gzip support."""
+    with gzip.open(snapshot, "rt", encoding="utf-8") as f:
+        while True:
+            text = f.read(READ_BYTES)
+            if not text:
+                return
+            yield text
@@ -1,10 +1,10 @@
 """Tests for TamilNadai Workbench v2."""
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse, resolve
 from django.contrib.auth.models import User
 
-from .models import MemberProfile, Rule, Source, Sentence, EvalRun, EvalResult
+from .models import MemberProfile, Rule, Source, Sentence, EvalRun, EvalResult, EvalJob, ReviewLog
 
 
 class PublicPageTests(TestCase):
@@ -102,6 +102,32 @@ class AuthenticatedPageTests(TestCase):
         response = self.client.get(reverse("dashboard"))
         self.assertEqual(response.status_code, 200)
 
+    def test_dashboard_counts_are_cached_until_data_changes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        source = Source.objects.create(source_id="SRC-01", name="Test Source")
+        rule = Rule.objects.create(rule_id="1.1", category="சந்தி", title="Test Rule", source=source)
+        Rule.objects.create(rule_id="1.2", category="சந்தி", title="Retired", source=source, is_active=False)
+        Sentence.objects.create(sentence_id="SEN-00001", rule=rule, sentence="ஒன்று", sentence_type="correct", status="accepted")
+        Sentence.objects.create(sentence_id="SEN-00002", rule=rule, sentence="இரண்டு", sentence_type="wrong")
+
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(
+            (response.context["total_rules"], response.context["total_sentences"],
+             response.context["accepted"], response.context["pending"]),
+            (1, 2, 1, 1),
+        )
+        sandhi = [c for c in response.context["categories"] if c["short"] == "Sandhi"][0]
+        self.assertEqual((sandhi["rule_count"], sandhi["sentence_count"], sandhi["pct"]), (1, 2, 50))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("dashboard"))
+        self.assertFalse([q for q in queries if "GROUP BY" in q["sql"]])
+
+        Sentence.objects.create(sentence_id="SEN-00003", rule=rule, sentence="மூன்று", sentence_type="correct")
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.context["total_sentences"], 3)
+
     def test_rule_list(self):
         response = self.client.get(reverse("rule_list"))
         self.assertEqual(response.status_code, 200)
@@ -240,6 +266,108 @@ class SentenceCreatedByTests(TestCase):
         self.assertContains(response, "admin")
 
 
+class SentenceIdAllocatorTests(TestCase):
+    """Sentence IDs come from the shared allocator, never from max(sentence_id) + 1."""
+
+    def setUp(self):
+        source = Source.objects.create(source_id="SRC-01", name="Test Source")
+        self.rule = Rule.objects.create(rule_id="1.1", category="சந்தி", title="Test Rule", source=source)
+        self.admin = User.objects.create_user(username="admin", password="pass123", is_staff=True)
+        MemberProfile.objects.create(user=self.admin, role="admin")
+
+    def test_reserves_ascending_blocks(self):
+        from .sentence_ids import next_sentence_id, reserve_sentence_ids
+
+        self.assertEqual(reserve_sentence_ids(3), ["SEN-00001", "SEN-00002", "SEN-00003"])
+        self.assertEqual(next_sentence_id(), "SEN-00004")
+        self.assertEqual(reserve_sentence_ids(0), [])
+
+    def test_add_sentence_uses_allocator(self):
+        self.client.login(username="admin", password="pass123")
+        for text in ("ஒன்று", "இரண்டு"):
+            self.client.post(reverse("add_sentence", args=[self.rule.rule_id]), {
+                "sentence": text, "sentence_type": "correct",
+            })
+        self.assertEqual(
+            list(Sentence.objects.order_by("sentence_id").values_list("sentence_id", "sentence")),
+            [("SEN-00001", "ஒன்று"), ("SEN-00002", "இரண்டு")],
+        )
+
+    def test_advance_past_imported_ids(self):
+        from .sentence_ids import advance_past_existing, next_sentence_id
+
+        self.assertEqual(next_sentence_id(), "SEN-00001")
+        Sentence.objects.create(sentence_id="SEN-00041", rule=self.rule, sentence="இறக்குமதி", sentence_type="wrong")
+        Sentence.objects.create(sentence_id="GAP-00900", rule=self.rule, sentence="வேறு", sentence_type="wrong")
+        advance_past_existing()
+        self.assertEqual(next_sentence_id(), "SEN-00042")
+        # Never moves backwards
+        advance_past_existing()
+        self.assertEqual(next_sentence_id(), "SEN-00043")
+
+
+class RuleDetailQueryTests(TestCase):
+    """rule_detail runs a fixed number of queries however many sentences a rule has."""
+
+    def setUp(self):
+        self.reviewer = User.objects.create_user(username="reviewer", password="pass123")
+        MemberProfile.objects.create(user=self.reviewer, role="reviewer")
+        self.other = User.objects.create_user(username="other", password="pass123")
+        source = Source.objects.create(source_id="SRC-01", name="Test Source")
+        for rule_id in ("1.2", "1.10", "2.1"):
+            Rule.objects.create(rule_id=rule_id, category="சந்தி", title=f"Rule {rule_id}", source=source)
+        Rule.objects.create(rule_id="1.5", category="சந்தி", title="Retired", source=source, is_active=False)
+        self.rule = Rule.objects.get(rule_id="1.10")
+        self.client.login(username="reviewer", password="pass123")
+
+    def _add_sentences(self, start, count):
+        for i in range(start, start + count):
+            sentence = Sentence.objects.create(
+                sentence_id=f"SEN-{i:05d}", rule=self.rule, sentence=f"வாக்கியம் {i}",
+                sentence_type="correct" if i % 2 else "wrong",
+            )
+            ReviewLog.objects.create(sentence=sentence, reviewer=self.other, action="accept", review_number=1)
+
+    def _query_count(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("rule_detail", args=[self.rule.rule_id]))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_query_count_does_not_grow_with_sentences(self):
+        self._add_sentences(1, 2)
+        small, _ = self._query_count()
+        self._add_sentences(3, 20)
+        large, response = self._query_count()
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.context["correct"]) + len(response.context["wrong"]), 22)
+
+    def test_already_reviewed_flag_and_reviews(self):
+        self._add_sentences(1, 2)
+        mine = Sentence.objects.get(sentence_id="SEN-00001")
+        ReviewLog.objects.create(sentence=mine, reviewer=self.reviewer, action="accept", review_number=2)
+        _, response = self._query_count()
+        flags = {s.sentence_id: s.user_already_reviewed for s in response.context["correct"] + response.context["wrong"]}
+        self.assertEqual(flags, {"SEN-00001": True, "SEN-00002": False})
+        reviews = response.context["correct"][0].review_list
+        self.assertEqual([r.review_number for r in reviews], [1, 2])
+
+    def test_prev_next_skip_inactive_rules(self):
+        _, response = self._query_count()
+        # Natural order is 1.2, (1.5 inactive), 1.10, 2.1
+        self.assertEqual((response.context["prev_rule_id"], response.context["next_rule_id"]), ("1.2", "2.1"))
+
+    def test_rule_sort_key_orders_naturally(self):
+        self.assertEqual(Rule.objects.get(rule_id="1.10").sort_key, "000001.000010")
+        Rule.objects.create(rule_id="1.2.1", category="சந்தி", title="Sub-rule")
+        ordered = list(Rule.objects.order_by("sort_key", "rule_id").values_list("rule_id", flat=True))
+        self.assertEqual(ordered, ["1.2", "1.2.1", "1.5", "1.10", "2.1"])
+        response = self.client.get(reverse("rule_list"))
+        self.assertEqual([r.rule_id for r in response.context["page"]], ["1.2", "1.2.1", "1.10", "2.1"])
+
+
 class EvalViewTests(TestCase):
     """Evaluation pages should be admin-only."""
 
@@ -332,11 +460,27 @@ class EvalScoringTests(TestCase):
         result = score_result(self.wrong, None)
         self.assertEqual(result, "error")
 
+    def test_gold_index_scores_without_queries(self):
+        from .eval_service import build_gold_index, score_result
+        index = build_gold_index()
+        self.assertEqual(index, {self.rule.pk: frozenset({"அப்படிக் கூறினான்"})})
+        with self.assertNumQueries(0):
+            self.assertEqual(score_result(self.wrong, "அப்படிக் கூறினான்", index), "true_positive")
+            self.assertEqual(score_result(self.wrong, "அப்படியே கூறினான்.", index), "partial")
+
 
 class ExportPageTests(TestCase):
     """Export page and download endpoints."""
 
     def setUp(self):
+        import shutil
+        import tempfile
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, ignore_errors=True)
+        snapshot_settings = override_settings(EXPORT_SNAPSHOT_DIR=snapshot_dir)
+        snapshot_settings.enable()
+        self.addCleanup(snapshot_settings.disable)
+
         self.admin = User.objects.create_user(
             username="admin", password="pass123", is_staff=True
         )
@@ -386,7 +530,7 @@ class ExportPageTests(TestCase):
         response = self.client.get(reverse("export_dataset", kwargs={"fmt": "json"}))
         self.assertEqual(response.status_code, 200)
         self.assertIn("application/json", response["Content-Type"])
-        data = json.loads(response.content)
+        data = json.loads(response.getvalue())
         self.assertIn("metadata", data)
         self.assertIn("rules", data)
 
@@ -398,14 +542,14 @@ class ExportPageTests(TestCase):
     def test_csv_contains_header_and_tamil(self):
         self.client.login(username="member", password="pass123")
         response = self.client.get(reverse("export_dataset", kwargs={"fmt": "csv"}))
-        content = response.content.decode("utf-8-sig")
+        content = response.getvalue().decode("utf-8-sig")
         self.assertIn("rule_id", content)
         self.assertIn("அப்படிக் கூறினான்.", content)
 
     def test_csv_row_count(self):
         self.client.login(username="member", password="pass123")
         response = self.client.get(reverse("export_dataset", kwargs={"fmt": "csv"}))
-        content = response.content.decode("utf-8-sig")
+        content = response.getvalue().decode("utf-8-sig")
         lines = [l for l in content.strip().split("\n") if l and not l.startswith("#")]
         self.assertEqual(len(lines), 2)  # 1 header + 1 data row
 
@@ -413,13 +557,139 @@ class ExportPageTests(TestCase):
         import json
         self.client.login(username="member", password="pass123")
         response = self.client.get(reverse("export_dataset", kwargs={"fmt": "json"}))
-        data = json.loads(response.content)
+        data = json.loads(response.getvalue())
         self.assertEqual(data["metadata"]["project"], "Tamil Nadai Workbench")
         self.assertIn("exported_at", data["metadata"])
         rule = data["rules"][0]
         self.assertIn("சந்தி", rule["category"])
         self.assertEqual(len(rule["sentences"]), 1)
 
+    def test_dataset_export_streams_gzip_when_accepted(self):
+        import gzip
+        import json
+        self.client.login(username="member", password="pass123")
+        response = self.client.get(
+            reverse("export_dataset", kwargs={"fmt": "json"}), HTTP_ACCEPT_ENCODING="gzip, deflate",
+        )
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        data = json.loads(gzip.decompress(response.getvalue()))
+        self.assertEqual(data["rules"][0]["sentences"][0]["sentence"], "அப்படிக் கூறினான்.")
+
+    def test_dataset_json_keeps_rules_without_sentences(self):
+        import json
+        Rule.objects.create(rule_id="1.2", category="சந்தி", title="Empty Rule", source=Source.objects.get())
+        self.client.login(username="member", password="pass123")
+        response = self.client.get(reverse("export_dataset", kwargs={"fmt": "json"}))
+        data = json.loads(response.getvalue())
+        self.assertEqual([(r["rule_id"], len(r["sentences"])) for r in data["rules"]], [("1.1", 1), ("1.2", 0)])
+        self.assertEqual(data["metadata"]["total_rules"], 2)
+
+    def test_dataset_json_total_sentences_counts_inactive_rules(self):
+        import json
+        hidden = Rule.objects.create(
+            rule_id="9.9", category="சந்தி", title="Retired", source=Source.objects.get(), is_active=False,
+        )
+        Sentence.objects.create(sentence_id="SEN-00009", rule=hidden, sentence="பழைய வாக்கியம்.", sentence_type="correct")
+        self.client.login(username="member", password="pass123")
+        data = json.loads(self.client.get(reverse("export_dataset", kwargs={"fmt": "json"})).getvalue())
+        self.assertEqual([r["rule_id"] for r in data["rules"]], ["1.1"])
+        self.assertEqual(data["metadata"]["total_sentences"], 2)
+
+    def test_dataset_snapshot_is_reused_until_data_changes(self):
+        from pathlib import Path
+        from django.conf import settings
+        self.client.login(username="member", password="pass123")
+        url = reverse("export_dataset", kwargs={"fmt": "csv"})
+        first = self.client.get(url)
+        etag = first["ETag"]
+        self.assertIn("Last-Modified", first)
+        self.assertEqual(len(list(Path(settings.EXPORT_SNAPSHOT_DIR).glob("dataset-v*.csv.gz"))), 1)
+
+        with self.assertNumQueries(3):  # session, user, dataset version
+            repeat = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(repeat.status_code, 304)
+
+        self.sentence.sentence = "அப்படிக் கூறினாள்."
+        self.sentence.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertIn("அப்படிக் கூறினாள்.", changed.getvalue().decode("utf-8-sig"))
+        # The old version's file is replaced, not kept alongside
+        self.assertEqual(len(list(Path(settings.EXPORT_SNAPSHOT_DIR).glob("dataset-v*.csv.gz"))), 1)
+
+    def test_dataset_snapshot_served_compressed(self):
+        import gzip
+        import json
+        self.client.login(username="member", password="pass123")
+        response = self.client.get(
+            reverse("export_dataset", kwargs={"fmt": "json"}), HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        data = json.loads(gzip.decompress(response.getvalue()))
+        self.assertEqual(data["metadata"]["total_sentences"], 1)
+
+    def test_dataset_etag_differs_per_encoding(self):
+        self.client.login(username="member", password="pass123")
+        url = reverse("export_dataset", kwargs={"fmt": "json"})
+        gzipped = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        plain = self.client.get(url, HTTP_IF_NONE_MATCH=gzipped["ETag"])
+        self.assertEqual(plain.status_code, 200)
+        self.assertNotEqual(plain["ETag"], gzipped["ETag"])
+        self.assertNotIn("Content-Encoding", plain)
+        repeat = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=gzipped["ETag"])
+        self.assertEqual(repeat.status_code, 304)
+        self.assertIn("Accept-Encoding", repeat["Vary"])
+
+    def test_gzip_refused_with_zero_quality(self):
+        from .exports import accepts_gzip
+        from django.test import RequestFactory
+        factory = RequestFactory()
+        for header, expected in [
+            ("gzip, deflate", True),
+            ("gzip;q=0, deflate", False),
+            ("deflate, gzip; q=0.5", True),
+            ("*", True),
+            ("*;q=0.5, gzip;q=0", False),
+            ("br", False),
+        ]:
+            self.assertEqual(accepts_gzip(factory.get("/", HTTP_ACCEPT_ENCODING=header)), expected, header)
+        self.client.login(username="member", password="pass123")
+        response = self.client.get(
+            reverse("export_dataset", kwargs={"fmt": "csv"}), HTTP_ACCEPT_ENCODING="gzip;q=0",
+        )
+        self.assertNotIn("Content-Encoding", response)
+        self.assertIn("அப்படிக் கூறினான்.", response.getvalue().decode("utf-8-sig"))
+
+    def test_stale_build_keeps_newer_snapshot(self):
+        from pathlib import Path
+        from django.conf import settings
+        from .snapshots import build_snapshot
+        directory = Path(settings.EXPORT_SNAPSHOT_DIR)
+        build_snapshot(directory / "dataset-v5.csv.gz", iter(["new"]))
+        build_snapshot(directory / "dataset-v3.csv.gz", iter(["stale"]))
+        build_snapshot(directory / "dataset-v2.json.gz", iter(["other format"]))
+        self.assertEqual(
+            sorted(p.name for p in directory.glob("dataset-v*")),
+            ["dataset-v2.json.gz", "dataset-v3.csv.gz", "dataset-v5.csv.gz"],
+        )
+        build_snapshot(directory / "dataset-v6.csv.gz", iter(["newest"]))
+        self.assertEqual(
+            sorted(p.name for p in directory.glob("dataset-v*")),
+            ["dataset-v2.json.gz", "dataset-v6.csv.gz"],
+        )
+
+    def test_dataset_streams_when_snapshot_removed(self):
+        from unittest import mock
+        self.client.login(username="member", password="pass123")
+        # As if a newer version's build deleted the file right after ours was written
+        with mock.patch("core.snapshots.build_snapshot"):
+            response = self.client.get(reverse("export_dataset", kwargs={"fmt": "csv"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("அப்படிக் கூறினான்.", response.getvalue().decode("utf-8-sig"))
+
     def test_export_urls_resolve(self):
         for name, kwargs in [
             ("exports", {}),
@@ -485,7 +755,7 @@ class EvalExportTests(TestCase):
         response = self.client.get(
             reverse("export_eval_run", kwargs={"run_id": self.eval_run.id, "fmt": "csv"})
         )
-        content = response.content.decode("utf-8-sig")
+        content = response.getvalue().decode("utf-8-sig")
         self.assertIn("# Model:", content)
         self.assertIn("Gemini 2.0 Flash", content)
         self.assertIn("sentence_id", content)
@@ -497,7 +767,7 @@ class EvalExportTests(TestCase):
         response = self.client.get(
             reverse("export_eval_run", kwargs={"run_id": self.eval_run.id, "fmt": "json"})
         )
-        data = json.loads(response.content)
+        data = json.loads(response.getvalue())
         self.assertEqual(data["metadata"]["model_id"], "gemini-2.0-flash")
         self.assertEqual(data["metadata"]["detection_rate"], 100.0)
         self.assertEqual(len(data["results"]), 1)
@@ -514,3 +784,796 @@ class EvalExportTests(TestCase):
     def test_eval_export_url_resolves(self):
         url = reverse("export_eval_run", kwargs={"run_id": 1, "fmt": "csv"})
         self.assertEqual(resolve(url).url_name, "export_eval_run")
+
+
+class LLMCacheTests(TestCase):
+    """The shared response cache should be content-addressed and size-bounded."""
+
+    def setUp(self):
+        import tempfile
+        from .llm_cache import LLMCache
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = LLMCache(f"{self.tmpdir.name}/cache.sqlite3")
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_second_call_is_served_from_cache(self):
+        calls = []
+        for _ in range(2):
+            text = self.cache.cached("gpt-4o", "prompt", {"max_tokens": 256},
+                                     lambda: calls.append(1) or "பதில்")
+            self.assertEqual(text, "பதில்")
+        self.assertEqual(len(calls), 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_key_includes_model_prompt_and_params(self):
+        from .llm_cache import make_key
+        base = make_key("gpt-4o", "prompt", {"max_tokens": 256})
+        self.assertEqual(base, make_key("gpt-4o", "prompt", {"max_tokens": 256}))
+        self.assertNotEqual(base, make_key("gpt-4o-mini", "prompt", {"max_tokens": 256}))
+        self.assertNotEqual(base, make_key("gpt-4o", "prompt 2", {"max_tokens": 256}))
+        self.assertNotEqual(base, make_key("gpt-4o", "prompt", {"max_tokens": 500}))
+
+    def test_failed_calls_are_not_cached(self):
+        self.assertIsNone(self.cache.cached("gpt-4o", "prompt", {}, lambda: None))
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_lru_eviction_keeps_cache_under_budget(self):
+        self.cache.max_bytes = 25
+        self.cache.set("a", "m", "x" * 10)
+        self.cache.set("b", "m", "x" * 10)
+        self.cache.get("a")  # "b" is now least recently used
+        self.cache.set("c", "m", "x" * 10)
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+
+class ProviderClientPoolTests(TestCase):
+    """Provider calls should reuse pooled keep-alive connections."""
+
+    def setUp(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                status = 429 if self.path.startswith("/limited") else 200
+                body = b'{"choices": [{"message": {"content": "ok"}}]}'
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Retry-After", "2")
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_second_call_reuses_connection(self):
+        from .provider_clients import HTTPPool
+        pool = HTTPPool()
+        first = pool.request("POST", f"{self.base_url}/v1/chat/completions", {}, b"{}")[3]
+        second = pool.request("POST", f"{self.base_url}/v1/chat/completions", {}, b"{}")[3]
+        self.assertFalse(first["reused"])
+        self.assertTrue(second["reused"])
+        self.assertEqual(second["connect_ms"], 0.0)
+        self.assertEqual(pool.timing_summary()["new_connections"], 1)
+
+    def test_openai_chat_returns_text_and_timing(self):
+        from .provider_clients import openai_chat
+        text, timing = openai_chat("key", "gpt-4o", [], base_url=self.base_url)
+        self.assertEqual(text, "ok")
+        self.assertIn("ttfb_ms", timing)
+
+    def test_error_status_raises_with_headers(self):
+        from .provider_clients import ProviderHTTPError, post_json
+        with self.assertRaises(ProviderHTTPError) as ctx:
+            post_json(f"{self.base_url}/limited", {}, {})
+        self.assertEqual(ctx.exception.status, 429)
+        self.assertEqual(ctx.exception.headers["retry-after"], "2")
+
+
+class RateLimitTests(TestCase):
+    """429s should slow the limiter down and be retried, not surface as errors."""
+
+    def _rate_limited(self, headers=None):
+        from .provider_clients import ProviderHTTPError
+        return ProviderHTTPError(429, b"rate limited", headers or {})
+
+    def test_retry_after_header_parsing(self):
+        from .rate_limit import retry_after_seconds
+        self.assertEqual(retry_after_seconds(self._rate_limited({"retry-after": "3"})), 3.0)
+        self.assertEqual(retry_after_seconds(self._rate_limited({"retry-after-ms": "250"})), 0.25)
+        self.assertIsNone(retry_after_seconds(self._rate_limited()))
+
+    def test_429_is_retried_until_success(self):
+        from .rate_limit import AdaptiveRateLimiter, call_with_retries
+        limiter = AdaptiveRateLimiter(rpm=6000)
+        attempts = []
+
+        def call():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise self._rate_limited({"retry-after": "0"})
+            return "சரி"
+
+        self.assertEqual(call_with_retries(call, limiter, base_delay=0.01), "சரி")
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(limiter.stats()["throttled"], 2)
+        self.assertLess(limiter.rpm, 6000)
+
+    def test_client_errors_are_not_retried(self):
+        from .provider_clients import ProviderHTTPError
+        from .rate_limit import call_with_retries
+        attempts = []
+
+        def call():
+            attempts.append(1)
+            raise ProviderHTTPError(401, b"bad key", {})
+
+        with self.assertRaises(ProviderHTTPError):
+            call_with_retries(call, None)
+        self.assertEqual(len(attempts), 1)
+
+    def test_one_decrease_per_window_and_recovery(self):
+        import time
+        from .rate_limit import AdaptiveRateLimiter
+        limiter = AdaptiveRateLimiter(rpm=600, recovery_calls=4)
+        burst = [limiter.acquire() for _ in range(3)]
+        for sent_at in burst:
+            limiter.on_rate_limited(retry_after=5, sent_at=sent_at)
+        # Sent after the cut but still inside the Retry-After window
+        limiter.on_rate_limited(retry_after=5, sent_at=time.monotonic())
+        self.assertEqual(limiter.rpm, 300)
+        for _ in range(4):
+            limiter.on_success()
+        self.assertEqual(limiter.rpm, 600)
+
+
+@override_settings(EVAL_WORKER_MODE="external", OPENAI_API_KEY="test-key")
+class EvalJobQueueTests(TestCase):
+    """Evaluation runs go through the EvalJob queue with leases and heartbeats."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass123", is_staff=True)
+        MemberProfile.objects.create(user=self.admin, role="admin")
+        source = Source.objects.create(source_id="SRC-01", name="Test Source")
+        rule = Rule.objects.create(rule_id="1.1", category="சந்தி", title="Test Rule", source=source)
+        Sentence.objects.create(
+            sentence_id="SEN-00001", rule=rule, sentence="அப்படிக் கூறினான்.", sentence_type="correct",
+        )
+        Sentence.objects.create(
+            sentence_id="SEN-00002", rule=rule, sentence="அப்படி கூறினான்.", sentence_type="wrong",
+        )
+
+    def _queue_run(self):
+        from .jobs import enqueue
+        run = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin)
+        return run, enqueue(run)
+
+    def test_run_view_enqueues_instead_of_running(self):
+        self.client.login(username="admin", password="pass123")
+        response = self.client.post(reverse("run_evaluation"), {"model_name": "gpt-4o"})
+        self.assertEqual(response.status_code, 302)
+        run = EvalRun.objects.get()
+        self.assertEqual(run.status, "pending")
+        self.assertEqual(run.total_sentences, 2)
+        self.assertEqual(run.job.status, "queued")
+
+    def test_claim_is_exclusive(self):
+        from .jobs import claim_job
+        _, job = self._queue_run()
+        claimed = claim_job("worker-a")
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual((claimed.status, claimed.attempts, claimed.worker_id), ("running", 1, "worker-a"))
+        self.assertIsNone(claim_job("worker-b"))
+
+    def test_expired_lease_is_reclaimed_and_old_worker_loses_it(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .jobs import claim_job, heartbeat
+        _, job = self._queue_run()
+        first = claim_job("worker-a")
+        EvalJob.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        second = claim_job("worker-b")
+        self.assertEqual((second.worker_id, second.attempts), ("worker-b", 2))
+        self.assertFalse(heartbeat(first, "worker-a"))
+        self.assertTrue(heartbeat(second, "worker-b"))
+
+    def test_job_out_of_attempts_fails_its_run(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .jobs import claim_job, fail_exhausted_jobs
+        run, job = self._queue_run()
+        EvalJob.objects.filter(pk=job.pk).update(
+            status="running", attempts=3, lease_expires_at=timezone.now() - timedelta(seconds=1),
+        )
+        self.assertIsNone(claim_job("worker-a"))
+        self.assertEqual(fail_exhausted_jobs(), 1)
+        run.refresh_from_db()
+        self.assertEqual(run.status, "failed")
+
+    def test_worker_runs_queued_job_to_completion(self):
+        from unittest import mock
+        from .jobs import work
+        run, job = self._queue_run()
+        with mock.patch.dict("core.eval_service.MODEL_CALLERS", {"gpt-4o": lambda s: "அப்படிக் கூறினான்."}):
+            self.assertEqual(work(worker_id="worker-a", once=True), 1)
+        run.refresh_from_db()
+        job.refresh_from_db()
+        self.assertEqual((run.status, job.status), ("completed", "done"))
+        self.assertEqual(run.results.count(), 2)
+        self.assertEqual(run.correction_accuracy, 100.0)
+
+    def test_retried_job_resumes_from_saved_results(self):
+        from unittest import mock
+        from .jobs import claim_job, run_job
+        run, job = self._queue_run()
+        done = Sentence.objects.get(sentence_id="SEN-00001")
+        EvalResult.objects.create(eval_run=run, sentence=done, model_response=done.sentence, outcome="true_negative")
+        EvalJob.objects.filter(pk=job.pk).update(attempts=1)
+        calls = []
+
+        def fake_caller(sentence):
+            calls.append(sentence)
+            return "அப்படிக் கூறினான்."
+
+        job = claim_job("worker-b")
+        with mock.patch.dict("core.eval_service.MODEL_CALLERS", {"gpt-4o": fake_caller}):
+            run_job(job, "worker-b")
+        run.refresh_from_db()
+        self.assertEqual(calls, ["அப்படி கூறினான்."])
+        self.assertEqual(run.results.count(), 2)
+        self.assertEqual((run.processed_sentences, run.total_sentences), (2, 2))
+
+    def test_lost_lease_stops_saving_results(self):
+        from unittest import mock
+        from .eval_service import run_evaluation, eval_sentences
+        run, _ = self._queue_run()
+        checks = iter([False, True])
+        with mock.patch.dict("core.eval_service.MODEL_CALLERS", {"gpt-4o": lambda s: s}):
+            run_evaluation(run, eval_sentences("", "all").order_by("pk"), chunk_size=1,
+                           cancelled=lambda: next(checks))
+        run.refresh_from_db()
+        # The first chunk was saved; the second was dropped and the run left to its new owner
+        self.assertEqual(run.results.count(), 1)
+        self.assertEqual(run.status, "running")
+
+    @override_settings(EVAL_JOB_LEASE_SECONDS=0.04)
+    def test_heartbeat_error_counts_as_lost_lease(self):
+        from unittest import mock
+        from .jobs import _Heartbeat, claim_job
+        self._queue_run()
+        job = claim_job("worker-a")
+        with mock.patch("core.jobs.heartbeat", side_effect=RuntimeError("database gone")):
+            beat = _Heartbeat(job, "worker-a")
+            beat.start()
+            beat.join(timeout=2)
+        self.assertTrue(beat.lost)
+
+    def test_duplicate_results_are_ignored(self):
+        from .eval_service import _save_chunk
+        run, _ = self._queue_run()
+        sentence = Sentence.objects.get(sentence_id="SEN-00001")
+        for _ in range(2):
+            _save_chunk(run, [EvalResult(eval_run=run, sentence=sentence, model_response="x", outcome="true_negative")])
+        run.refresh_from_db()
+        self.assertEqual(run.results.count(), 1)
+        self.assertEqual(run.processed_sentences, 1)
+
+
+class EvalServiceRunTests(TestCase):
+    """run_evaluation calls the model concurrently and saves results in chunks."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass123")
+        MemberProfile.objects.create(user=self.admin, role="admin")
+        source = Source.objects.create(source_id="SRC-01", name="Test Source")
+        rule = Rule.objects.create(rule_id="1.1", category="சந்தி", title="Test Rule", source=source)
+        Sentence.objects.create(
+            sentence_id="SEN-00000", rule=rule, sentence="அப்படிக் கூறினான்.", sentence_type="correct",
+        )
+        Sentence.objects.bulk_create([
+            Sentence(sentence_id=f"SEN-{i:05d}", rule=rule, sentence=f"அப்படி கூறினான் {i}.", sentence_type="wrong")
+            for i in range(1, 12)
+        ])
+
+    def test_chunks_update_processed_counter(self):
+        from unittest import mock
+        from . import eval_service
+        run = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin)
+        saved = []
+        real_save_chunk = eval_service._save_chunk
+
+        def save_chunk(eval_run, results, reused=0):
+            real_save_chunk(eval_run, results, reused)
+            saved.append(EvalRun.objects.get(pk=eval_run.pk).processed_sentences)
+
+        with mock.patch.dict(eval_service.MODEL_CALLERS, {"gpt-4o": lambda s: s}), \
+                mock.patch.object(eval_service, "_save_chunk", save_chunk):
+            eval_service.run_evaluation(run, Sentence.objects.select_related("rule"), concurrency=4, chunk_size=5)
+        run.refresh_from_db()
+        self.assertEqual(saved, [5, 10, 12])
+        self.assertEqual(run.status, "completed")
+        self.assertEqual((run.total_sentences, run.processed_sentences), (12, 12))
+        self.assertEqual(run.detection_rate, 0)
+        self.assertEqual(run.false_positive_rate, 0)
+
+    def test_calls_run_concurrently(self):
+        import threading
+        from unittest import mock
+        from . import eval_service
+        run = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin)
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def slow_caller(sentence):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.02)
+            with lock:
+                active[0] -= 1
+            return sentence
+
+        with mock.patch.dict(eval_service.MODEL_CALLERS, {"gpt-4o": slow_caller}):
+            eval_service.run_evaluation(run, list(Sentence.objects.select_related("rule")), concurrency=4)
+        self.assertGreater(peak[0], 1)
+        self.assertLessEqual(peak[0], 4)
+        self.assertEqual(run.results.count(), 12)
+
+    def test_progress_endpoint_reports_live_counts(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        run = EvalRun.objects.create(
+            model_name="gpt-4o", run_by=self.admin, status="running",
+            total_sentences=12, processed_sentences=3, started_at=timezone.now() - timedelta(seconds=3),
+        )
+        for sentence_id, outcome in (("SEN-00001", "true_positive"), ("SEN-00002", "false_negative")):
+            EvalResult.objects.create(
+                eval_run=run, sentence=Sentence.objects.get(sentence_id=sentence_id), outcome=outcome,
+            )
+        self.client.login(username="admin", password="pass123")
+        data = self.client.get(reverse("eval_progress", args=[run.id]), {"since": "3"}).json()
+        self.assertEqual((data["status"], data["processed"], data["total"], data["percent"]), ("running", 3, 12, 25))
+        self.assertEqual(data["detection_rate"], 50.0)
+        self.assertAlmostEqual(data["per_second"], 1.0, delta=0.2)
+        self.assertAlmostEqual(data["eta_seconds"], 9, delta=2)
+
+    def test_progress_endpoint_is_admin_only(self):
+        run = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin)
+        response = self.client.get(reverse("eval_progress", args=[run.id]))
+        self.assertEqual(response.status_code, 302)
+        reviewer = User.objects.create_user(username="reviewer", password="pass123")
+        MemberProfile.objects.create(user=reviewer, role="reviewer")
+        self.client.login(username="reviewer", password="pass123")
+        response = self.client.get(reverse("eval_progress", args=[run.id]))
+        self.assertRedirects(response, reverse("dashboard"), fetch_redirect_response=False)
+
+    def test_completed_run_stores_category_and_rule_stats(self):
+        from unittest import mock
+        from . import eval_service
+        run = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin)
+        # Fix the first wrong sentence, leave the rest unchanged, break the correct one
+        responses = {"அப்படி கூறினான் 1.": "அப்படிக் கூறினான்.", "அப்படிக் கூறினான்.": "அப்படி கூறினான்."}
+        with mock.patch.dict(eval_service.MODEL_CALLERS, {"gpt-4o": lambda s: responses.get(s, s)}):
+            eval_service.run_evaluation(run, Sentence.objects.select_related("rule"))
+        category = run.category_stats.get(rule__isnull=True)
+        rule = run.category_stats.get(rule_id="1.1")
+        for stats in (category, rule):
+            self.assertEqual(
+                (stats.category, stats.total, stats.wrong_total, stats.detected, stats.true_positives,
+                 stats.correct_total, stats.false_positives),
+                ("சந்தி", 12, 11, 1, 1, 1, 1),
+            )
+        self.assertEqual(category.correction_accuracy, 9.1)
+        self.assertEqual(category.preservation_rate, 0.0)
+
+        self.client.login(username="admin", password="pass123")
+        response = self.client.get(reverse("eval_detail", args=[run.id]))
+        self.assertContains(response, "Sandhi")
+        self.assertEqual([c.category for c in response.context["categories"]], ["சந்தி"])
+
+    def test_detail_backfills_stats_for_older_runs(self):
+        run = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin, status="completed")
+        EvalResult.objects.create(
+            eval_run=run, sentence=Sentence.objects.get(sentence_id="SEN-00001"), outcome="true_positive",
+        )
+        self.client.login(username="admin", password="pass123")
+        response = self.client.get(reverse("eval_detail", args=[run.id]))
+        self.assertEqual(response.context["categories"][0].detection_rate, 100.0)
+        self.assertEqual(run.category_stats.count(), 2)
+
+    def test_incremental_run_only_queries_changed_sentences(self):
+        from datetime import timedelta
+        from unittest import mock
+        from django.utils import timezone
+        from . import eval_service
+        base = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin)
+        with mock.patch.dict(eval_service.MODEL_CALLERS, {"gpt-4o": lambda s: s}):
+            eval_service.run_evaluation(base, Sentence.objects.select_related("rule"))
+        # Backdate the base run, then edit one sentence and add another
+        EvalRun.objects.filter(pk=base.pk).update(started_at=timezone.now() - timedelta(minutes=5))
+        Sentence.objects.exclude(sentence_id="SEN-00003").update(updated_at=timezone.now() - timedelta(minutes=10))
+        Sentence.objects.filter(sentence_id="SEN-00003").update(
+            sentence="அப்படி சொன்னான்.", updated_at=timezone.now(),
+        )
+        Sentence.objects.create(
+            sentence_id="SEN-00099", rule=Rule.objects.get(rule_id="1.1"), sentence="புதிய வாக்கியம்", sentence_type="wrong",
+        )
+
+        run = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin, base_run=base)
+        calls = []
+
+        def caller(sentence):
+            calls.append(sentence)
+            return "அப்படிக் கூறினான்."
+
+        with mock.patch.dict(eval_service.MODEL_CALLERS, {"gpt-4o": caller}):
+            eval_service.run_evaluation(run, Sentence.objects.select_related("rule"))
+        run.refresh_from_db()
+        self.assertEqual(sorted(calls), sorted(["அப்படி சொன்னான்.", "புதிய வாக்கியம்"]))
+        self.assertEqual((run.status, run.results.count(), run.reused_sentences), ("completed", 13, 11))
+        self.assertEqual(run.correction_accuracy, round(2 / 12 * 100, 1))
+
+    def test_incremental_checkbox_picks_last_completed_run(self):
+        from django.utils import timezone
+        base = EvalRun.objects.create(
+            model_name="gpt-4o", run_by=self.admin, status="completed", completed_at=timezone.now(),
+        )
+        self.client.login(username="admin", password="pass123")
+        with override_settings(EVAL_WORKER_MODE="external", OPENAI_API_KEY="test-key"):
+            self.client.post(reverse("run_evaluation"), {"model_name": "gpt-4o", "incremental": "1"})
+        self.assertEqual(EvalRun.objects.exclude(pk=base.pk).get().base_run, base)
+
+
+class CompareRunsTests(TestCase):
+    """Joining two runs' results on sentence for the comparison view."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass123")
+        MemberProfile.objects.create(user=self.admin, role="admin")
+        source = Source.objects.create(source_id="SRC-01", name="Test Source")
+        rule = Rule.objects.create(rule_id="1.1", category="சந்தி", title="Test Rule", source=source)
+        self.run_a = EvalRun.objects.create(model_name="gpt-4o", run_by=self.admin, status="completed")
+        self.run_b = EvalRun.objects.create(model_name="claude-sonnet-4-5", run_by=self.admin, status="completed")
+        outcomes = [
+            ("true_positive", "false_negative"),
+            ("true_positive", "true_positive"),
+            ("false_negative", "true_positive"),
+            ("true_positive", "false_negative"),
+        ]
+        for i, (a, b) in enumerate(outcomes, start=1):
+            sentence = Sentence.objects.create(
+                sentence_id=f"SEN-{i:05d}", rule=rule, sentence=f"வாக்கியம் {i}", sentence_type="wrong",
+            )
+            EvalResult.objects.create(eval_run=self.run_a, sentence=sentence, outcome=a, model_response=f"A{i}")
+            EvalResult.objects.create(eval_run=self.run_b, sentence=sentence, outcome=b, model_response=f"B{i}")
+        # Only in run A: not part of the comparison
+        only_a = Sentence.objects.create(sentence_id="SEN-00009", rule=rule, sentence="x", sentence_type="wrong")
+        EvalResult.objects.create(eval_run=self.run_a, sentence=only_a, outcome="error")
+        self.client.login(username="admin", password="pass123")
+
+    def test_transition_matrix(self):
+        from .eval_service import transition_matrix
+        with self.assertNumQueries(1):
+            counts = transition_matrix(self.run_a, self.run_b)
+        self.assertEqual(counts, {
+            ("true_positive", "false_negative"): 2,
+            ("true_positive", "true_positive"): 1,
+            ("false_negative", "true_positive"): 1,
+        })
+
+    def test_json_lists_disagreements_for_one_transition(self):
+        response = self.client.get(reverse("compare_runs_json"), {
+            "a": self.run_a.id, "b": self.run_b.id, "from": "true_positive", "to": "false_negative",
+        })
+        data = response.json()
+        self.assertEqual(data["compared"], 4)
+        self.assertEqual([d["sentence_id"] for d in data["disagreements"]], ["SEN-00001", "SEN-00004"])
+        self.assertEqual((data["disagreements"][0]["response_a"], data["disagreements"][0]["response_b"]), ("A1", "B1"))
+
+    def test_compare_page(self):
+        response = self.client.get(reverse("compare_runs"), {"a": self.run_a.id, "b": self.run_b.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["agreed"], 1)
+        self.assertEqual(len(response.context["page"].object_list), 3)
+        self.assertContains(response, "False Negative")
+
+    def test_json_requires_both_runs(self):
+        response = self.client.get(reverse("compare_runs_json"), {"a": self.run_a.id})
+        self.assertEqual(response.status_code, 400)
+
+
+class SearchTests(TestCase):
+    """Tamil-aware search over rules, sentences and discussions."""
+
+    def setUp(self):
+        from .models import Discussion
+
+        self.user = User.objects.create_user(username="member", password="pass123")
+        MemberProfile.objects.create(user=self.user, role="member")
+        source = Source.objects.create(source_id="SRC-01", name="Test Source")
+        self.rule = Rule.objects.create(
+            rule_id="1.2", category="சந்தி", title="Doubling after அப்படி",
+            description="அப்படி, இப்படி ஆகியவற்றின் பின் வல்லினம் மிகும்", source=source,
+        )
+        self.other = Rule.objects.create(rule_id="1.10", category="சந்தி", title="Other rule", source=source)
+        Sentence.objects.create(
+            sentence_id="SEN-00001", rule=self.rule, sentence="அப்படிக் கூறினான்.", sentence_type="correct",
+        )
+        Sentence.objects.create(
+            sentence_id="SEN-00002", rule=self.other, sentence="அவன் வீட்டுக்குச் சென்றான்.", sentence_type="correct",
+        )
+        Discussion.objects.create(rule=self.other, user=self.user, message="கூறினான் is the past tense here")
+        self.client.login(username="member", password="pass123")
+
+    def test_words_keep_tamil_marks_together(self):
+        from .search import normalize, stem, words
+
+        self.assertEqual(words("அப்படிக் கூறினான்."), ["அப்படிக்", "கூறினான்"])
+        self.assertEqual(normalize("Rule 1.10, SANDHI!"), "rule 1.10 sandhi")
+        self.assertEqual(stem("அப்படிக்"), "அப்படி")
+        self.assertEqual(stem("கல்"), "கல்")  # too short to strip
+
+    def test_backfill_migration_normalizes_like_search(self):
+        import importlib
+        from .search import normalize
+
+        backfill = importlib.import_module("core.migrations.0018_backfill_search_entries")
+        for text in ("அப்படிக் கூறினான்.", "Rule 1.10, SANDHI!", "கை–கால் (வினை)"):
+            self.assertEqual(backfill.normalize(text), normalize(text))
+
+    def test_saves_are_indexed(self):
+        from .models import SearchEntry
+
+        self.assertEqual(
+            sorted(SearchEntry.objects.values_list("kind", "object_id")),
+            sorted([("rule", "1.2"), ("rule", "1.10"), ("sentence", "SEN-00001"),
+                    ("sentence", "SEN-00002"), ("discussion", str(self.other.discussions.get().pk))]),
+        )
+        Sentence.objects.get(pk="SEN-00002").delete()
+        self.assertFalse(SearchEntry.objects.filter(kind="sentence", object_id="SEN-00002").exists())
+
+    def test_search_across_kinds(self):
+        from .search import search
+
+        found = [(e.kind, e.object_id) for e in search("கூறினான்")]
+        self.assertCountEqual(found, [("sentence", "SEN-00001"), ("discussion", str(self.other.discussions.get().pk))])
+        self.assertEqual([e.object_id for e in search("கூறினான்", kinds=["sentence"])], ["SEN-00001"])
+        # Every term must match
+        self.assertEqual([e.object_id for e in search("அப்படி கூறினான்")], ["SEN-00001"])
+
+    def test_stems_match_sandhi_forms(self):
+        from .search import search
+
+        self.assertIn(("rule", "1.2"), [(e.kind, e.object_id) for e in search("அப்படிக்")])
+        self.assertNotIn(("rule", "1.2"), [(e.kind, e.object_id) for e in search("அப்படிக்", stems=False)])
+
+    def test_short_terms_and_inactive_rules(self):
+        from .search import search
+
+        self.assertEqual([e.object_id for e in search("கூ", kinds=["sentence"])], ["SEN-00001"])
+        self.rule.is_active = False
+        self.rule.save()
+        self.assertEqual([e.object_id for e in search("கூறினான்", kinds=["sentence"])], [])
+
+    def test_rebuild_index(self):
+        from .models import SearchEntry
+        from .search import rebuild_index, search
+
+        SearchEntry.objects.all().delete()
+        self.assertEqual(search("கூறினான்"), [])
+        self.assertEqual(rebuild_index(), 5)
+        self.assertEqual(len(search("கூறினான்")), 2)
+
+    def test_search_page(self):
+        response = self.client.get(reverse("search"), {"q": "வீட்டுக்கு", "kind": "sentence", "stems": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "SEN-00002")
+        self.assertNotContains(response, "SEN-00001")
+
+    def test_rule_list_uses_search_index(self):
+        response = self.client.get(reverse("rule_list"), {"q": "இப்படி"})
+        self.assertEqual([r.rule_id for r in response.context["page"]], ["1.2"])
+        response = self.client.get(reverse("rule_list"), {"q": "1.10"})
+        self.assertEqual([r.rule_id for r in response.context["page"]], ["1.10"])
+
+
+class QueryBudgetTests(TestCase):
+    """Every URL stays within a fixed query count and time on a large fixture.
+
+    The budgets are measured on a few hundred sentences, so a view that starts
+    issuing a query per rule or per sentence blows through them. New URLs in
+    config/urls.py must be added to BUDGETS (or SKIPPED, with a reason).
+    """
+
+    MAX_SECONDS = 2.0
+
+    # url name -> max queries, measured on the fixture below
+    BUDGETS = {
+        "login": 0,
+        "dashboard": 9,
+        "rule_list": 6,
+        "rule_add": 4,
+        "rule_detail": 10,
+        "rule_edit": 5,
+        "rule_deactivate": 4,
+        "add_sentence": 3,
+        "add_discussion": 3,
+        "review_sentence": 4,
+        "edit_sentence": 4,
+        "delete_sentence": 4,
+        "review_queue": 5,
+        "review_log": 5,
+        "search": 6,
+        "profile": 4,
+        "change_password": 2,
+        "upload_avatar": 2,
+        "members_list": 4,
+        "change_role": 4,
+        "remove_member": 4,
+        "invite": 4,
+        "register": 2,
+        "delete_discussion": 3,
+        "evaluate": 6,
+        "run_evaluation": 3,
+        "compare_runs": 9,
+        "compare_runs_json": 8,
+        "eval_detail": 7,
+        "eval_progress": 4,
+        "export_eval_run": 4,
+        "exports": 7,
+        "export_dataset": 7,
+        "about": 0,
+        "privacy": 0,
+        "terms": 0,
+        "cookies": 0,
+    }
+    SKIPPED = {
+        "logout": "ends the test session",
+        "ai_suggest": "calls an external LLM",
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        from .eval_service import compute_category_stats
+        from .models import Discussion, Invitation, natural_sort_key
+        from .search import rebuild_index
+
+        cls.admin = User.objects.create_user(username="admin", password="pass123", is_staff=True)
+        MemberProfile.objects.create(user=cls.admin, role="admin")
+        reviewers = []
+        for i in range(4):
+            user = User.objects.create_user(username=f"reviewer{i}", password="pass123")
+            MemberProfile.objects.create(user=user, role="reviewer")
+            reviewers.append(user)
+        cls.member = reviewers[0]
+
+        source = Source.objects.create(source_id="SRC-01", name="Test Source")
+        categories = ["சந்தி", "தனிச் சொற்களை எழுதும் முறை", "இலக்கண அமைப்பில் சொற்கள்"]
+        rules = Rule.objects.bulk_create([
+            Rule(
+                rule_id=f"1.{i}", sort_key=natural_sort_key(f"1.{i}"), category=categories[i % 3],
+                title=f"Rule {i}", source=source,
+            )
+            for i in range(1, 41)
+        ])
+        statuses = ["pending", "review_1_done", "accepted", "rejected"]
+        sentences = Sentence.objects.bulk_create([
+            Sentence(
+                sentence_id=f"SEN-{n:05d}", rule=rules[n % len(rules)], sentence=f"வாக்கியம் {n}",
+                sentence_type="correct" if n % 2 else "wrong", status=statuses[n % 4],
+                review_count=n % 3, created_by=reviewers[n % 4],
+            )
+            for n in range(1, 401)
+        ])
+        ReviewLog.objects.bulk_create([
+            ReviewLog(sentence=s, reviewer=reviewers[(i + k) % 4], action="accept", review_number=k + 1)
+            for i, s in enumerate(sentences)
+            for k in range(s.review_count)
+        ])
+        discussions = Discussion.objects.bulk_create([
+            Discussion(rule=rules[4], user=reviewers[i % 4], message=f"Comment {i}") for i in range(10)
+        ])
+        invitation = Invitation.objects.create(invited_by=cls.admin)
+
+        outcomes = ["true_positive", "false_negative", "true_negative", "false_positive", "partial"]
+        runs = []
+        for shift in (0, 1):
+            run = EvalRun.objects.create(
+                model_name="gpt-4o", run_by=cls.admin, status="completed",
+                total_sentences=len(sentences), processed_sentences=len(sentences),
+            )
+            EvalResult.objects.bulk_create([
+                EvalResult(eval_run=run, sentence=s, model_response=s.sentence, outcome=outcomes[(i + shift) % 5])
+                for i, s in enumerate(sentences)
+            ])
+            compute_category_stats(run)
+            runs.append(run)
+        rebuild_index()
+
+        rule_id, sentence_id = "1.5", "SEN-00050"
+        cls.url_kwargs = {
+            "rule_detail": {"rule_id": rule_id},
+            "rule_edit": {"rule_id": rule_id},
+            "rule_deactivate": {"rule_id": rule_id},
+            "add_sentence": {"rule_id": rule_id},
+            "add_discussion": {"rule_id": rule_id},
+            "review_sentence": {"sentence_id": sentence_id},
+            "edit_sentence": {"sentence_id": sentence_id},
+            "delete_sentence": {"sentence_id": sentence_id},
+            "change_role": {"user_id": cls.member.pk},
+            "remove_member": {"user_id": cls.member.pk},
+            "register": {"token": invitation.token},
+            "delete_discussion": {"discussion_id": discussions[0].pk},
+            "eval_detail": {"run_id": runs[0].pk},
+            "eval_progress": {"run_id": runs[0].pk},
+            "export_eval_run": {"run_id": runs[0].pk, "fmt": "csv"},
+            "export_dataset": {"fmt": "json"},
+        }
+        cls.query_strings = {
+            "compare_runs": f"?a={runs[0].pk}&b={runs[1].pk}",
+            "compare_runs_json": f"?a={runs[0].pk}&b={runs[1].pk}",
+            "search": "?q=வாக்கியம்",
+        }
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.cache import cache
+
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, ignore_errors=True)
+        snapshot_settings = override_settings(EXPORT_SNAPSHOT_DIR=snapshot_dir)
+        snapshot_settings.enable()
+        self.addCleanup(snapshot_settings.disable)
+        cache.clear()
+
+    def _measure(self, url, logged_in=True):
+        import time
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        if logged_in:
+            self.client.force_login(self.admin)
+        else:
+            self.client.logout()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        return response, len(queries), elapsed
+
+    def test_every_url_has_a_budget(self):
+        from config.urls import urlpatterns
+
+        names = {p.name for p in urlpatterns if getattr(p, "name", None)}
+        self.assertEqual(names - set(self.BUDGETS) - set(self.SKIPPED), set())
+        self.assertEqual(set(self.BUDGETS) - names, set())
+
+    def test_views_stay_within_query_budget(self):
+        public = {"login", "register", "about", "privacy", "terms", "cookies"}
+        for name, max_queries in self.BUDGETS.items():
+            with self.subTest(url=name):
+                url = reverse(name, kwargs=self.url_kwargs.get(name)) + self.query_strings.get(name, "")
+                response, count, elapsed = self._measure(url, logged_in=name not in public)
+                self.assertLess(response.status_code, 400, url)
+                self.assertLessEqual(count, max_queries, f"{url} ran {count} queries")
+                self.assertLess(elapsed, self.MAX_SECONDS, f"{url} took {elapsed:.2f}s")
@@ -1,7 +1,6 @@
 """Views for TamilNadai Workbench v2."""
 
-import csv
-import json
+import time
 from datetime import timedelta
 
 from django.conf import settings
@@ -9,26 +8,26 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib.auth import login, authenticate, logout, update_session_auth_hash
 from django.contrib import messages
-from django.db.models import Count, Q
-from django.db.models.expressions import RawSQL
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q
 from django.http import HttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.core.paginator import Paginator
 from django.utils import timezone
+from django.utils.http import http_date
 
-# Natural sort for rule IDs (1.2.1 before 1.10.1)
-_USING_POSTGRES = "sqlite3" not in settings.DATABASES["default"]["ENGINE"]
-RULE_NATURAL_ORDER = (
-    (RawSQL("string_to_array(regexp_replace(core_rule.rule_id, '[^0-9.]', '', 'g'), '.')::int[]", []), "rule_id")
-    if _USING_POSTGRES
-    else ("rule_id",)
-)
+# Natural sort for rule IDs (1.2.1 before 1.10.1), on the indexed Rule.sort_key
+RULE_NATURAL_ORDER = ("sort_key", "rule_id")
 
-from .models import Source, Rule, Sentence, ReviewLog, Discussion, MemberProfile, Invitation, EvalRun, EvalResult
+from .models import (
+    Source, Rule, Sentence, ReviewLog, Discussion, MemberProfile, Invitation, EvalRun, EvalResult, SearchEntry,
+)
 from .forms import (
     RuleForm, SentenceForm, ReviewForm, DiscussionForm,
     ProfileForm, InvitationForm, AdminInvitationForm, RegistrationForm,
 )
+from . import exports, search
+from .exports import CATEGORY_SHORT, accepts_gzip, streaming_download
+from .sentence_ids import next_sentence_id
 from .services import suggest_sentence
 from .decorators import require_role
 
@@ -56,47 +55,62 @@ def logout_view(request):
 
 # --- Dashboard ---
 
-@login_required
-def dashboard(request):
-    rules = Rule.objects.filter(is_active=True)
-    total_rules = rules.count()
-    total_sentences = Sentence.objects.count()
-    accepted = Sentence.objects.filter(status="accepted").count()
-    pending = Sentence.objects.filter(status__in=["pending", "review_1_done"]).count()
-
-    # Per-category stats
+def _dashboard_stats() -> dict:
+    """Rule and sentence counts, overall and per category, in one grouped query.
+
+    Cached per dataset version (bumped by the model signals in core/signals.py),
+    with DASHBOARD_CACHE_SECONDS as a backstop.
+    """
+    from django.core.cache import cache
+    from .snapshots import current_version
+
+    version = current_version()
+    key = f"dashboard-stats:{version.version}:{version.changed_at.timestamp()}"
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+
+    rows = {
+        row["category"]: row
+        for row in Rule.objects.values("category").annotate(
+            rule_count=Count("rule_id", filter=Q(is_active=True), distinct=True),
+            sentence_count=Count("sentences"),
+            accepted=Count("sentences", filter=Q(sentences__status="accepted")),
+            pending=Count("sentences", filter=Q(sentences__status__in=["pending", "review_1_done"])),
+        ).order_by()
+    }
+    empty = {"rule_count": 0, "sentence_count": 0, "accepted": 0, "pending": 0}
     categories = []
-    for cat_name, cat_short in [
-        ("இலக்கண அமைப்பில் சொற்கள்", "Grammar Structure"),
-        ("தனிச் சொற்களை எழுதும் முறை", "Individual Words"),
-        ("சந்தி", "Sandhi"),
-    ]:
-        cat_rules = rules.filter(category=cat_name)
-        cat_count = cat_rules.count()
-        cat_sentences = Sentence.objects.filter(rule__category=cat_name)
-        cat_accepted = cat_sentences.filter(status="accepted").count()
-        cat_total = cat_sentences.count()
-        pct = int(cat_accepted / cat_total * 100) if cat_total > 0 else 0
+    for cat_name, cat_short in CATEGORY_SHORT.items():
+        row = rows.get(cat_name, empty)
         categories.append({
             "name": cat_name,
             "short": cat_short,
-            "rule_count": cat_count,
-            "sentence_count": cat_total,
-            "accepted": cat_accepted,
-            "pct": pct,
+            "rule_count": row["rule_count"],
+            "sentence_count": row["sentence_count"],
+            "accepted": row["accepted"],
+            "pct": int(row["accepted"] / row["sentence_count"] * 100) if row["sentence_count"] > 0 else 0,
         })
 
+    stats = {
+        "total_rules": sum(row["rule_count"] for row in rows.values()),
+        "total_sentences": sum(row["sentence_count"] for row in rows.values()),
+        "accepted": sum(row["accepted"] for row in rows.values()),
+        "pending": sum(row["pending"] for row in rows.values()),
+        "categories": categories,
+    }
+    cache.set(key, stats, settings.DASHBOARD_CACHE_SECONDS)
+    return stats
+
+
+@login_required
+def dashboard(request):
+    stats = _dashboard_stats()
+
     # Recent activity
     recent = ReviewLog.objects.select_related("sentence", "reviewer")[:20]
 
-    return render(request, "dashboard.html", {
-        "total_rules": total_rules,
-        "total_sentences": total_sentences,
-        "accepted": accepted,
-        "pending": pending,
-        "categories": categories,
-        "recent": recent,
-    })
+    return render(request, "dashboard.html", {**stats, "recent": recent})
 
 
 # --- Rule List ---
@@ -108,11 +122,8 @@ def rule_list(request):
     # Search
     q = request.GET.get("q", "").strip()
     if q:
-        qs = qs.filter(
-            Q(rule_id__icontains=q)
-            | Q(title__icontains=q)
-            | Q(description__icontains=q)
-        )
+        matches = search.search(q, kinds=["rule"], limit=None)
+        qs = qs.filter(rule_id__in=[entry.object_id for entry in matches])
 
     # Filters
     category = request.GET.get("category", "")
@@ -162,34 +173,53 @@ def rule_list(request):
 
 # --- Rule Detail ---
 
+def _rule_neighbours(rule: Rule) -> tuple[str | None, str | None]:
+    """Active rule IDs just before and after `rule` in natural order.
+
+    Two LIMIT 1 queries on the (sort_key, rule_id) index rather than loading
+    every rule ID.
+    """
+    active = Rule.objects.filter(is_active=True)
+    before = active.filter(
+        Q(sort_key__lt=rule.sort_key) | Q(sort_key=rule.sort_key, rule_id__lt=rule.rule_id)
+    )
+    after = active.filter(
+        Q(sort_key__gt=rule.sort_key) | Q(sort_key=rule.sort_key, rule_id__gt=rule.rule_id)
+    )
+    prev_rule_id = before.order_by("-sort_key", "-rule_id").values_list("rule_id", flat=True).first()
+    next_rule_id = after.order_by(*RULE_NATURAL_ORDER).values_list("rule_id", flat=True).first()
+    return prev_rule_id, next_rule_id
+
+
 @login_required
 def rule_detail(request, rule_id):
     rule = get_object_or_404(Rule, rule_id=rule_id)
-    correct = rule.sentences.filter(sentence_type="correct").select_related("created_by").order_by("sentence_id")
-    wrong = rule.sentences.filter(sentence_type="wrong").select_related("created_by").order_by("sentence_id")
 
-    # Get review info for each sentence
-    for s in list(correct) + list(wrong):
-        s.review_list = s.reviews.select_related("reviewer").order_by("review_number")
-        s.user_already_reviewed = s.reviews.filter(reviewer=request.user).exists()
+    # All sentences with their reviews (one prefetch) and the current user's
+    # "already reviewed" flag (one Exists subquery)
+    sentences = list(
+        rule.sentences
+        .select_related("created_by")
+        .annotate(user_already_reviewed=Exists(
+            ReviewLog.objects.filter(sentence=OuterRef("pk"), reviewer=request.user)
+        ))
+        .prefetch_related(Prefetch(
+            "reviews",
+            queryset=ReviewLog.objects.select_related("reviewer").order_by("review_number"),
+            to_attr="review_list",
+        ))
+        .order_by("sentence_id")
+    )
+    correct = [s for s in sentences if s.sentence_type == "correct"]
+    wrong = [s for s in sentences if s.sentence_type == "wrong"]
 
-    discussions = rule.discussions.select_related("user").order_by("created_at")
+    discussions = rule.discussions.select_related("user__profile").order_by("created_at")
     recent_activity = ReviewLog.objects.filter(
         sentence__rule=rule
     ).select_related("sentence", "reviewer")[:10]
 
     # Prev/next rule navigation
-    all_ids = list(
-        Rule.objects.filter(is_active=True)
-        .order_by(*RULE_NATURAL_ORDER)
-        .values_list("rule_id", flat=True)
-    )
-    try:
-        idx = all_ids.index(rule_id)
-    except ValueError:
-        idx = -1
-    prev_rule_id = all_ids[idx - 1] if idx > 0 else None
-    next_rule_id = all_ids[idx + 1] if idx < len(all_ids) - 1 else None
+    prev_rule_id, next_rule_id = _rule_neighbours(rule)
 
     return render(request, "rule_detail.html", {
         "rule": rule,
@@ -264,12 +294,7 @@ def add_sentence(request, rule_id):
     if request.method == "POST":
         form = SentenceForm(request.POST)
         if form.is_valid():
-            last = Sentence.objects.order_by("-sentence_id").first()
-            if last:
-                num = int(last.sentence_id.split("-")[1]) + 1
-            else:
-                num = 1
-            sid = f"SEN-{num:05d}"
+            sid = next_sentence_id()
 
             profile = getattr(request.user, "profile", None)
             is_admin_user = profile and profile.has_role("admin")
@@ -491,6 +516,29 @@ def review_log(request):
     })
 
 
+# --- Search ---
+
+@login_required
+def search_view(request):
+    """Ranked matches across rules, sentences and discussions."""
+    q = request.GET.get("q", "").strip()
+    kind = request.GET.get("kind", "")
+    if kind not in dict(SearchEntry.KIND_CHOICES):
+        kind = ""
+    # Stemming is on unless the form was submitted with the box unticked
+    stems = "q" not in request.GET or request.GET.get("stems") == "1"
+
+    results = search.search(q, kinds=[kind] if kind else None, stems=stems) if q else []
+
+    return render(request, "search.html", {
+        "q": q,
+        "kind": kind,
+        "stems": stems,
+        "results": results,
+        "kind_choices": SearchEntry.KIND_CHOICES,
+    })
+
+
 # --- Profile ---
 
 @login_required
@@ -738,9 +786,15 @@ def cookies_view(request):
 @require_role("admin")
 def evaluate_view(request):
     from .eval_service import get_available_models
+    from .jobs import claimable_jobs, start_inline_worker
+
+    # Pick up queued runs, or runs orphaned by a restarted worker
+    if claimable_jobs().exists():
+        start_inline_worker()
+
     runs = EvalRun.objects.select_related("run_by")[:20]
     models_list = get_available_models()
-    has_running = EvalRun.objects.filter(status="running").exists()
+    has_running = EvalRun.objects.filter(status__in=["pending", "running"]).exists()
     return render(request, "evaluate.html", {
         "runs": runs,
         "models_list": models_list,
@@ -748,9 +802,32 @@ def evaluate_view(request):
     })
 
 
+@require_role("admin")
+def eval_progress(request, run_id):
+    """JSON progress of one run, polled by the evaluate page.
+
+    With ?since=<processed count>, waits up to EVAL_PROGRESS_WAIT_SECONDS for
+    the run to move past that count before answering (long-poll).
+    """
+    from django.http import JsonResponse
+    from .eval_service import run_progress
+
+    eval_run = get_object_or_404(EvalRun, id=run_id)
+    since = request.GET.get("since", "")
+    if since.isdigit():
+        deadline = time.monotonic() + settings.EVAL_PROGRESS_WAIT_SECONDS
+        while (eval_run.status in ("pending", "running")
+               and eval_run.processed_sentences <= int(since)
+               and time.monotonic() < deadline):
+            time.sleep(1)
+            eval_run.refresh_from_db(fields=["status", "processed_sentences", "total_sentences"])
+    return JsonResponse(run_progress(eval_run))
+
+
 @require_role("admin")
 def run_evaluation_view(request):
-    from .eval_service import run_evaluation as do_eval, get_available_models
+    from .eval_service import eval_sentences, get_available_models
+    from .jobs import enqueue, start_inline_worker
 
     if request.method != "POST":
         return redirect("evaluate")
@@ -765,42 +842,41 @@ def run_evaluation_view(request):
         messages.error(request, "Selected model is not available (missing API key).")
         return redirect("evaluate")
 
-    # Build sentence queryset
-    qs = Sentence.objects.select_related("rule")
-    if category_filter:
-        qs = qs.filter(rule__category=category_filter)
-    if status_filter == "accepted":
-        qs = qs.filter(status="accepted")
-
+    qs = eval_sentences(category_filter, status_filter)
     if not qs.exists():
         messages.warning(request, "No sentences match the selected filters.")
         return redirect("evaluate")
 
-    # Create the run
+    # Incremental: only re-query sentences changed since this model's last run
+    base_run = None
+    if request.POST.get("incremental"):
+        base_run = (
+            EvalRun.objects.filter(model_name=model_name, status="completed")
+            .order_by("-completed_at").first()
+        )
+
+    # Create the run and queue it; a worker picks it up (see core/jobs.py)
     eval_run = EvalRun.objects.create(
         model_name=model_name,
         run_by=request.user,
         category_filter=category_filter,
         status_filter=status_filter,
+        total_sentences=qs.count(),
+        base_run=base_run,
     )
+    enqueue(eval_run)
+    start_inline_worker()
 
-    # Materialise the queryset before spawning the thread so it doesn't
-    # depend on the request context. list() forces DB evaluation now.
-    sentence_list = list(qs)
-
-    # Run evaluation in a background thread
-    import threading
-    thread = threading.Thread(
-        target=do_eval,
-        args=(eval_run, sentence_list),
-        daemon=True,
-    )
-    thread.start()
-
+    if base_run:
+        detail = f" (incremental: unchanged sentences reuse run #{base_run.id})"
+    elif request.POST.get("incremental"):
+        detail = " (no earlier completed run of this model, so all are queried)"
+    else:
+        detail = ""
     messages.info(
         request,
-        f"Evaluation started: {len(sentence_list)} sentences with "
-        f"{eval_run.get_model_name_display()}. This page will auto-refresh."
+        f"Evaluation queued: {eval_run.total_sentences} sentences with "
+        f"{eval_run.get_model_name_display()}{detail}. This page will auto-refresh."
     )
     return redirect("evaluate")
 
@@ -819,42 +895,16 @@ def eval_detail(request, run_id):
     if category_filter:
         results = results.filter(sentence__rule__category=category_filter)
 
-    # Per-category breakdown
-    all_results = eval_run.results.select_related("sentence", "sentence__rule")
-    categories = []
-    for cat_name, cat_short in [
-        ("இலக்கண அமைப்பில் சொற்கள்", "Grammar Structure"),
-        ("தனிச் சொற்களை எழுதும் முறை", "Individual Words"),
-        ("சந்தி", "Sandhi"),
-    ]:
-        cat_results = [r for r in all_results if r.sentence.rule.category == cat_name]
-        if not cat_results:
-            continue
-
-        wrong = [r for r in cat_results if r.sentence.sentence_type == "wrong"]
-        correct = [r for r in cat_results if r.sentence.sentence_type == "correct"]
-
-        detection = 0
-        accuracy = 0
-        fp_rate = 0
-
-        if wrong:
-            detected = sum(1 for r in wrong if r.outcome != "false_negative")
-            detection = round(detected / len(wrong) * 100, 1)
-            correct_fixes = sum(1 for r in wrong if r.outcome == "true_positive")
-            accuracy = round(correct_fixes / len(wrong) * 100, 1)
-        if correct:
-            false_pos = sum(1 for r in correct if r.outcome == "false_positive")
-            fp_rate = round(false_pos / len(correct) * 100, 1)
-
-        categories.append({
-            "name": cat_name,
-            "short": cat_short,
-            "total": len(cat_results),
-            "detection_rate": detection,
-            "correction_accuracy": accuracy,
-            "preservation_rate": round(100 - fp_rate, 1),
-        })
+    # Per-category breakdown, stored when the run completed
+    categories = list(eval_run.category_stats.filter(rule__isnull=True))
+    if not categories and eval_run.is_complete and eval_run.results.exists():
+        # Runs completed before the stats table existed
+        from .eval_service import compute_category_stats
+        categories = [s for s in compute_category_stats(eval_run) if s.rule_id is None]
+    order = list(CATEGORY_SHORT)
+    categories.sort(key=lambda s: (order.index(s.category) if s.category in order else len(order), s.category))
+    for stats in categories:
+        stats.short = CATEGORY_SHORT.get(stats.category, stats.category)
 
     paginator = Paginator(results, 50)
     page = paginator.get_page(request.GET.get("page", 1))
@@ -868,15 +918,92 @@ def eval_detail(request, run_id):
     })
 
 
-# --- Exports (any logged-in member) ---
+def _comparison_runs(request):
+    """The two runs named by ?a= and ?b=, or (None, None)."""
+    a, b = request.GET.get("a", ""), request.GET.get("b", "")
+    if not (a.isdigit() and b.isdigit()):
+        return None, None
+    return get_object_or_404(EvalRun, id=a), get_object_or_404(EvalRun, id=b)
+
+
+def _comparison_page(request, run_a, run_b):
+    """Transition matrix and one page of disagreements between two runs."""
+    from .eval_service import compared_disagreements, transition_matrix
+
+    outcomes = [value for value, _ in EvalResult.OUTCOME_CHOICES]
+    from_outcome = request.GET.get("from", "")
+    to_outcome = request.GET.get("to", "")
+    from_outcome = from_outcome if from_outcome in outcomes else ""
+    to_outcome = to_outcome if to_outcome in outcomes else ""
+
+    counts = transition_matrix(run_a, run_b)
+    disagreements = compared_disagreements(run_a, run_b, from_outcome, to_outcome)
+    page = Paginator(disagreements, 50).get_page(request.GET.get("page", 1))
+    return counts, page, from_outcome, to_outcome
+
 
-CATEGORY_SHORT = {
-    "இலக்கண அமைப்பில் சொற்கள்": "Grammar Structure",
-    "தனிச் சொற்களை எழுதும் முறை": "Individual Words",
-    "சந்தி": "Sandhi",
-}
+@require_role("admin")
+def compare_runs(request):
+    """Compare two evaluation runs sentence by sentence."""
+    runs = EvalRun.objects.filter(status="completed").order_by("-created_at")[:50]
+    run_a, run_b = _comparison_runs(request)
+    context = {"runs": runs, "run_a": run_a, "run_b": run_b}
+    if run_a is None:
+        return render(request, "compare_runs.html", context)
+
+    counts, page, from_outcome, to_outcome = _comparison_page(request, run_a, run_b)
+    labels = EvalResult.OUTCOME_CHOICES
+    label_of = dict(labels)
+    page.object_list = list(page.object_list)
+    for r in page.object_list:
+        r["label_a"], r["label_b"] = label_of[r["outcome_a"]], label_of[r["outcome_b"]]
+    matrix = [
+        {
+            "outcome": value,
+            "label": label,
+            "cells": [{"outcome": other, "count": counts.get((value, other), 0)} for other, _ in labels],
+            "total": sum(counts.get((value, other), 0) for other, _ in labels),
+        }
+        for value, label in labels
+    ]
+    context.update({
+        "matrix": matrix,
+        "outcome_labels": labels,
+        "compared": sum(counts.values()),
+        "agreed": sum(n for (a, b), n in counts.items() if a == b),
+        "page": page,
+        "from_outcome": from_outcome,
+        "to_outcome": to_outcome,
+    })
+    return render(request, "compare_runs.html", context)
 
 
+@require_role("admin")
+def compare_runs_json(request):
+    """JSON version of compare_runs: transition counts and a page of disagreements."""
+    from django.http import JsonResponse
+
+    run_a, run_b = _comparison_runs(request)
+    if run_a is None:
+        return JsonResponse({"error": "Pass two run ids as ?a=<id>&b=<id>"}, status=400)
+
+    counts, page, from_outcome, to_outcome = _comparison_page(request, run_a, run_b)
+    return JsonResponse({
+        "run_a": {"id": run_a.id, "model": run_a.model_name},
+        "run_b": {"id": run_b.id, "model": run_b.model_name},
+        "compared": sum(counts.values()),
+        "transitions": [
+            {"from": a, "to": b, "count": n} for (a, b), n in sorted(counts.items())
+        ],
+        "filter": {"from": from_outcome, "to": to_outcome},
+        "page": page.number,
+        "num_pages": page.paginator.num_pages,
+        "disagreements": list(page.object_list),
+    }, json_dumps_params={"ensure_ascii": False})
+
+
+# --- Exports (any logged-in member) ---
+
 @login_required
 def exports_page(request):
     """Exports landing page — dataset + eval runs available for download."""
@@ -893,94 +1020,87 @@ def exports_page(request):
     })
 
 
-@login_required
-def export_dataset(request, fmt):
-    """Download all rules + sentences as CSV or JSON."""
-    if fmt not in ("csv", "json"):
-        return HttpResponse("Invalid format. Use .csv or .json", status=400)
-
+def _dataset_export(fmt: str):
+    """Text chunks of the full dataset export in `fmt`, read from the database."""
     rules = (
         Rule.objects.filter(is_active=True)
         .select_related("source")
-        .prefetch_related("sentences", "sentences__created_by")
         .order_by(*RULE_NATURAL_ORDER)
     )
-    today = timezone.now().strftime("%Y-%m-%d")
-
+    # Same rule order as `rules`, so the two can be walked in step
+    sentences = (
+        Sentence.objects.filter(rule__is_active=True)
+        .order_by("rule__sort_key", "rule_id", "sentence_id")
+    )
     if fmt == "csv":
-        response = HttpResponse(content_type="text/csv; charset=utf-8")
-        response["Content-Disposition"] = f'attachment; filename="tamilnadai-dataset-{today}.csv"'
-        response.write("\ufeff")  # UTF-8 BOM for Excel Tamil text support
-
-        writer = csv.writer(response)
-        writer.writerow([
-            "rule_id", "rule_category", "rule_category_english", "rule_title",
-            "rule_description", "sentence_id", "sentence", "sentence_type",
-            "sentence_source", "sentence_status", "created_by", "created_at",
-        ])
-
-        for rule in rules:
-            for s in rule.sentences.all():
-                writer.writerow([
-                    rule.rule_id,
-                    rule.category,
-                    CATEGORY_SHORT.get(rule.category, rule.category),
-                    rule.title,
-                    rule.description,
-                    s.sentence_id,
-                    s.sentence,
-                    s.sentence_type,
-                    s.source,
-                    s.status,
-                    s.created_by.username if s.created_by else "",
-                    s.created_at.isoformat() if s.created_at else "",
-                ])
-
-        return response
+        return exports.dataset_csv(rules, sentences)
 
     # JSON — hierarchical
-    data = {
-        "metadata": {
-            "project": "Tamil Nadai Workbench",
-            "description": "Tamil writing convention rules and example sentences",
-            "source": "Tamil Virtual University Style Guide (tamilvu.org)",
-            "licence": "GNU GPL v3",
-            "url": "https://tamilnadai-90344691621.asia-southeast1.run.app",
-            "exported_at": timezone.now().isoformat(),
-            "total_rules": rules.count(),
-            "total_sentences": Sentence.objects.count(),
-        },
-        "rules": [],
+    metadata = {
+        "project": "Tamil Nadai Workbench",
+        "description": "Tamil writing convention rules and example sentences",
+        "source": "Tamil Virtual University Style Guide (tamilvu.org)",
+        "licence": "GNU GPL v3",
+        "url": "https://tamilnadai-90344691621.asia-southeast1.run.app",
+        "exported_at": timezone.now().isoformat(),
+        "total_rules": rules.count(),
+        # Every sentence, including those of inactive rules (as before streaming)
+        "total_sentences": Sentence.objects.count(),
     }
+    return exports.dataset_json(metadata, rules, sentences)
 
-    for rule in rules:
-        rule_data = {
-            "rule_id": rule.rule_id,
-            "category": rule.category,
-            "category_english": CATEGORY_SHORT.get(rule.category, rule.category),
-            "title": rule.title,
-            "description": rule.description,
-            "example_1": rule.example_1,
-            "example_2": rule.example_2,
-            "source": rule.source.name if rule.source else "",
-            "source_page": rule.source_page,
-            "sentences": [],
-        }
-        for s in rule.sentences.all():
-            rule_data["sentences"].append({
-                "sentence_id": s.sentence_id,
-                "sentence": s.sentence,
-                "type": s.sentence_type,
-                "source": s.source,
-                "status": s.status,
-                "created_by": s.created_by.username if s.created_by else "",
-                "created_at": s.created_at.isoformat() if s.created_at else "",
-            })
-        data["rules"].append(rule_data)
-
-    content = json.dumps(data, ensure_ascii=False, indent=2)
-    response = HttpResponse(content, content_type="application/json; charset=utf-8")
-    response["Content-Disposition"] = f'attachment; filename="tamilnadai-dataset-{today}.json"'
+
+@login_required
+def export_dataset(request, fmt):
+    """Download all rules + sentences as CSV or JSON.
+
+    Served from the compressed snapshot of the current dataset version
+    (core/snapshots.py), with ETag/Last-Modified so unchanged repeat
+    downloads get a 304.
+    """
+    from django.http import FileResponse
+    from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+    from . import snapshots
+
+    if fmt not in ("csv", "json"):
+        return HttpResponse("Invalid format. Use .csv or .json", status=400)
+
+    compressed = accepts_gzip(request)
+    version = snapshots.current_version()
+    etag = snapshots.etag(version, fmt, compressed)
+    last_modified = int(version.changed_at.timestamp())
+    today = timezone.now().strftime("%Y-%m-%d")
+    filename = f"tamilnadai-dataset-{today}.{fmt}"
+    content_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/json; charset=utf-8"
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        path = snapshots.snapshot_path(version, fmt)
+        if path is None:
+            response = streaming_download(request, _dataset_export(fmt), content_type, filename)
+        else:
+            if not path.exists():
+                snapshots.build_snapshot(path, _dataset_export(fmt))
+            try:
+                snapshot = open(path, "rb")
+            except FileNotFoundError:
+                # A build for a newer version removed it; this version can
+                # still be streamed from the database
+                snapshot = None
+            if snapshot is None:
+                response = streaming_download(request, _dataset_export(fmt), content_type, filename)
+            elif compressed:
+                response = FileResponse(
+                    snapshot, as_attachment=True, filename=filename, content_type=content_type,
+                )
+                response["Content-Encoding"] = "gzip"
+            else:
+                response = streaming_download(request, snapshots.read_decompressed(snapshot), content_type, filename)
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
     return response
 
 
@@ -990,89 +1110,33 @@ def export_eval_run(request, run_id, fmt):
     if fmt not in ("csv", "json"):
         return HttpResponse("Invalid format. Use .csv or .json", status=400)
 
-    eval_run = get_object_or_404(EvalRun, id=run_id)
-    results = (
-        eval_run.results
-        .select_related("sentence", "sentence__rule")
-        .order_by("sentence__sentence_id")
-    )
+    eval_run = get_object_or_404(EvalRun.objects.select_related("run_by"), id=run_id)
+    results = eval_run.results.order_by("sentence__sentence_id")
     today = timezone.now().strftime("%Y-%m-%d")
     model_slug = eval_run.model_name
 
     if fmt == "csv":
-        response = HttpResponse(content_type="text/csv; charset=utf-8")
-        response["Content-Disposition"] = (
-            f'attachment; filename="tamilnadai-eval-{model_slug}-{today}.csv"'
+        return streaming_download(
+            request, exports.eval_run_csv(eval_run, results),
+            "text/csv; charset=utf-8", f"tamilnadai-eval-{model_slug}-{today}.csv",
         )
-        response.write("\ufeff")  # UTF-8 BOM
-
-        # Metadata as comments
-        response.write(f"# Tamil Nadai Evaluation Results\n")
-        response.write(f"# Model: {eval_run.get_model_name_display()}\n")
-        response.write(f"# Date: {eval_run.created_at.strftime('%d %b %Y %H:%M')}\n")
-        response.write(f"# Sentences: {eval_run.total_sentences}\n")
-        if eval_run.detection_rate is not None:
-            response.write(f"# Detection Rate: {eval_run.detection_rate}%\n")
-        if eval_run.correction_accuracy is not None:
-            response.write(f"# Correction Accuracy: {eval_run.correction_accuracy}%\n")
-        if eval_run.false_positive_rate is not None:
-            response.write(f"# False Positive Rate: {eval_run.false_positive_rate}%\n")
-        if eval_run.category_filter:
-            response.write(f"# Category: {eval_run.category_filter}\n")
-        response.write(f"# Status Filter: {eval_run.get_status_filter_display()}\n")
-
-        writer = csv.writer(response)
-        writer.writerow([
-            "sentence_id", "rule_id", "rule_category", "sentence_type",
-            "original_sentence", "model_response", "outcome",
-        ])
-
-        for r in results:
-            writer.writerow([
-                r.sentence.sentence_id,
-                r.sentence.rule.rule_id,
-                r.sentence.rule.category,
-                r.sentence.sentence_type,
-                r.sentence.sentence,
-                r.model_response,
-                r.outcome,
-            ])
-
-        return response
 
     # JSON
-    data = {
-        "metadata": {
-            "project": "Tamil Nadai Workbench",
-            "model": eval_run.get_model_name_display(),
-            "model_id": eval_run.model_name,
-            "run_id": eval_run.id,
-            "run_by": eval_run.run_by.username,
-            "created_at": eval_run.created_at.isoformat(),
-            "category_filter": eval_run.category_filter or None,
-            "status_filter": eval_run.status_filter,
-            "total_sentences": eval_run.total_sentences,
-            "detection_rate": eval_run.detection_rate,
-            "correction_accuracy": eval_run.correction_accuracy,
-            "false_positive_rate": eval_run.false_positive_rate,
-        },
-        "results": [],
+    metadata = {
+        "project": "Tamil Nadai Workbench",
+        "model": eval_run.get_model_name_display(),
+        "model_id": eval_run.model_name,
+        "run_id": eval_run.id,
+        "run_by": eval_run.run_by.username,
+        "created_at": eval_run.created_at.isoformat(),
+        "category_filter": eval_run.category_filter or None,
+        "status_filter": eval_run.status_filter,
+        "total_sentences": eval_run.total_sentences,
+        "detection_rate": eval_run.detection_rate,
+        "correction_accuracy": eval_run.correction_accuracy,
+        "false_positive_rate": eval_run.false_positive_rate,
     }
-
-    for r in results:
-        data["results"].append({
-            "sentence_id": r.sentence.sentence_id,
-            "rule_id": r.sentence.rule.rule_id,
-            "rule_category": r.sentence.rule.category,
-            "sentence_type": r.sentence.sentence_type,
-            "original_sentence": r.sentence.sentence,
-            "model_response": r.model_response,
-            "outcome": r.outcome,
-        })
-
-    content = json.dumps(data, ensure_ascii=False, indent=2)
-    response = HttpResponse(content, content_type="application/json; charset=utf-8")
-    response["Content-Disposition"] = (
-        f'attachment; filename="tamilnadai-eval-{model_slug}-{today}.json"'
+    return streaming_download(
+        request, exports.eval_run_json(metadata, results),
+        "application/json; charset=utf-8", f"tamilnadai-eval-{model_slug}-{today}.json",
     )
-    return response